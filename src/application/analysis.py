@@ -0,0 +1,122 @@
+# src/application/analysis.py
+from __future__ import annotations
+
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterator, Sequence, Tuple
+
+from src.detectors.registry import DEFAULT_DETECTORS, DETECTORS
+from src.infrastructure.profiling import span
+from src.metrics.registry import default_calculators
+
+# lxml / numpy / scipy se importan recién al usarse (arranque rápido del CLI)
+if TYPE_CHECKING:
+    from src.domain.compact import CompactModel
+    from src.infrastructure.cache import ModelCache
+    from src.metrics.engine import MetricTable
+
+
+def load_model(xmi: Path | str,
+               calculators: Dict[str, Any],
+               streaming: bool = False,
+               cache: ModelCache | None = None,
+               workers: int = 1,
+               metrics: bool = True) -> Tuple[CompactModel, MetricTable | None, bool]:
+    """
+    Devuelve (modelo, métricas, hit_de_caché).  Con caché caliente no se
+    parsea el XMI ni se recalculan las métricas.  `workers` reparte las
+    métricas clase a clase en un pool (resultado idéntico).  Si `xmi` es
+    un directorio, sus fragmentos se parsean en paralelo y se enlazan
+    en un único modelo (`ProjectParser`).  Con `metrics=False` (nada de
+    la corrida usa las métricas por clase, ver `requires_table`) no se
+    calculan y se devuelve None; la caché guarda modelo + métricas, así
+    que en ese caso tampoco se escribe.
+    """
+    from src.domain.compact import CompactModel
+    from src.infrastructure.project import ProjectParser
+    from src.infrastructure.xmi_parser import XMIParser
+    from src.metrics.engine import MetricEngine
+
+    if cache:
+        with span("cache.load"):
+            rules = getattr(calculators.get("lrc"), "rules", None)
+            key = cache.key(xmi, rules.fingerprint() if rules else "")
+            hit = cache.load(key)
+        if hit:
+            return hit[0], hit[1], True
+
+    with span("parse"):
+        if Path(xmi).is_dir():                # proyecto de varios fragmentos
+            parsed = ProjectParser(workers, streaming).parse(xmi)
+        else:
+            parsed = XMIParser().parse(xmi, streaming=streaming)
+    with span("compact"):
+        model = CompactModel.from_model(parsed)
+    if not metrics:
+        return model, None, False
+    # métricas de todas las clases: una sola pasada compartida
+    with span("metrics"):
+        table = MetricEngine(calculators, workers).compute(model)
+    if cache:
+        with span("cache.store"):
+            cache.store(key, model, table)
+    return model, table, False
+
+
+def calibrate(cfg: Dict[str, Any], model: CompactModel, table: MetricTable,
+              context_txt: str | None = None) -> Dict[str, Any]:
+    """Calibración clásica (percentiles + contexto); sin contexto no toca `cfg`."""
+    if not context_txt:
+        return cfg
+    from src.calibration.calibrator import Calibrator
+    with span("calibration"):
+        return Calibrator(cfg).calibrate(model, context_txt, table)
+
+
+def class_columns(cfg: Dict[str, Any], model: CompactModel, table: MetricTable,
+                  calculators: Dict[str, Any]) -> Dict[str, Any]:
+    """Columnas por clase (métricas, score/etiqueta, PageRank) para el export."""
+    from src.detectors.god_class import GodClassDetector
+    from src.detectors.graph import ClassGraph
+    from src.infrastructure import columnar
+
+    scores, labels = GodClassDetector(cfg, calculators).classify(table)
+    g = ClassGraph.from_model(model)
+    pr, _ = g.pagerank()
+    return columnar.class_columns(table, scores, labels, dict(zip(g.ids(), pr.tolist())))
+
+
+def requires_table(detectors: Sequence[str] = DEFAULT_DETECTORS) -> bool:
+    """¿Algún detector seleccionado usa las métricas por clase?"""
+    from src.application.pipeline import Pipeline
+    return Pipeline(DETECTORS).needs("table", detectors)
+
+
+def detect(cfg: Dict[str, Any], model: CompactModel, table: MetricTable | None,
+           calculators: Dict[str, Any],
+           detectors: Sequence[str] = DEFAULT_DETECTORS,
+           workers: int = 1) -> Dict[str, Any]:
+    """Ejecuta los detectores seleccionados (sólo esos se importan)."""
+    return {name: list(items) for name, items in
+            iter_sections(cfg, model, table, calculators, detectors, workers)}
+
+
+def iter_sections(cfg: Dict[str, Any], model: CompactModel, table: MetricTable | None,
+                  calculators: Dict[str, Any],
+                  detectors: Sequence[str] = DEFAULT_DETECTORS,
+                  workers: int = 1) -> Iterator[Tuple[str, Iterator[Any]]]:
+    """
+    (detector, hallazgos) en el orden pedido, vía `Pipeline`: las entradas
+    compartidas (métricas, grafo, PageRank) se calculan una vez y sólo si
+    algún detector las pide; `table=None` deja las métricas a cargo del
+    pipeline.  Con `workers == 1`
+    cada detector corre recién cuando se consumen sus hallazgos, de modo
+    que un escritor en streaming (`report_writer`) los vuelca a disco a
+    medida que se producen; con más, los detectores independientes corren
+    en paralelo.
+    """
+    from src.application.pipeline import Pipeline
+
+    seeds = {"cfg": cfg, "model": model, "calculators": calculators}
+    if table is not None:
+        seeds["table"] = table
+    return Pipeline(DETECTORS).run(seeds, detectors, workers)
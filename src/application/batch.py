@@ -0,0 +1,130 @@
+# src/application/batch.py
+from __future__ import annotations
+
+import glob
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, List, Sequence
+
+from src.application import analysis
+from src.detectors.registry import DEFAULT_DETECTORS
+
+
+def discover(source: str, pattern: str = "**/*.xmi") -> List[Path]:
+    """`source` puede ser un directorio (se aplica `pattern`) o un glob."""
+    root = Path(source)
+    if root.is_dir():
+        return sorted(p for p in root.glob(pattern) if p.is_file())
+    return sorted(Path(p) for p in glob.glob(source, recursive=True) if Path(p).is_file())
+
+
+def source_root(source: str) -> Path:
+    """
+    Directorio base de `source`: el propio directorio, o el prefijo
+    estático de un glob (`models/**/*.xmi` → `models`).
+    """
+    root = Path(source)
+    if root.is_dir():
+        return root
+    static = []
+    for part in root.parts:
+        if glob.has_magic(part):
+            break
+        static.append(part)
+    else:
+        static.pop()                          # ruta a un archivo, sin comodines
+    return Path(*static) if static else Path(".")
+
+
+def report_stem(xmi: Path, base: Path | None) -> str:
+    """Nombre único por modelo (ruta relativa aplanada)."""
+    try:
+        rel = xmi.resolve().relative_to(base.resolve()) if base else Path(xmi.name)
+    except ValueError:
+        rel = Path(xmi.name)
+    return "__".join(rel.with_suffix("").parts)
+
+
+def analyse_file(xmi: str, stem: str, cfg: Dict[str, Any], out_dir: str,
+                 context_txt: str | None = None, streaming: bool = False,
+                 cache_dir: str | None = None,
+                 detectors: Sequence[str] = DEFAULT_DETECTORS) -> Dict[str, Any]:
+    """
+    parse → calibrar → detectores para un XMI.  Nunca propaga la
+    excepción: un fallo queda registrado en el resumen de ese archivo.
+    """
+    t0 = time.perf_counter()
+    summary: Dict[str, Any] = {"model": xmi, "stem": stem}
+    try:
+        from src.infrastructure.cache import ModelCache
+
+        calculators = analysis.default_calculators(cfg)
+        cache = ModelCache(cache_dir) if cache_dir else None
+        model, table, hit = analysis.load_model(
+            xmi, calculators, streaming, cache,
+            metrics=bool(context_txt) or analysis.requires_table(detectors))
+        eff_cfg = analysis.calibrate(dict(cfg), model, table, context_txt)
+        report = analysis.detect(eff_cfg, model, table, calculators, detectors)
+
+        out = Path(out_dir)
+        (out / f"{stem}.report.json").write_text(json.dumps(report, indent=2), encoding="utf-8")
+        (out / f"{stem}.metricas.json").write_text(json.dumps(eff_cfg, indent=2), encoding="utf-8")
+
+        labels = [f["label"] for f in report.get("god_class", [])]
+        summary.update(
+            status="ok",
+            cached=hit,
+            classes=len(model),
+            god_class=labels.count("god-class"),
+            suspicious=labels.count("suspicious"),
+            hubs=len(report.get("hub_like", [])),
+        )
+    except Exception as err:                  # aislar el fallo por archivo
+        summary.update(status="error", error=f"{type(err).__name__}: {err}")
+    summary["seconds"] = round(time.perf_counter() - t0, 3)
+    return summary
+
+
+def run_batch(files: List[Path], cfg: Dict[str, Any], out_dir: Path,
+              base: Path | None = None, workers: int = 1,
+              context_txt: str | None = None, streaming: bool = False,
+              cache_dir: Path | None = None,
+              detectors: Sequence[str] = DEFAULT_DETECTORS) -> Dict[str, Any]:
+    """Analiza `files` en un pool de procesos y escribe `summary.json`."""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    jobs = [
+        (str(f), report_stem(f, base), cfg, str(out_dir), context_txt, streaming,
+         str(cache_dir) if cache_dir else None, list(detectors))
+        for f in files
+    ]
+
+    results: List[Dict[str, Any]] = []
+    if workers <= 1:
+        results = [analyse_file(*job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(analyse_file, *job): job for job in jobs}
+            for fut in as_completed(futures):
+                job = futures[fut]
+                try:
+                    results.append(fut.result())
+                except Exception as err:      # p. ej. el worker murió
+                    results.append({"model": job[0], "stem": job[1], "status": "error",
+                                    "error": f"{type(err).__name__}: {err}"})
+        results.sort(key=lambda r: r["model"])
+
+    ok = [r for r in results if r["status"] == "ok"]
+    summary = {
+        "models": len(results),
+        "ok": len(ok),
+        "failed": len(results) - len(ok),
+        "classes": sum(r["classes"] for r in ok),
+        "god_class": sum(r["god_class"] for r in ok),
+        "suspicious": sum(r["suspicious"] for r in ok),
+        "hubs": sum(r["hubs"] for r in ok),
+        "results": results,
+    }
+    (out_dir / "summary.json").write_text(json.dumps(summary, indent=2), encoding="utf-8")
+    return summary
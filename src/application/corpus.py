@@ -0,0 +1,81 @@
+# src/application/corpus.py
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Sequence, Tuple
+
+from src.application import analysis
+from src.calibration.sketch import MetricSketches
+
+
+def sketch_file(xmi: str, key: str, k: int = 200, streaming: bool = False,
+                cache_dir: str | None = None,
+                cfg: Dict[str, Any] | None = None) -> Tuple[str, Dict[str, Any] | str]:
+    """
+    Sketches de un modelo (en un worker).  Devuelve (xmi, estado) o
+    (xmi, "Tipo: mensaje") si el modelo no pudo analizarse.
+    """
+    try:
+        from src.infrastructure.cache import ModelCache
+
+        cache = ModelCache(cache_dir) if cache_dir else None
+        calculators = analysis.default_calculators(cfg)
+        _, table, _ = analysis.load_model(xmi, calculators, streaming, cache)
+        return xmi, MetricSketches.from_values(table.values(), k, key, xmi).to_dict()
+    except Exception as err:                  # aislar el fallo por archivo
+        return xmi, f"{type(err).__name__}: {err}"
+
+
+def run_corpus(files: List[Path], state_path: Path, k: int = 200, workers: int = 1,
+               streaming: bool = False, cache_dir: Path | None = None,
+               merge: Sequence[Path] = (),
+               cfg: Dict[str, Any] | None = None) -> Tuple[MetricSketches, Dict[str, Any]]:
+    """
+    Suma al estado `state_path` (si existe) los sketches de `files` que
+    aún no estén incluidos (por hash del XMI) y de los estados `merge`
+    (p. ej. shards calculados en otras máquinas).  Sólo se conservan los
+    sketches, nunca los valores individuales.  Devuelve (estado, resumen).
+    `cfg["layers"]` (si existe) define las capas del LRC y forma parte de
+    la clave de cada modelo.
+    """
+    from src.infrastructure.cache import ModelCache
+    from src.metrics.layers import LayerRules
+
+    layers = {"layers": cfg["layers"]} if cfg and cfg.get("layers") else None
+    tag = LayerRules.from_config(layers).fingerprint()
+
+    state = MetricSketches.load(state_path) if state_path.exists() else MetricSketches(k)
+    for extra in merge:
+        state.merge(MetricSketches.load(extra))
+
+    jobs = []
+    for f in files:
+        key = ModelCache.key(f, tag)
+        if key not in state:
+            jobs.append((str(f), key, state.k, streaming,
+                         str(cache_dir) if cache_dir else None, layers))
+
+    if workers <= 1:
+        results = [sketch_file(*job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(sketch_file, *zip(*jobs))) if jobs else []
+
+    errors = {}
+    for xmi, res in results:                 # orden de `files`: estado determinista
+        if isinstance(res, str):
+            errors[xmi] = res
+        else:
+            state.merge(MetricSketches.from_dict(res))
+
+    state_path.parent.mkdir(parents=True, exist_ok=True)
+    state.save(state_path)
+    summary = {
+        "models": len(state.sources),
+        "added": len(results) - len(errors),
+        "skipped": len(files) - len(jobs),
+        "classes": state["wmc"].n,
+        "errors": errors,
+    }
+    return state, summary
@@ -0,0 +1,263 @@
+# src/application/daemon.py
+from __future__ import annotations
+
+import json
+import logging
+import os
+import socketserver
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from src.application import analysis
+from src.application.incremental import AnalysisState, run_incremental
+from src.detectors.god_class import GodClassDetector
+
+log = logging.getLogger(__name__)
+
+
+@dataclass
+class Entry:
+    """Último análisis de un XMI residente en memoria."""
+    path: Path
+    signature: Tuple[int, int]           # (mtime_ns, tamaño) al analizarlo
+    state: AnalysisState
+    report: Dict[str, Any]
+    cfg: Dict[str, Any]
+    delta: Dict[str, Any] | None
+    stats: Dict[str, Any]
+    analysed_at: float
+    seconds: float
+
+
+def _signature(path: Path) -> Tuple[int, int]:
+    st = path.stat()
+    return st.st_mtime_ns, st.st_size
+
+
+class AnalysisService:
+    """
+    Modelos analizados en memoria + re-análisis incremental.
+
+    Cada XMI registrado se analiza una vez; cuando cambia (mtime/tamaño)
+    `refresh` lo re-analiza con `run_incremental`, reutilizando el estado
+    anterior (sólo se recalculan las clases cambiadas y sus vecinos).
+    Las consultas leen la última versión bajo un lock.
+    """
+
+    def __init__(self, cfg: Dict[str, Any], context_txt: str | None = None,
+                 streaming: bool = False) -> None:
+        self.cfg = cfg
+        self.context_txt = context_txt
+        self.streaming = streaming
+        self.calculators = analysis.default_calculators(cfg)
+        self.entries: Dict[str, Entry] = {}
+        self.errors: Dict[str, str] = {}
+        self._lock = threading.RLock()
+
+    # ---------- análisis ---------------------------------------------- #
+    def add(self, xmi: Path | str) -> Entry:
+        return self.analyse(Path(xmi).resolve())
+
+    def analyse(self, path: Path) -> Entry:
+        key = str(path)
+        with self._lock:
+            prev = self.entries.get(key)
+        sig = _signature(path)
+        t0 = time.perf_counter()
+        try:
+            res = run_incremental(path, dict(self.cfg), prev.state if prev else None,
+                                  self.calculators, self.context_txt, self.streaming)
+        except Exception as err:
+            with self._lock:
+                self.errors[key] = f"{type(err).__name__}: {err}"
+            raise
+        entry = Entry(path, sig, res["state"], res["report"], res["cfg"], res["delta"],
+                      res["stats"], time.time(), round(time.perf_counter() - t0, 4))
+        with self._lock:
+            self.entries[key] = entry
+            self.errors.pop(key, None)
+        log.info("analizado %s (%d clases, %.3fs)", path, entry.stats["classes"], entry.seconds)
+        return entry
+
+    def refresh(self) -> List[str]:
+        """Re-analiza los XMI modificados desde su último análisis."""
+        changed = []
+        with self._lock:
+            entries = list(self.entries.values())
+        for e in entries:
+            try:
+                if _signature(e.path) == e.signature:
+                    continue
+                self.analyse(e.path)
+                changed.append(str(e.path))
+            except Exception as err:          # el archivo puede estar a medio escribir
+                log.warning("no se pudo re-analizar %s: %s", e.path, err)
+        return changed
+
+    def watch(self, stop: threading.Event, interval: float = 1.0) -> None:
+        """Bucle de sondeo (stdlib, sin dependencias) hasta que `stop` se active."""
+        while not stop.wait(interval):
+            self.refresh()
+
+    # ---------- consultas --------------------------------------------- #
+    def get(self, model: str | None) -> Entry:
+        with self._lock:
+            if model is None:
+                if len(self.entries) != 1:
+                    raise KeyError("indica ?model= (hay varios modelos cargados)")
+                return next(iter(self.entries.values()))
+            entry = self.entries.get(str(Path(model).resolve()))
+            if entry is None:
+                matches = [e for e in self.entries.values()
+                           if model in (e.path.name, e.path.stem)]
+                if len(matches) != 1:
+                    raise KeyError(f"modelo no cargado: {model}")
+                entry = matches[0]
+            return entry
+
+    def models(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            out = [{"model": k, "classes": e.stats["classes"], "hubs": len(e.state.hubs),
+                    "analysed_at": e.analysed_at, "seconds": e.seconds}
+                   for k, e in self.entries.items()]
+            out += [{"model": k, "error": err} for k, err in self.errors.items()]
+        return out
+
+    def class_metrics(self, model: str | None, cls: str) -> List[Dict[str, Any]]:
+        """Métricas, score y PageRank de las clases cuyo nombre o xmi:id es `cls`."""
+        st = self.get(model).state
+        t = st.table
+        rows = [i for i, (cid, name) in enumerate(zip(t.ids, t.names)) if cls in (cid, name)]
+        if not rows:
+            raise KeyError(f"clase no encontrada: {cls}")
+        return [{
+            "id": t.ids[i], "class": t.names[i], "package": t.packages[i],
+            "metrics": {"WMC": int(t.wmc[i]), "ATFD": int(t.atfd[i]),
+                        "TCC": round(float(t.tcc[i]), 2), "FanIn": int(t.fanin[i]),
+                        "FanOut": int(t.fanout[i]), "LRC": int(t.lrc[i])},
+            "score": round(float(st.scores[i]), 2),
+            "label": GodClassDetector.LABELS[st.labels[i]],
+            "pagerank": st.pagerank.get(t.ids[i], 0.0),
+        } for i in rows]
+
+
+# --------------------------------------------------------------------------- #
+class _Handler(BaseHTTPRequestHandler):
+    """
+    API de sólo lectura (JSON):
+
+        GET  /health
+        GET  /models
+        GET  /report?model=…          informe completo (god_class + hub_like)
+        GET  /delta?model=…           cambios respecto del análisis anterior
+        GET  /metrics?model=…&class=… métricas de una clase (nombre o xmi:id)
+        GET  /hubs?model=…            hubs actuales con su PageRank
+        POST /analyse?model=ruta      carga (o fuerza) el análisis de un XMI
+    """
+
+    service: AnalysisService
+
+    def do_GET(self) -> None:
+        self._dispatch("GET")
+
+    def do_POST(self) -> None:
+        self._dispatch("POST")
+
+    def _dispatch(self, method: str) -> None:
+        url = urlparse(self.path)
+        q = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        route = self.ROUTES.get((method, url.path))
+        if route is None:
+            return self._send(404, {"error": f"ruta desconocida: {method} {url.path}"})
+        try:
+            self._send(200, route(self.service, q))
+        except KeyError as err:
+            self._send(404, {"error": err.args[0]})
+        except Exception as err:              # el daemon no debe caerse
+            self._send(500, {"error": f"{type(err).__name__}: {err}"})
+
+    def _send(self, status: int, body: Any) -> None:
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def address_string(self) -> str:             # socket Unix: client_address = ""
+        return self.client_address[0] if self.client_address else "unix"
+
+    def log_message(self, fmt: str, *args: Any) -> None:
+        log.debug("%s %s", self.address_string(), fmt % args)
+
+    ROUTES = {
+        ("GET", "/health"): lambda s, q: {"status": "ok", "models": len(s.entries)},
+        ("GET", "/models"): lambda s, q: s.models(),
+        ("GET", "/report"): lambda s, q: s.get(q.get("model")).report,
+        ("GET", "/delta"): lambda s, q: s.get(q.get("model")).delta,
+        ("GET", "/metrics"): lambda s, q: s.class_metrics(q.get("model"), _required(q, "class")),
+        ("GET", "/hubs"): lambda s, q: _hubs(s.get(q.get("model")).state),
+        ("POST", "/analyse"): lambda s, q: s.add(_required(q, "model")).stats,
+    }
+
+
+def _required(q: Dict[str, str], name: str) -> str:
+    if name not in q:
+        raise KeyError(f"falta el parámetro ?{name}=")
+    return q[name]
+
+
+def _hubs(state: AnalysisState) -> List[Dict[str, Any]]:
+    return [{"class": h, "pagerank": _hub_rank(state, h)} for h in state.hubs]
+
+
+def _hub_rank(state: AnalysisState, name: str) -> float:
+    t = state.table
+    return max((state.pagerank.get(cid, 0.0) for cid, n in zip(t.ids, t.names) if n == name),
+               default=0.0)
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def make_server(service: AnalysisService, host: str = "127.0.0.1", port: int = 8765,
+                unix_socket: Path | None = None) -> socketserver.BaseServer:
+    """
+    Servidor HTTP en localhost o, con `unix_socket`, en un socket Unix.
+    Un socket previo (p. ej. de un daemon que murió) se reemplaza; cualquier
+    otro archivo en esa ruta es un error (FileExistsError).
+    """
+    handler = type("Handler", (_Handler,), {"service": service})
+    if unix_socket is not None:
+        if unix_socket.is_socket():
+            unix_socket.unlink()
+        elif unix_socket.exists():
+            raise FileExistsError(f"{unix_socket} existe y no es un socket")
+        return _UnixHTTPServer(str(unix_socket), handler)
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def serve(service: AnalysisService, server: socketserver.BaseServer,
+          interval: float = 1.0) -> None:
+    """Atiende peticiones y vigila los XMI hasta Ctrl-C."""
+    stop = threading.Event()
+    watcher = threading.Thread(target=service.watch, args=(stop, interval), daemon=True)
+    watcher.start()
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop.set()
+        server.server_close()
+        if isinstance(server, socketserver.UnixStreamServer):
+            try:
+                os.unlink(server.server_address)
+            except OSError:
+                pass
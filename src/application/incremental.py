@@ -0,0 +1,256 @@
+# src/application/incremental.py
+from __future__ import annotations
+
+import os
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Set, Tuple
+
+import numpy as np
+
+from src.application import analysis
+from src.detectors.god_class import GodClassDetector
+from src.detectors.hub_like import HubLikeDependencyDetector
+from src.domain.compact import CompactModel
+from src.infrastructure.cache import ModelCache
+from src.infrastructure.xmi_parser import XMIParser
+from src.metrics.engine import METRICS, MetricEngine, MetricTable
+
+# fracción de clases a recalcular a partir de la cual conviene la pasada
+# completa (medido a 5k clases: ~0.1 ms por clase sucia frente a ~15-25 µs
+# por clase en la pasada vectorial)
+FULL_RECOMPUTE = 0.15
+
+
+@dataclass
+class AnalysisState:
+    """
+    Todo lo necesario para la siguiente corrida incremental: modelo,
+    métricas por clase, PageRank (por `xmi:id`),
+    score/etiqueta GodClass por clase, hubs reportados y las huellas del
+    contenido analizado y de las reglas de capas con que se calculó LRC
+    (`None` en estados anteriores a guardarla: se trata como distinta).
+    """
+    model: CompactModel
+    table: MetricTable
+    pagerank: Dict[str, float]
+    scores: np.ndarray
+    labels: np.ndarray
+    hubs: List[str] = field(default_factory=list)
+    source: str = ""            # `ModelCache.key` del XMI analizado
+    layers: str | None = None   # `LayerRules.fingerprint()` de la tabla
+
+    def save(self, path: Path | str) -> None:
+        path = Path(path)
+        arrays = self.model.arrays()
+        arrays.update({f"m_{k}": v for k, v in self.table.arrays().items()})
+        arrays.update(
+            pr_keys=np.array(list(self.pagerank), dtype=str),
+            pr_vals=np.array(list(self.pagerank.values()), dtype=np.float64),
+            g_score=self.scores, g_label=self.labels,
+            hubs=np.array(self.hubs, dtype=str),
+            source=np.array(self.source),
+        )
+        if self.layers is not None:
+            arrays["layers"] = np.array(self.layers)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "wb") as fh:
+            np.savez(fh, **arrays)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Path | str) -> "AnalysisState":
+        with np.load(path, allow_pickle=False) as npz:
+            arrays = {k: npz[k] for k in npz.files}
+        cm = CompactModel.from_arrays(arrays)
+        table = MetricTable.from_arrays(cm, {m: arrays[f"m_{m}"] for m in METRICS})
+        return cls(
+            model=cm, table=table,
+            pagerank=dict(zip(arrays["pr_keys"].tolist(), arrays["pr_vals"].tolist())),
+            scores=arrays["g_score"], labels=arrays["g_label"],
+            hubs=arrays["hubs"].tolist(),
+            source=str(arrays["source"]) if "source" in arrays else "",
+            layers=str(arrays["layers"]) if "layers" in arrays else None,
+        )
+
+
+@dataclass
+class ModelDiff:
+    added: Set[str]
+    removed: Set[str]
+    changed: Set[str]
+    # posición de cada clase nueva en el modelo anterior (-1: agregada)
+    source: np.ndarray | None = None
+
+
+# --------------------------------------------------------------------------- #
+def diff_models(old: CompactModel, new: CompactModel) -> ModelDiff:
+    """
+    Compara clases por `xmi:id` con la firma por clase de cada modelo
+    (`CompactModel.class_hashes`, vectorial); un cambio de aristas marca
+    ambos extremos.
+    """
+    src = np.fromiter((old.index.get(cid, -1) for cid in new.index),
+                      dtype=np.int64, count=len(new))
+    common = src >= 0
+    differs = np.zeros(len(new), dtype=bool)
+    differs[common] = old.class_hashes()[src[common]] != new.class_hashes()[common]
+    kept = np.zeros(len(old), dtype=bool)
+    kept[src[common]] = True
+
+    new_ids, old_ids = list(new.index), list(old.index)
+    return ModelDiff(
+        added={new_ids[i] for i in np.flatnonzero(~common).tolist()},
+        removed={old_ids[j] for j in np.flatnonzero(~kept).tolist()},
+        changed={new_ids[i] for i in np.flatnonzero(differs).tolist()},
+        source=src,
+    )
+
+
+def _layers(calculators: Dict[str, Any]) -> str:
+    """Huella de las reglas de capas del calculador LRC ("" por defecto)."""
+    rules = getattr(calculators.get("lrc"), "rules", None)
+    return rules.fingerprint() if rules else ""
+
+
+def _neighbours(cm: CompactModel, cid: str) -> Set[str]:
+    i = cm.index.get(cid)
+    if i is None:
+        return set()
+    s = cm.strings
+    return {s[cm.class_id[j]] for j in np.concatenate((cm.successors(i), cm.predecessors(i)))}
+
+
+def update_metrics(old: AnalysisState, new: CompactModel, diff: ModelDiff,
+                   calculators: Dict[str, Any]) -> Tuple[MetricTable, Set[str]]:
+    """
+    Reutiliza las métricas previas y recalcula sólo las clases cambiadas,
+    las nuevas y sus vecinos (FanIn/FanOut/LRC dependen de ellos).  Si
+    las clases a recalcular superan `FULL_RECOMPUTE` del modelo, la
+    pasada vectorial completa del MetricEngine es más barata que el
+    recálculo clase a clase y se usa ésa (mismo resultado).  También
+    cuando cambiaron las reglas de capas: el LRC previo no sirve para
+    ninguna clase.
+    """
+    touched = diff.changed | diff.added | diff.removed
+    dirty = diff.changed | diff.added
+    for cid in touched:
+        dirty |= _neighbours(new, cid) | _neighbours(old.model, cid)
+    dirty &= set(new.index)
+    if old.layers != _layers(calculators):
+        return MetricEngine(calculators).compute(new), set(new.index)
+    if len(dirty) > FULL_RECOMPUTE * len(new):
+        return MetricEngine(calculators).compute(new), dirty
+
+    arrays = {}
+    src = diff.source
+    if src is None:
+        src = np.fromiter((old.model.index.get(cid, -1) for cid in new.index),
+                          dtype=np.int64, count=len(new))
+    for m in METRICS:
+        prev = getattr(old.table, m)
+        arrays[m] = np.where(src >= 0, prev[np.maximum(src, 0)], 0).astype(prev.dtype)
+
+    wmc, atfd, tcc = calculators["wmc"], calculators["atfd"], calculators["tcc"]
+    fan, lrc = calculators["fan"], calculators["lrc"]
+    for cid in dirty:
+        i, view = new.index[cid], new.classes[cid]
+        arrays["wmc"][i] = wmc.calc(view)
+        arrays["atfd"][i] = atfd.calc(view)
+        arrays["tcc"][i] = tcc.calc(view)
+        arrays["fanin"][i] = fan.calc_in(view)
+        arrays["fanout"][i] = fan.calc_out(view)
+        arrays["lrc"][i] = lrc.calc(view, new)
+    return MetricTable.from_arrays(new, arrays), dirty
+
+
+def build_state(cfg: Dict[str, Any], model: CompactModel, table: MetricTable,
+                calculators: Dict[str, Any],
+                nstart: Dict[str, float] | None = None) -> Tuple[AnalysisState, Dict[str, Any]]:
+    """Ejecuta los detectores y empaqueta el resultado como AnalysisState."""
+    detector = GodClassDetector(cfg, calculators)
+    scores, labels = detector.classify(table)
+    hub = HubLikeDependencyDetector.from_config(cfg)
+    hubs, pr = hub.detect_ranked(model, nstart=nstart)
+    report = {"god_class": detector.detect(model, table), "hub_like": hubs}
+    state = AnalysisState(model, table, pr, scores, labels, hubs, layers=_layers(calculators))
+    return state, report
+
+
+def delta_report(old: AnalysisState, new: AnalysisState) -> Dict[str, Any]:
+    """Hallazgos nuevos / resueltos / cambiados entre dos estados."""
+    labels = GodClassDetector.LABELS
+    s_new = new.model.strings
+    prev = old.model.index
+
+    def entry(state: AnalysisState, i: int) -> Dict[str, Any]:
+        s = state.model.strings
+        return {"id": s[state.model.class_id[i]], "class": s[state.model.class_name[i]],
+                "label": labels[state.labels[i]], "score": round(float(state.scores[i]), 2)}
+
+    new_f, changed = [], []
+    for i, cid in enumerate(new.model.class_id):
+        j = prev.get(s_new[cid])
+        if new.labels[i] == 0:
+            continue
+        if j is None or old.labels[j] == 0:
+            new_f.append(entry(new, i))
+        elif (old.labels[j] != new.labels[i]
+              or round(float(old.scores[j]), 2) != round(float(new.scores[i]), 2)):
+            e = entry(new, i)
+            e.update(previous_label=labels[old.labels[j]],
+                     previous_score=round(float(old.scores[j]), 2))
+            changed.append(e)
+
+    resolved = []
+    for cid, j in prev.items():
+        i = new.model.index.get(cid)
+        if old.labels[j] and (i is None or new.labels[i] == 0):
+            e = entry(old, j)
+            e["removed"] = i is None
+            resolved.append(e)
+
+    return {
+        "god_class": {"new": new_f, "resolved": resolved, "changed": changed},
+        "hub_like": {
+            "new": [h for h in new.hubs if h not in old.hubs],
+            "resolved": [h for h in old.hubs if h not in new.hubs],
+        },
+    }
+
+
+def run_incremental(xmi: Path | str, cfg: Dict[str, Any],
+                    previous: AnalysisState | None,
+                    calculators: Dict[str, Any],
+                    context_txt: str | None = None,
+                    streaming: bool = False) -> Dict[str, Any]:
+    """
+    Analiza `xmi` reutilizando `previous` cuando existe.  Devuelve el
+    informe completo, el delta, el nuevo estado y los umbrales efectivos.
+    Si el contenido no cambió desde `previous` no se re-parsea.
+    """
+    source = ModelCache.key(xmi, _layers(calculators))
+    if previous is not None and previous.source == source:
+        model, table = previous.model, previous.table
+        diff, dirty = ModelDiff(set(), set(), set()), set()
+    else:
+        model = CompactModel.from_model(XMIParser().parse(xmi, streaming=streaming))
+        if previous is None:
+            table = MetricEngine(calculators).compute(model)
+            diff, dirty = ModelDiff(set(model.index), set(), set()), set(model.index)
+        else:
+            diff = diff_models(previous.model, model)
+            table, dirty = update_metrics(previous, model, diff, calculators)
+
+    eff_cfg = analysis.calibrate(cfg, model, table, context_txt)
+    state, report = build_state(eff_cfg, model, table, calculators,
+                                nstart=previous.pagerank if previous else None)
+    state.source = source
+    delta = delta_report(previous, state) if previous else None
+    stats = {
+        "added": len(diff.added), "removed": len(diff.removed),
+        "changed": len(diff.changed), "recomputed": len(dirty), "classes": len(model),
+    }
+    return {"report": report, "delta": delta, "state": state, "cfg": eff_cfg, "stats": stats}
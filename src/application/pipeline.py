@@ -0,0 +1,186 @@
+# src/application/pipeline.py
+from __future__ import annotations
+
+import importlib
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterator, Sequence, Tuple
+
+from src.detectors.registry import DETECTORS
+from src.infrastructure.profiling import span, timed
+from src.infrastructure.registry import LazyRegistry
+
+# entradas de toda corrida (las aporta quien llama: ver `analysis.load_model`)
+SEEDS = ("cfg", "model", "calculators")
+
+
+def _table(ctx: Dict[str, Any]):
+    from src.metrics.engine import MetricEngine
+    return MetricEngine(ctx["calculators"], ctx.get("workers", 1)).compute(ctx["model"])
+
+
+def _graph(ctx: Dict[str, Any]):
+    from src.detectors.graph import ClassGraph
+    return ClassGraph.from_model(ctx["model"])
+
+
+def _pagerank(ctx: Dict[str, Any]):
+    from src.detectors.hub_like import HubLikeDependencyDetector
+    return HubLikeDependencyDetector.from_config(ctx["cfg"]).pagerank(ctx["graph"])
+
+
+def _labels(ctx: Dict[str, Any]):
+    from src.detectors.god_class import GodClassDetector
+    return GodClassDetector(ctx["cfg"], ctx["calculators"]).classify(ctx["table"])[1]
+
+
+# entradas compartidas: nombre → (dependencias, función(ctx)).  Quien llama
+# puede aportarlas ya calculadas (p. ej. "table" desde la caché o la
+# calibración): entonces no se recalculan.
+INPUTS: Dict[str, Tuple[Tuple[str, ...], Callable[[Dict[str, Any]], Any]]] = {
+    "table": (("model", "calculators"), _table),
+    "graph": (("model",), _graph),
+    "pagerank": (("cfg", "graph"), _pagerank),
+    "labels": (("cfg", "table", "calculators"), _labels),
+}
+
+
+def requires(run: Callable) -> Tuple[str, ...]:
+    """Entradas compartidas que declara el módulo de un detector (`REQUIRES`)."""
+    return tuple(getattr(importlib.import_module(run.__module__), "REQUIRES", ()))
+
+
+class Pipeline:
+    """
+    Planificador de etapas con dependencias declaradas.
+
+    Cada detector registrado declara en su módulo `REQUIRES` las
+    entradas compartidas que usa (métricas por clase, grafo de clases,
+    PageRank…), además de las semillas `cfg/model/calculators`, y las
+    recibe como argumentos con nombre en `run(cfg, model, calculators, **inputs)`.
+    Las métricas por clase (`table`) son una entrada más: un detector
+    que no las pide (p. ej. `cycles`) no las hace calcular.
+
+    `run(targets)` sólo planifica lo necesario para los detectores
+    pedidos (lo demás ni se importa), calcula cada entrada compartida
+    una única vez y devuelve (detector, hallazgos) en el orden pedido:
+
+      • workers == 1: secuencial y perezoso (cada detector corre cuando se
+        consumen sus hallazgos, como necesita el escritor en streaming);
+      • workers > 1: las etapas independientes corren en un pool de
+        hilos (numpy/scipy liberan el GIL en los núcleos); cada etapa se
+        lanza apenas sus dependencias terminan.
+    """
+
+    def __init__(self, detectors: LazyRegistry = DETECTORS,
+                 inputs: Dict[str, Tuple[Tuple[str, ...], Callable]] | None = None) -> None:
+        self.detectors = detectors
+        self.inputs = INPUTS if inputs is None else inputs
+
+    # ---------- planificación ----------------------------------------- #
+    def plan(self, targets: Sequence[str]) -> Dict[str, Tuple[Tuple[str, ...], Callable]]:
+        """Etapas necesarias para `targets`, en orden topológico."""
+        order: Dict[str, Tuple[Tuple[str, ...], Callable]] = {}
+        visiting: set = set()
+
+        def visit(name: str, stage: Tuple[Tuple[str, ...], Callable]) -> None:
+            if name in order:
+                return
+            if name in visiting:
+                raise ValueError(f"dependencia circular en el pipeline: {name}")
+            visiting.add(name)
+            for dep in stage[0]:
+                if dep in SEEDS:
+                    continue
+                if dep not in self.inputs:
+                    raise KeyError(f"entrada desconocida: {dep!r} (requerida por {name})")
+                visit(dep, self.inputs[dep])
+            visiting.discard(name)
+            order[name] = stage
+
+        for name in targets:
+            run = self.detectors.get(name)
+            visit(name, (requires(run), self._section(name, run)))
+        return order
+
+    @staticmethod
+    def _section(name: str, run: Callable) -> Callable[[Dict[str, Any]], Iterator[Any]]:
+        extra = requires(run)
+
+        def produce(ctx: Dict[str, Any]) -> Iterator[Any]:
+            yield from run(ctx["cfg"], ctx["model"], ctx["calculators"],
+                           **{k: ctx[k] for k in extra if k not in SEEDS})
+
+        def stage(ctx: Dict[str, Any]) -> Iterator[Any]:
+            # sólo el tiempo de producir hallazgos, no el de quien los escribe
+            return timed(f"detector.{name}", produce(ctx))
+        return stage
+
+    # ---------- ejecución --------------------------------------------- #
+    def needs(self, name: str, targets: Sequence[str]) -> bool:
+        """¿Alguna etapa de `targets` usa la entrada `name`?"""
+        return name in self.plan(targets)
+
+    def run(self, seeds: Dict[str, Any], targets: Sequence[str],
+            workers: int = 1) -> Iterator[Tuple[str, Iterator[Any]]]:
+        plan = self.plan(targets)
+        ctx = {"workers": workers, **seeds}
+        if workers <= 1:
+            yield from self._run_lazy(plan, ctx, targets)
+        else:
+            yield from self._run_pool(plan, ctx, targets, workers)
+
+    def _run_lazy(self, plan, ctx: Dict[str, Any],
+                  targets: Sequence[str]) -> Iterator[Tuple[str, Iterator[Any]]]:
+        def resolve(name: str) -> None:
+            if name in ctx:
+                return
+            deps, fn = plan[name]
+            for dep in deps:
+                resolve(dep)
+            with span(f"input.{name}"):
+                ctx[name] = fn(ctx)
+
+        def section(name: str) -> Iterator[Any]:
+            for dep in plan[name][0]:
+                resolve(dep)
+            yield from plan[name][1](ctx)
+
+        for name in targets:
+            yield name, section(name)
+
+    def _run_pool(self, plan, ctx: Dict[str, Any], targets: Sequence[str],
+                  workers: int) -> Iterator[Tuple[str, Iterator[Any]]]:
+        sections = set(targets)
+
+        def execute(name: str) -> Any:
+            fn = plan[name][1]
+            if name in sections:
+                return list(fn(ctx))              # los hallazgos se materializan
+            with span(f"input.{name}"):
+                return fn(ctx)
+
+        waiting = {name: {d for d in deps if d not in ctx}
+                   for name, (deps, _) in plan.items() if name not in ctx}
+        done: Dict[str, Any] = {}
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            running: Dict[Future, str] = {}
+
+            def launch() -> None:
+                for name in [n for n, deps in waiting.items() if not deps]:
+                    del waiting[name]
+                    running[pool.submit(execute, name)] = name
+
+            launch()
+            for target in targets:
+                while target not in done:
+                    finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for fut in finished:
+                        name = running.pop(fut)
+                        done[name] = fut.result()
+                        if name not in sections:
+                            ctx[name] = done[name]
+                        for deps in waiting.values():
+                            deps.discard(name)
+                    launch()
+                yield target, iter(done[target])
+
@@ -0,0 +1,97 @@
+# src/application/sweep.py
+from __future__ import annotations
+
+import itertools
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from src.detectors.god_class import GodClassDetector
+from src.metrics.engine import MetricTable
+
+THRESHOLDS = ("score_suspicious", "score_godclass")
+
+
+def expand(grid: Dict[str, Sequence[Any]]) -> List[Dict[str, Any]]:
+    """Producto cartesiano de la grilla {clave de cfg: [valores]} (orden estable)."""
+    keys = list(grid)
+    return [dict(zip(keys, values))
+            for values in itertools.product(*(grid[k] for k in keys))]
+
+
+class ThresholdSweep:
+    """
+    Evalúa muchas configuraciones del GodClassDetector sobre métricas ya
+    calculadas, sin re-parsear ni re-analizar.
+
+    Las configuraciones se agrupan por los parámetros que cambian el
+    score (rangos de normalización y pesos "w_*"); los umbrales sólo
+    mueven cortes sobre el mismo score.  Por grupo:
+
+      1. el score se recalcula con `GodClassDetector.score` (vectorial);
+      2. se ordena una vez, arrastrando la etiqueta base de cada clase,
+         y se acumulan conteos por etiqueta base (cumsum);
+      3. cada par de umbrales se resuelve con dos búsquedas binarias:
+         los cortes dan los conteos por etiqueta y, con los acumulados,
+         cuántas clases cambian respecto de la configuración base.
+
+    Coste: O(n log n) por grupo + O(log n) por par de umbrales.
+    """
+
+    def __init__(self, table: MetricTable, base_cfg: Dict[str, Any],
+                 calculators: Dict[str, Any]) -> None:
+        self.table = table
+        self.base_cfg = base_cfg
+        self.calculators = calculators
+        _, self.base_labels = GodClassDetector(base_cfg, calculators).classify(table)
+
+    def evaluate(self, grid: Dict[str, Sequence[Any]]) -> List[Dict[str, Any]]:
+        """Una fila por configuración, en el orden de `expand(grid)`."""
+        configs = expand(grid)
+        rows: List[Dict[str, Any] | None] = [None] * len(configs)
+        groups: Dict[Tuple, List[int]] = {}
+        for k, params in enumerate(configs):
+            key = tuple((p, v) for p, v in params.items() if p not in THRESHOLDS)
+            groups.setdefault(key, []).append(k)
+
+        n = len(self.table.ids)
+        for key, members in groups.items():
+            cfg = {**self.base_cfg, **dict(key)}
+            scores = GodClassDetector(cfg, self.calculators).score(self.table)
+            order = np.argsort(scores, kind="stable")
+            ranked = scores[order]
+            base = self.base_labels[order]
+            # cum[l][i] = clases con etiqueta base l entre las i de menor score
+            cum = np.zeros((3, n + 1), dtype=np.int64)
+            for lbl in range(3):
+                np.cumsum(base == lbl, out=cum[lbl, 1:])
+
+            for k in members:
+                c = {**cfg, **configs[k]}
+                thr_g = c.get("score_godclass", GodClassDetector.default("score_godclass"))
+                thr_s = min(c.get("score_suspicious", GodClassDetector.default("score_suspicious")),
+                            thr_g)
+                a = int(np.searchsorted(ranked, thr_s, side="left"))   # < a: normal
+                b = int(np.searchsorted(ranked, thr_g, side="left"))   # ≥ b: god-class
+                same = cum[0, a] + (cum[1, b] - cum[1, a]) + (cum[2, n] - cum[2, b])
+                rows[k] = {
+                    "params": configs[k],
+                    "god_class": n - b,
+                    "suspicious": b - a,
+                    "changed": int(n - same),
+                }
+        return rows
+
+    @staticmethod
+    def sensitivity(rows: List[Dict[str, Any]]) -> Dict[str, Dict[str, float]]:
+        """
+        Efecto marginal de cada parámetro: media de clases que cambian de
+        etiqueta por valor del parámetro (promediando el resto de la grilla).
+        """
+        out: Dict[str, Dict[str, List[int]]] = {}
+        for row in rows:
+            for p, v in row["params"].items():
+                out.setdefault(p, {}).setdefault(str(v), []).append(row["changed"])
+        return {p: {v: round(float(np.mean(c)), 2) for v, c in per_value.items()}
+                for p, per_value in out.items()}
+
@@ -1,61 +1,94 @@
 # src/calibration/ai_calibrator.py
 from __future__ import annotations
 
-import json, os, re, textwrap 
-from typing import Dict, List, Any
-
-import openai
-from PyPDF2 import PdfReader
-from dotenv import load_dotenv
+import asyncio, hashlib, json, logging, os, re, statistics, textwrap
+from pathlib import Path
+from typing import Dict, List, Any, Sequence
 
+from src.calibration.digest import metric_digest
 from src.domain.model import UMLModel
-from src.metrics.structural import WMC, ATFD
-from src.metrics.architectural import FanInOut, LRC
+from src.infrastructure.pdf_text import PDFTextExtractor
+from src.metrics.engine import MetricEngine, MetricTable
+
+# openai y python-dotenv se importan al crear el primer AICalibrator
+
+log = logging.getLogger(__name__)
 
-load_dotenv()                       # lee .env si existe
 
 class AICalibrator:
     """
     Llama a ChatGPT para sugerir los rangos de normalización y los
     umbrales `score_suspicious` / `score_godclass`, basándose en:
-      • Distribución de métricas del UMLModel
+      • Distribución de métricas del UMLModel (resumen de tamaño fijo:
+        cuantiles, histograma y atípicos, acotado a `digest_tokens`)
       • Texto completo del PDF de la tesis
     Devuelve un dict con las mismas claves que config.json.
+
+    Las llamadas son asíncronas (`AsyncOpenAI`), con timeout y reintentos
+    con backoff exponencial.  Cada respuesta se cachea en disco por
+    hash(métricas, extracto, modelo, temperatura).  Con varios `models`
+    se consultan en paralelo y se combina la mediana de cada clave sobre
+    los que respondieron (uno que falla no descarta a los demás).
+    `base_url` (o OPENAI_BASE_URL) permite apuntar a un servidor local.
     """
 
+    THESIS_CHARS = 6000             # extracto de la tesis enviado en el prompt
+    DIGEST_TOKENS = 1200            # presupuesto del resumen de métricas
+
     def __init__(self,
-                 model: str = "gpt-4o-mini",
-                 api_key: str | None = None) -> None:
-        openai.api_key = api_key or os.getenv("OPENAI_API_KEY")
-        self.model = model
+                 model: str | Sequence[str] = "gpt-4o-mini",
+                 api_key: str | None = None,
+                 base_url: str | None = None,
+                 temperature: float = 0.2,
+                 timeout: float = 60.0,
+                 retries: int = 3,
+                 backoff: float = 1.0,
+                 cache_dir: str | os.PathLike | None = ".perse_cache/ai",
+                 pdf_workers: int = 1,
+                 digest_tokens: int | None = DIGEST_TOKENS) -> None:
+        from dotenv import load_dotenv
+        load_dotenv()                       # lee .env si existe
+
+        self.models = [model] if isinstance(model, str) else list(model)
+        self.model = self.models[0]
+        self.api_key = api_key or os.getenv("OPENAI_API_KEY")
+        self.base_url = base_url or os.getenv("OPENAI_BASE_URL")
+        self.temperature = temperature
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.digest_tokens = digest_tokens
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.pdf = PDFTextExtractor(
+            Path(cache_dir).parent / "pdf" if cache_dir else None, pdf_workers
+        )
 
     # ---------- helpers ------------------------------------------------ #
-    def _metric_values(self, model: UMLModel) -> Dict[str, List[int]]:
-        wmc, atfd, fan, lrc = WMC(), ATFD(), FanInOut(), LRC()
-        return dict(
-            wmc=[wmc.calc(c) for c in model.classes.values()],
-            atfd=[atfd.calc(c) for c in model.classes.values()],
-            fanin=[fan.calc_in(c) for c in model.classes.values()],
-            fanout=[fan.calc_out(c) for c in model.classes.values()],
-            lrc=[lrc.calc(c, model) for c in model.classes.values()],
-        )
+    def _metric_values(self, model: UMLModel,
+                       table: MetricTable | None = None) -> Dict[str, List[int]]:
+        if table is None:
+            table = MetricEngine().compute(model)
+        return table.values()
 
     def _pdf_to_text(self, pdf_path: str | os.PathLike) -> str:
-        reader = PdfReader(str(pdf_path))
-        pages = [page.extract_text() or "" for page in reader.pages]
-        return "\n".join(pages)
+        # sólo se extraen las páginas necesarias para el extracto del prompt
+        return self.pdf.extract(pdf_path, max_chars=self.THESIS_CHARS)
 
     def _build_prompt(self,
                       metrics: Dict[str, List[int]],
                       thesis_txt: str) -> list[dict[str, str]]:
         # resumimos la tesis a 1500 tokens aprox. (≈ 6k chars)
-        thesis_excerpt = thesis_txt[:6000]
+        thesis_excerpt = thesis_txt[:self.THESIS_CHARS]
+        # y las métricas a un resumen que no crece con el número de clases
+        digest = metric_digest(metrics, self.digest_tokens)
 
         user_msg = textwrap.dedent(f"""
         Eres un analista de ingeniería de software. 
         Recibes:
           (a) Las distribuciones de métricas WMC, ATFD, FanIn, FanOut, LRC
-              en formato JSON.
+              resumidas en formato JSON: n, min, max, media, desvío,
+              cuantiles pXX, histograma (bordes [desde, hasta) y conteos)
+              y atípicos sobre Q3 + 1.5·IQR ("extreme": sobre Q3 + 3·IQR).
           (b) Un extracto del texto de la tesis (hasta 6 000 caracteres).
 
         Tu tarea: devolver **SOLO** un objeto JSON con los campos
@@ -70,7 +103,7 @@ class AICalibrator:
           pero no mezcles comentarios con el objeto raíz.
 
         ### MÉTRICAS ###
-        {json.dumps(metrics)}
+        {json.dumps(digest, separators=(",", ":"))}
 
         ### EXTRACTO TESIS ###
         {thesis_excerpt}
@@ -91,19 +124,110 @@ class AICalibrator:
             raise ValueError("No se encontró JSON en la respuesta.")
         return json.loads(match.group(0))
 
-    # ---------- API pública -------------------------------------------- #
-    def suggest_thresholds(self,
-                           model: UMLModel,
-                           pdf_path: str | os.PathLike) -> Dict[str, float]:
-        metrics = self._metric_values(model)
-        thesis_text = self._pdf_to_text(pdf_path)
+    # ---------- caché de respuestas ----------------------------------- #
+    def _cache_key(self, messages: list[dict[str, str]], model: str) -> str:
+        payload = json.dumps(
+            {"messages": messages, "model": model, "temperature": self.temperature},
+            sort_keys=True, ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _cache_get(self, key: str) -> Dict[str, Any] | None:
+        if not self.cache_dir:
+            return None
+        path = self.cache_dir / f"{key}.json"
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def _cache_put(self, key: str, cfg_ai: Dict[str, Any]) -> None:
+        if not self.cache_dir:
+            return
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        (self.cache_dir / f"{key}.json").write_text(json.dumps(cfg_ai), encoding="utf-8")
+
+    # ---------- llamadas ----------------------------------------------- #
+    @staticmethod
+    def _retryable() -> tuple:
+        """Errores transitorios → se reintenta."""
+        import openai
+        return (openai.APIConnectionError, openai.APITimeoutError,
+                openai.RateLimitError, openai.InternalServerError)
+
+    async def _ask(self, client: "openai.AsyncOpenAI", model: str,
+                   messages: list[dict[str, str]]) -> Dict[str, Any]:
+        key = self._cache_key(messages, model)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+
+        retryable = self._retryable()
+        for attempt in range(self.retries + 1):
+            try:
+                response = await client.chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    temperature=self.temperature,
+                )
+                break
+            except retryable:
+                if attempt == self.retries:
+                    raise
+                await asyncio.sleep(self.backoff * 2 ** attempt)
+
+        cfg_ai = self._extract_json(response.choices[0].message.content)
+        self._cache_put(key, cfg_ai)
+        return cfg_ai
+
+    @staticmethod
+    def _combine(answers: List[Dict[str, Any]]) -> Dict[str, float]:
+        """Mediana por clave de las sugerencias numéricas de cada modelo."""
+        values: Dict[str, List[float]] = {}
+        for cfg_ai in answers:
+            for k, v in cfg_ai.items():
+                if isinstance(v, (int, float)) and not isinstance(v, bool):
+                    values.setdefault(k, []).append(float(v))
+        return {k: statistics.median(vs) for k, vs in values.items()}
+
+    async def suggest_async(self,
+                            metrics: Dict[str, List[int]],
+                            thesis_text: str) -> Dict[str, float]:
+        import openai
 
         messages = self._build_prompt(metrics, thesis_text)
-        response = openai.chat.completions.create(
-            model=self.model,
-            messages=messages,
-            temperature=0.2,
+        client = openai.AsyncOpenAI(
+            api_key=self.api_key, base_url=self.base_url,
+            timeout=self.timeout, max_retries=0,
         )
-        ai_text = response.choices[0].message.content
-        cfg_ai = self._extract_json(ai_text)
-        return {k: float(v) for k, v in cfg_ai.items()}
+        try:
+            results = await asyncio.gather(
+                *(self._ask(client, m, messages) for m in self.models),
+                return_exceptions=True,
+            )
+        finally:
+            await client.close()
+
+        answers = []
+        for m, res in zip(self.models, results):
+            if isinstance(res, BaseException):
+                log.warning("el modelo %s no respondió: %s", m, res)
+            else:
+                answers.append(res)
+        if not answers:
+            raise results[0]
+        return self._combine(answers)
+
+    # ---------- API pública -------------------------------------------- #
+    def suggest_from_text(self,
+                          model: UMLModel,
+                          thesis_text: str,
+                          table: MetricTable | None = None) -> Dict[str, float]:
+        metrics = self._metric_values(model, table)
+        return asyncio.run(self.suggest_async(metrics, thesis_text))
+
+    def suggest_thresholds(self,
+                           model: UMLModel,
+                           pdf_path: str | os.PathLike,
+                           table: MetricTable | None = None) -> Dict[str, float]:
+        return self.suggest_from_text(model, self._pdf_to_text(pdf_path), table)
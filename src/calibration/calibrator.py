@@ -2,8 +2,8 @@
 from __future__ import annotations
 from statistics import mean, stdev
 from typing import Dict, List
-from src.metrics.structural import WMC, ATFD
-from src.metrics.architectural import FanInOut, LRC
+from src.calibration.sketch import MetricSketches
+from src.metrics.engine import MetricEngine, MetricTable
 from src.domain.model import UMLModel
 
 class Calibrator:
@@ -13,32 +13,48 @@ class Calibrator:
         self.cfg = base_cfg or {}
 
     # ---------- DISTRIBUCIONAL ----------
-    def _metric_values(self, model: UMLModel) -> Dict[str, List[float]]:
-        wmc = WMC(); atfd = ATFD(); fan = FanInOut(); lrc = LRC()
-        values = dict(
-            wmc=[wmc.calc(c) for c in model.classes.values()],
-            atfd=[atfd.calc(c) for c in model.classes.values()],
-            fanin=[fan.calc_in(c) for c in model.classes.values()],
-            fanout=[fan.calc_out(c) for c in model.classes.values()],
-            lrc=[lrc.calc(c, model) for c in model.classes.values()],
-        )
-        return values
+    def _metric_values(self, model: UMLModel,
+                       table: MetricTable | None = None) -> Dict[str, List[float]]:
+        if table is None:
+            table = MetricEngine().compute(model)
+        return table.values()
 
     def _p95(self, seq: List[float]) -> float:
         if not seq: return 1
         k = int(0.95 * len(seq))
         return sorted(seq)[k]
 
-    def calibrate(self, model: UMLModel, context_txt: str | None = None) -> Dict[str, float]:
-        vals = self._metric_values(model)
-        # Rango de normalización basado en min / p95
+    def calibrate(self, model: UMLModel, context_txt: str | None = None,
+                  table: MetricTable | None = None) -> Dict[str, float]:
+        vals = self._metric_values(model, table)
+        # Rango de normalización basado en min / p95 (exacto: los valores
+        # ya están en memoria; los sketches quedan para corpus/merge)
         self.cfg["wmc_min"], self.cfg["wmc_max"] = min(vals["wmc"]), self._p95(vals["wmc"])
         self.cfg["atfd_min"], self.cfg["atfd_max"] = min(vals["atfd"]), self._p95(vals["atfd"])
         self.cfg["fanin_max"]  = self._p95(vals["fanin"])
         self.cfg["fanout_max"] = self._p95(vals["fanout"])
         self.cfg["lrc_max"]    = max(vals["lrc"])  # En general ≤ número de capas
+        return self._semantic(context_txt)
 
-        # ---------- SEMÁNTICA ----------
+    def calibrate_sketches(self, sk: MetricSketches,
+                           context_txt: str | None = None) -> Dict[str, float]:
+        """
+        Igual que `calibrate`, pero a partir de sketches de cuantiles
+        combinados (todo un corpus): el p95 es aproximado una vez que
+        los sketches compactaron.
+        """
+        if not sk["wmc"].n:
+            raise ValueError("no hay clases para calibrar")
+        p95 = lambda m: sk[m].quantile(0.95)  # noqa: E731
+        self.cfg["wmc_min"], self.cfg["wmc_max"] = sk["wmc"].min, p95("wmc")
+        self.cfg["atfd_min"], self.cfg["atfd_max"] = sk["atfd"].min, p95("atfd")
+        self.cfg["fanin_max"]  = p95("fanin")
+        self.cfg["fanout_max"] = p95("fanout")
+        self.cfg["lrc_max"]    = sk["lrc"].max
+        return self._semantic(context_txt)
+
+    # ---------- SEMÁNTICA ----------
+    def _semantic(self, context_txt: str | None) -> Dict[str, float]:
         if context_txt:
             pages = max(len(context_txt.split()) // 300, 1)  # 300 tokens ≈ 1 pág.
             scale = 1 + (pages / 10)          # tesis de 30 págs ⇒ scale ≈ 4
@@ -0,0 +1,96 @@
+# src/calibration/digest.py
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+CHARS_PER_TOKEN = 4             # estimación conservadora para JSON numérico
+
+# niveles de detalle, del más rico al más compacto: (bins, cuantiles)
+LEVELS: List[Tuple[int, Sequence[float]]] = [
+    (16, (0.05, 0.1, 0.25, 0.5, 0.75, 0.9, 0.95, 0.99)),
+    (8, (0.1, 0.25, 0.5, 0.75, 0.9, 0.95, 0.99)),
+    (4, (0.25, 0.5, 0.75, 0.95)),
+    (0, (0.5, 0.95)),
+]
+
+
+def summarize(values: Sequence[float] | np.ndarray, bins: int = 16,
+              quantiles: Sequence[float] = LEVELS[0][1]) -> Dict[str, Any]:
+    """
+    Resumen de tamaño fijo de una métrica: n, min, max, media, desvío,
+    cuantiles (`sorted[int(q·n)]`, como `Calibrator`), histograma de
+    `bins` intervalos [desde, hasta) y atípicos por la regla de Tukey.
+    Todo sale de un único orden del vector (searchsorted sobre él).
+    """
+    return _summarize(np.sort(np.asarray(values, dtype=float)), bins, quantiles)
+
+
+def _summarize(v: np.ndarray, bins: int, quantiles: Sequence[float]) -> Dict[str, Any]:
+    n = len(v)
+    if not n:
+        return {"n": 0}
+    q = {f"p{round(p * 100)}": _num(v[min(n - 1, int(p * n))]) for p in quantiles}
+    out: Dict[str, Any] = {
+        "n": n, "min": _num(v[0]), "max": _num(v[-1]),
+        "mean": round(float(v.mean()), 2), "std": round(float(v.std()), 2),
+        "quantiles": q,
+    }
+
+    # atípicos: por encima de Q3 + 1.5·IQR (y extremos: Q3 + 3·IQR)
+    q1, q3 = v[int(0.25 * n)], v[min(n - 1, int(0.75 * n))]
+    iqr = q3 - q1
+    out["outliers"] = {
+        "fence": _num(q3 + 1.5 * iqr),
+        "above": int(n - np.searchsorted(v, q3 + 1.5 * iqr, side="right")),
+        "extreme": int(n - np.searchsorted(v, q3 + 3 * iqr, side="right")),
+    }
+
+    if bins:
+        edges = _edges(v[0], v[-1], bins)
+        counts = np.diff(np.searchsorted(v, edges, side="left"))
+        out["histogram"] = {"edges": [_num(e) for e in edges.tolist()],
+                            "counts": counts.tolist()}
+    return out
+
+
+def _edges(lo: float, hi: float, bins: int) -> np.ndarray:
+    """
+    Bordes crecientes geométricamente desde `lo` (las métricas de conteo
+    tienen cola larga): más resolución donde está la masa.  Con pocos
+    valores distintos, un intervalo por entero.  El último borde es
+    `hi + 1`, así que `hi` queda incluido.
+    """
+    span = hi - lo
+    if span < bins:
+        return np.arange(lo, hi + 2)
+    steps = np.unique(np.ceil(np.geomspace(1.0, span + 2.0, bins + 1) - 1.0))
+    return lo + steps
+
+
+def _num(x: float) -> float | int:
+    x = float(x)
+    return int(x) if x.is_integer() else round(x, 2)
+
+
+def metric_digest(metrics: Dict[str, Sequence[float]],
+                  max_tokens: int | None = 1200) -> Dict[str, Dict[str, Any]]:
+    """
+    Resumen por métrica cuyo JSON cabe en `max_tokens` (≈ chars/4): se
+    prueba cada nivel de `LEVELS` hasta que entra.  El tamaño depende
+    sólo del nivel, no de la cantidad de clases.  Sin presupuesto se
+    usa el nivel más detallado.
+    """
+    arrays = {m: np.sort(np.asarray(v, dtype=float)) for m, v in metrics.items()}
+    digest: Dict[str, Dict[str, Any]] = {}
+    for bins, quantiles in LEVELS:
+        digest = {m: _summarize(v, bins, quantiles) for m, v in arrays.items()}
+        if max_tokens is None or estimate_tokens(digest) <= max_tokens:
+            break
+    return digest
+
+
+def estimate_tokens(obj: Any) -> int:
+    return -(-len(json.dumps(obj, separators=(",", ":"))) // CHARS_PER_TOKEN)
@@ -0,0 +1,177 @@
+# src/calibration/sketch.py
+from __future__ import annotations
+
+import json
+import math
+from pathlib import Path
+from typing import Any, Dict, Iterable, List
+
+CALIBRATED = ("wmc", "atfd", "fanin", "fanout", "lrc")
+
+
+class KLLSketch:
+    """
+    Sketch de cuantiles KLL (Karnin–Lang–Liberty) con memoria acotada.
+
+    Los valores se guardan en niveles (compactores); el nivel `h` pesa
+    2**h.  Cuando el total supera la capacidad, un nivel lleno se ordena
+    y se promueve la mitad de sus elementos (alternando pares/impares,
+    de forma determinista) al nivel siguiente.  Con `k` el error de
+    rango es ≈ 1.7/k y el tamaño queda en ≈ 3·k elementos.
+
+    Mientras no hubo compactaciones el sketch es exacto:
+    `quantile(q) == sorted(valores)[int(q·n)]`.  Dos sketches se
+    combinan con `merge` (el resultado es un sketch válido del
+    multiconjunto unión), lo que permite calibrar por shards o por
+    corridas sucesivas.
+    """
+
+    C = 2 / 3
+
+    def __init__(self, k: int = 200) -> None:
+        self.k = k
+        self.n = 0
+        self.min: float | None = None
+        self.max: float | None = None
+        self.levels: List[List[float]] = [[]]
+        self._flip = 0
+
+    # ---------- inserción --------------------------------------------- #
+    def update(self, x: float) -> None:
+        self.extend([x])
+
+    def extend(self, values: Iterable[float]) -> None:
+        values = list(values)
+        if not values:
+            return
+        lo, hi = min(values), max(values)
+        self.min = lo if self.min is None else min(self.min, lo)
+        self.max = hi if self.max is None else max(self.max, hi)
+        self.n += len(values)
+        self.levels[0].extend(values)
+        self._compress()
+
+    def merge(self, other: "KLLSketch") -> "KLLSketch":
+        if other.n == 0:
+            return self
+        while len(self.levels) < len(other.levels):
+            self.levels.append([])
+        for h, items in enumerate(other.levels):
+            self.levels[h].extend(items)
+        self.n += other.n
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+        self._compress()
+        return self
+
+    # ---------- compactación ------------------------------------------ #
+    def _capacity(self, h: int) -> int:
+        depth = len(self.levels) - 1 - h
+        return max(2, math.ceil(self.k * self.C ** depth))
+
+    def _max_size(self) -> int:
+        return sum(self._capacity(h) for h in range(len(self.levels)))
+
+    def _size(self) -> int:
+        return sum(len(lvl) for lvl in self.levels)
+
+    def _compress(self) -> None:
+        while self._size() >= self._max_size():
+            for h, lvl in enumerate(self.levels):
+                if len(lvl) >= self._capacity(h):
+                    if h + 1 == len(self.levels):
+                        self.levels.append([])
+                    lvl.sort()
+                    # un elemento sobrante (cantidad impar) se queda en el nivel
+                    keep = [lvl.pop()] if len(lvl) % 2 else []
+                    self.levels[h + 1].extend(lvl[self._flip::2])
+                    self._flip ^= 1
+                    self.levels[h] = keep
+                    break
+
+    # ---------- consultas --------------------------------------------- #
+    def quantile(self, q: float) -> float:
+        """Valor de rango `int(q·n)` (0-based) en el orden de los datos."""
+        if self.n == 0:
+            raise ValueError("sketch vacío")
+        weighted = sorted((x, 1 << h) for h, lvl in enumerate(self.levels) for x in lvl)
+        target, cum = int(q * self.n), 0
+        for x, w in weighted:
+            cum += w
+            if cum > target:
+                return x
+        return weighted[-1][0]
+
+    def __len__(self) -> int:
+        return self.n
+
+    # ---------- persistencia ------------------------------------------ #
+    def to_dict(self) -> Dict[str, Any]:
+        return {"k": self.k, "n": self.n, "min": self.min, "max": self.max,
+                "flip": self._flip, "levels": self.levels}
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "KLLSketch":
+        sk = cls(d["k"])
+        sk.n, sk.min, sk.max = d["n"], d["min"], d["max"]
+        sk.levels = [list(lvl) for lvl in d["levels"]] or [[]]
+        sk._flip = d.get("flip", 0)
+        return sk
+
+
+class MetricSketches:
+    """
+    Un KLLSketch por métrica calibrada, más el registro de qué modelos
+    (`fuente → ruta`) ya se sumaron para no contarlos dos veces al
+    combinar estados de distintas corridas o shards.
+    """
+
+    def __init__(self, k: int = 200) -> None:
+        self.k = k
+        self.sketches: Dict[str, KLLSketch] = {m: KLLSketch(k) for m in CALIBRATED}
+        self.sources: Dict[str, str] = {}
+
+    def __getitem__(self, metric: str) -> KLLSketch:
+        return self.sketches[metric]
+
+    def __contains__(self, source: str) -> bool:
+        return source in self.sources
+
+    @classmethod
+    def from_values(cls, values: Dict[str, List[float]], k: int = 200,
+                    source: str | None = None, path: str = "") -> "MetricSketches":
+        """`values` en el formato de `MetricTable.values()`."""
+        ms = cls(k)
+        for m in CALIBRATED:
+            ms.sketches[m].extend(values[m])
+        if source:
+            ms.sources[source] = path
+        return ms
+
+    def merge(self, other: "MetricSketches") -> "MetricSketches":
+        repeated = set(self.sources) & set(other.sources)
+        if repeated:
+            raise ValueError(f"modelos ya incluidos en el estado: {sorted(repeated)}")
+        for m in CALIBRATED:
+            self.sketches[m].merge(other.sketches[m])
+        self.sources.update(other.sources)
+        return self
+
+    # ---------- persistencia ------------------------------------------ #
+    def to_dict(self) -> Dict[str, Any]:
+        return {"k": self.k, "sources": self.sources,
+                "sketches": {m: sk.to_dict() for m, sk in self.sketches.items()}}
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "MetricSketches":
+        ms = cls(d["k"])
+        ms.sketches.update({m: KLLSketch.from_dict(s) for m, s in d["sketches"].items()})
+        ms.sources = dict(d.get("sources", {}))
+        return ms
+
+    def save(self, path: Path | str) -> None:
+        Path(path).write_text(json.dumps(self.to_dict()), encoding="utf-8")
+
+    @classmethod
+    def load(cls, path: Path | str) -> "MetricSketches":
+        return cls.from_dict(json.loads(Path(path).read_text(encoding="utf-8")))
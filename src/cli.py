@@ -1,15 +1,26 @@
 # src/cli.py
 from __future__ import annotations
-import json, pathlib, typer
+import cProfile, contextlib, json, logging, os, pathlib, typer
 
-from src.infrastructure.xmi_parser import XMIParser
-from src.metrics.structural import WMC, ATFD, TCC
-from src.metrics.architectural import FanInOut, LRC
-from src.detectors.god_class import GodClassDetector
-from src.detectors.hub_like import HubLikeDependencyDetector
+# Sólo stdlib + typer al cargar el módulo: `--help` no paga lxml/numpy/scipy.
+# Los detectores/métricas se importan al seleccionarse (ver registry).
+from src.detectors.registry import DEFAULT_DETECTORS, DETECTORS
+from src.infrastructure.profiling import Profiler, span
 
 app = typer.Typer(help="Detector de God Class y Hub-Like Dependency.")
 
+
+@app.callback()
+def main(
+    log_level: str = typer.Option(
+        "WARNING",
+        "--log-level",
+        help="Nivel de los diagnósticos (DEBUG muestra cada clase normal)"),
+) -> None:
+    """Opciones comunes a todos los comandos."""
+    logging.basicConfig(level=log_level.upper(), format="[%(levelname)s] %(name)s: %(message)s")
+
+
 # --------------------------------------------------------------------------- #
 @app.command()
 def analyse(
@@ -17,7 +28,7 @@ def analyse(
     xmi: pathlib.Path = typer.Argument(
         ...,
         exists=True, readable=True,
-        help="Diagrama UML en formato .xmi"),
+        help="Diagrama UML en formato .xmi (o directorio de fragmentos .xmi)"),
     config: pathlib.Path = typer.Option(
         ...,
         "-c", "--config",
@@ -39,15 +50,66 @@ def analyse(
         False,
         "--ai-calibrate",
         help="Pedir a ChatGPT que sugiera umbrales"),
+    ai_model: list[str] = typer.Option(
+        ["gpt-4o-mini"],
+        "--ai-model",
+        help="Modelo(s) a consultar; repetir la opción para combinar varios"),
+    ai_base_url: str | None = typer.Option(
+        None,
+        "--ai-base-url",
+        help="URL base compatible con OpenAI (p. ej. un servidor local)"),
+    # ---------- parseo ----------------------------------------------- #
+    streaming: bool = typer.Option(
+        False,
+        "--streaming",
+        help="Parseo incremental (iterparse) para XMI muy grandes"),
+    # ---------- caché ------------------------------------------------ #
+    no_cache: bool = typer.Option(
+        False,
+        "--no-cache",
+        help="No leer ni escribir la caché de modelos/métricas (ni la de IA/PDF)"),
+    cache_dir: pathlib.Path = typer.Option(
+        ".perse_cache",
+        "--cache-dir",
+        help="Directorio de la caché (clave: hash del XMI + versiones)"),
+    # ---------- detectores ------------------------------------------- #
+    detectors: str = typer.Option(
+        ",".join(DEFAULT_DETECTORS),
+        "--detectors",
+        help="Detectores a ejecutar, separados por coma (opcionales: "
+             f"{', '.join(n for n in DETECTORS.names() if n not in DEFAULT_DETECTORS)})"),
+    workers: int = typer.Option(
+        1,
+        "-j", "--workers",
+        help="Procesos para las métricas por clase (shards en memoria compartida) "
+             "y para parsear los fragmentos de un directorio; hilos para los "
+             "detectores independientes"),
+    # ---------- perfilado -------------------------------------------- #
+    profile: bool = typer.Option(
+        False,
+        "--profile",
+        help="Guardar tiempos/CPU/memoria por etapa en <out>.profile.json"),
+    cprofile: pathlib.Path | None = typer.Option(
+        None,
+        "--cprofile",
+        help="Volcar estadísticas de cProfile (pstats) en este archivo"),
     # ---------- salidas ---------------------------------------------- #
     out: pathlib.Path = typer.Option(
         "report.json",
         "-o", "--out",
         help="Archivo JSON con el informe final"),
+    fmt: str = typer.Option(
+        "json",
+        "--format",
+        help="json (un documento) o ndjson (un hallazgo por línea, en streaming)"),
     metrics_out: pathlib.Path = typer.Option(
         "metricas.json",
         "--metrics-out",
         help="Archivo JSON donde se guardan los umbrales efectivos"),
+    columns_out: pathlib.Path | None = typer.Option(
+        None,
+        "--columns-out",
+        help="Export columnar por clase (.arrow/.parquet con pyarrow, o directorio .cols)"),
 ) -> None:
     """
     Procesa el XMI y genera:
@@ -56,8 +118,59 @@ def analyse(
       • metricas.json   → umbrales utilizados (calibrados o AI)
     """
     # ------------------------------------------------------------------ #
+    from src.infrastructure.cache import ModelCache
+    from src.infrastructure.report_writer import WRITERS
+
+    try:
+        selected = DETECTORS.parse(detectors)
+    except KeyError as err:
+        typer.secho(f"❌  {err.args[0]}", fg=typer.colors.RED, err=True)
+        raise typer.Exit(code=1)
+    if fmt not in WRITERS:
+        typer.secho(f"❌  formato desconocido: {fmt} (disponibles: {', '.join(WRITERS)})",
+                    fg=typer.colors.RED, err=True)
+        raise typer.Exit(code=1)
+
+    prof = Profiler() if profile else None
+    cpr = cProfile.Profile() if cprofile else None
+    with prof.activate() if prof else contextlib.nullcontext():
+        if cpr:
+            cpr.enable()
+        try:
+            _analyse(xmi, config, context, pdf, ai_calibrate, ai_model, ai_base_url,
+                     streaming, None if no_cache else ModelCache(cache_dir),
+                     selected, workers, out, WRITERS[fmt], metrics_out, columns_out)
+        finally:
+            if cpr:
+                cpr.disable()
+                cpr.dump_stats(str(cprofile))
+
+    if prof:
+        prof_out = out.with_suffix(".profile.json")
+        prof.write(prof_out)
+        typer.echo(f"⏱️  Perfil → {prof_out}")
+    if cpr:
+        typer.echo(f"⏱️  cProfile → {cprofile}")
+
+
+# --------------------------------------------------------------------------- #
+def _analyse(xmi: pathlib.Path, config: pathlib.Path,
+             context: pathlib.Path | None, pdf: pathlib.Path | None,
+             ai_calibrate: bool, ai_model: list[str], ai_base_url: str | None,
+             streaming: bool, cache: ModelCache | None, detectors: list[str],
+             workers: int, out: pathlib.Path, writer, metrics_out: pathlib.Path,
+             columns_out: pathlib.Path | None = None) -> None:
+    from src.application import analysis
+
     cfg = json.loads(config.read_text(encoding="utf-8"))
-    model = XMIParser().parse(xmi)
+    calculators = analysis.default_calculators(cfg)
+
+    # ---------- 0 · modelo + métricas (caché o parseo) ---------------- #
+    # las métricas por clase sólo si algo de la corrida las usa
+    metrics = bool(ai_calibrate or context or columns_out) or analysis.requires_table(detectors)
+    model, table, hit = analysis.load_model(xmi, calculators, streaming, cache, workers, metrics)
+    if hit:
+        typer.echo(f"[CACHE]  modelo y métricas reutilizados ({len(model)} clases)")
 
     # ---------- 1 · calibración IA ------------------------------------ #
     if ai_calibrate:
@@ -66,15 +179,21 @@ def analyse(
                          fg=typer.colors.RED, err=True)
             raise typer.Exit(code=1)
         from src.calibration.ai_calibrator import AICalibrator
-        cfg = AICalibrator().suggest_thresholds(model, pdf)
+        with span("calibration.ai"):
+            # respuestas y texto del PDF se cachean junto a los modelos
+            # (<cache-dir>/ai, <cache-dir>/pdf); --no-cache los desactiva
+            # "pdf_workers" en el config: extracción del PDF en paralelo
+            calibrator = AICalibrator(ai_model, base_url=ai_base_url,
+                                      cache_dir=cache.dir / "ai" if cache else None,
+                                      pdf_workers=cfg.get("pdf_workers", 1))
+            cfg = calibrator.suggest_thresholds(model, pdf, table)
         typer.secho("[AI]  Umbrales sugeridos por ChatGPT aplicados.",
                      fg=typer.colors.GREEN)
 
     # ---------- 2 · calibración clásica (percentiles + contexto) ------ #
     elif context:
-        from src.calibration.calibrator import Calibrator
         ctx_txt = context.read_text(encoding="utf-8")
-        cfg = Calibrator(cfg).calibrate(model, ctx_txt)
+        cfg = analysis.calibrate(cfg, model, table, ctx_txt)
         typer.echo(
             f"[CAL]  score_godclass={cfg.get('score_godclass', 0.75):.2f} – "
             f"score_suspicious={cfg.get('score_suspicious', 0.50):.2f}"
@@ -86,17 +205,460 @@ def analyse(
     metrics_out.write_text(json.dumps(cfg, indent=2), encoding="utf-8")
     typer.echo(f"📊 Umbrales efectivos → {metrics_out}")
 
-    # ---------- 4 · detección ----------------------------------------- #
-    calculators = dict(
-        wmc=WMC(), atfd=ATFD(), tcc=TCC(), fan=FanInOut(), lrc=LRC()
+    # ---------- 4 · detección + informe (en streaming) ---------------- #
+    # los detectores corren mientras se escriben: cada `detector.*` mide
+    # sólo su producción y el `self_s` de report.write es la escritura
+    with span("report.write"):
+        writer(analysis.iter_sections(cfg, model, table, calculators, detectors, workers), out)
+    typer.echo(f"✅ Informe escrito en {out}")
+
+    # ---------- 5 · export columnar (opcional) ------------------------ #
+    if columns_out:
+        _write_columns(analysis.class_columns(cfg, model, table, calculators), columns_out)
+
+
+def _write_columns(columns, path: pathlib.Path) -> None:
+    from src.infrastructure.columnar import write_columns
+    try:
+        with span("columns.write"):
+            write_columns(columns, path)
+    except (ImportError, ValueError) as err:
+        typer.secho(f"❌  {err}", fg=typer.colors.RED, err=True)
+        raise typer.Exit(code=1)
+    typer.echo(f"🧱 Columnas por clase → {path}")
+
+
+# --------------------------------------------------------------------------- #
+@app.command()
+def incremental(
+    xmi: pathlib.Path = typer.Argument(
+        ...,
+        exists=True, readable=True,
+        help="Nueva versión del diagrama UML (.xmi)"),
+    config: pathlib.Path = typer.Option(
+        ...,
+        "-c", "--config",
+        exists=True, readable=True,
+        help="config.json con rangos iniciales (fallback)"),
+    state: pathlib.Path = typer.Option(
+        "perse_state.npz",
+        "--state",
+        help="Estado de la corrida anterior (se crea si no existe)"),
+    context: pathlib.Path | None = typer.Option(
+        None,
+        "--context", "-ctx",
+        exists=True, readable=True,
+        help="Resumen de la tesis (TXT) para calibrar con percentiles"),
+    streaming: bool = typer.Option(
+        False,
+        "--streaming",
+        help="Parseo incremental (iterparse) para XMI muy grandes"),
+    out: pathlib.Path = typer.Option(
+        "report.json",
+        "-o", "--out",
+        help="Archivo JSON con el informe completo"),
+    delta_out: pathlib.Path = typer.Option(
+        "delta.json",
+        "--delta-out",
+        help="Archivo JSON con hallazgos nuevos / resueltos / cambiados"),
+    columns_out: pathlib.Path | None = typer.Option(
+        None,
+        "--columns-out",
+        help="Export columnar por clase (.arrow/.parquet con pyarrow, o directorio .cols)"),
+) -> None:
+    """
+    Re-analiza el XMI recalculando sólo las clases cambiadas (por xmi:id)
+    y sus vecinos; PageRank arranca desde el vector anterior.
+    """
+    from src.application import analysis
+    from src.application.incremental import AnalysisState, run_incremental
+
+    cfg = json.loads(config.read_text(encoding="utf-8"))
+    ctx_txt = context.read_text(encoding="utf-8") if context else None
+    previous = AnalysisState.load(state) if state.exists() else None
+
+    res = run_incremental(xmi, cfg, previous, analysis.default_calculators(cfg),
+                          ctx_txt, streaming)
+    out.write_text(json.dumps(res["report"], indent=2), encoding="utf-8")
+    res["state"].save(state)
+
+    st = res["stats"]
+    typer.echo(
+        f"[INC]  +{st['added']} -{st['removed']} ~{st['changed']} clases; "
+        f"recalculadas {st['recomputed']}/{st['classes']}"
+    )
+    if res["delta"] is not None:
+        delta_out.write_text(json.dumps(res["delta"], indent=2), encoding="utf-8")
+        typer.echo(f"🔀 Delta → {delta_out}")
+    typer.echo(f"✅ Informe escrito en {out}")
+    if columns_out:
+        from src.infrastructure.columnar import class_columns
+        s = res["state"]
+        _write_columns(class_columns(s.table, s.scores, s.labels, s.pagerank), columns_out)
+
+
+# --------------------------------------------------------------------------- #
+@app.command()
+def batch(
+    source: str = typer.Argument(
+        ...,
+        help="Directorio con modelos .xmi o patrón glob (p. ej. 'models/**/*.xmi')"),
+    config: pathlib.Path = typer.Option(
+        ...,
+        "-c", "--config",
+        exists=True, readable=True,
+        help="config.json con rangos iniciales (fallback)"),
+    context: pathlib.Path | None = typer.Option(
+        None,
+        "--context", "-ctx",
+        exists=True, readable=True,
+        help="Resumen de la tesis (TXT) para calibrar cada modelo"),
+    pattern: str = typer.Option(
+        "**/*.xmi",
+        "--pattern",
+        help="Patrón de búsqueda cuando SOURCE es un directorio"),
+    workers: int = typer.Option(
+        os.cpu_count() or 1,
+        "-j", "--workers",
+        help="Procesos en paralelo (1 = secuencial)"),
+    streaming: bool = typer.Option(
+        False,
+        "--streaming",
+        help="Parseo incremental (iterparse) para XMI muy grandes"),
+    no_cache: bool = typer.Option(
+        False,
+        "--no-cache",
+        help="No leer ni escribir la caché de modelos/métricas"),
+    cache_dir: pathlib.Path = typer.Option(
+        ".perse_cache",
+        "--cache-dir",
+        help="Directorio de la caché (clave: hash del XMI + versiones)"),
+    detectors: str = typer.Option(
+        ",".join(DEFAULT_DETECTORS),
+        "--detectors",
+        help="Detectores a ejecutar, separados por coma (opcionales: "
+             f"{', '.join(n for n in DETECTORS.names() if n not in DEFAULT_DETECTORS)})"),
+    out_dir: pathlib.Path = typer.Option(
+        "reports/batch",
+        "-o", "--out-dir",
+        help="Directorio para los informes por modelo y summary.json"),
+) -> None:
+    """
+    Analiza muchos XMI en un pool de procesos y genera:
+
+      • <modelo>.report.json / <modelo>.metricas.json  por archivo
+      • summary.json  → resumen agregado (los fallos no abortan el lote)
+    """
+    from src.application.batch import discover, run_batch, source_root
+
+    try:
+        selected = DETECTORS.parse(detectors)
+    except KeyError as err:
+        typer.secho(f"❌  {err.args[0]}", fg=typer.colors.RED, err=True)
+        raise typer.Exit(code=1)
+
+    files = discover(source, pattern)
+    if not files:
+        typer.secho(f"❌  No se encontraron modelos en {source}",
+                     fg=typer.colors.RED, err=True)
+        raise typer.Exit(code=1)
+
+    cfg = json.loads(config.read_text(encoding="utf-8"))
+    ctx_txt = context.read_text(encoding="utf-8") if context else None
+    # stems relativos al prefijo fijo del glob: models/a/x.xmi y
+    # models/b/x.xmi no se pisan
+    base = source_root(source)
+    summary = run_batch(
+        files, cfg, out_dir, base=base, workers=workers, context_txt=ctx_txt,
+        streaming=streaming, cache_dir=None if no_cache else cache_dir,
+        detectors=selected,
+    )
+
+    for r in summary["results"]:
+        if r["status"] != "ok":
+            typer.secho(f"⚠️  {r['model']}: {r['error']}", fg=typer.colors.YELLOW, err=True)
+    typer.echo(
+        f"✅ {summary['ok']}/{summary['models']} modelos analizados – "
+        f"resumen en {out_dir / 'summary.json'}"
+    )
+
+
+# --------------------------------------------------------------------------- #
+@app.command()
+def corpus(
+    source: str = typer.Argument(
+        ...,
+        help="Directorio con modelos .xmi o patrón glob (p. ej. 'models/**/*.xmi')"),
+    config: pathlib.Path = typer.Option(
+        ...,
+        "-c", "--config",
+        exists=True, readable=True,
+        help="config.json con rangos iniciales (fallback)"),
+    state: pathlib.Path = typer.Option(
+        "corpus_state.json",
+        "--state",
+        help="Sketches acumulados del corpus (se crea si no existe)"),
+    merge: list[pathlib.Path] = typer.Option(
+        [],
+        "--merge",
+        exists=True, readable=True,
+        help="Otro estado de sketches a combinar (repetible; p. ej. shards)"),
+    context: pathlib.Path | None = typer.Option(
+        None,
+        "--context", "-ctx",
+        exists=True, readable=True,
+        help="Resumen de la tesis (TXT) para los cortes score_*"),
+    pattern: str = typer.Option(
+        "**/*.xmi",
+        "--pattern",
+        help="Patrón de búsqueda cuando SOURCE es un directorio"),
+    k: int = typer.Option(
+        200,
+        "-k",
+        help="Tamaño de los sketches KLL (error de rango ≈ 1.7/k)"),
+    workers: int = typer.Option(
+        os.cpu_count() or 1,
+        "-j", "--workers",
+        help="Procesos en paralelo (1 = secuencial)"),
+    streaming: bool = typer.Option(
+        False,
+        "--streaming",
+        help="Parseo incremental (iterparse) para XMI muy grandes"),
+    no_cache: bool = typer.Option(
+        False,
+        "--no-cache",
+        help="No leer ni escribir la caché de modelos/métricas"),
+    cache_dir: pathlib.Path = typer.Option(
+        ".perse_cache",
+        "--cache-dir",
+        help="Directorio de la caché (clave: hash del XMI + versiones)"),
+    out: pathlib.Path = typer.Option(
+        "metricas_corpus.json",
+        "-o", "--out",
+        help="Umbrales calibrados para todo el corpus"),
+) -> None:
+    """
+    Calibra umbrales sobre un corpus completo con sketches de cuantiles
+    combinables (memoria acotada, sin guardar cada valor):
+
+      • --state              → sketches acumulados (corridas sucesivas)
+      • metricas_corpus.json → *_min / *_max / score_* del corpus
+    """
+    from src.application.batch import discover
+    from src.application.corpus import run_corpus
+    from src.calibration.calibrator import Calibrator
+
+    files = discover(source, pattern)
+    if not files and not merge and not state.exists():
+        typer.secho(f"❌  No se encontraron modelos en {source}",
+                     fg=typer.colors.RED, err=True)
+        raise typer.Exit(code=1)
+
+    cfg = json.loads(config.read_text(encoding="utf-8"))
+    try:
+        sketches, summary = run_corpus(
+            files, state, k=k, workers=workers, streaming=streaming,
+            cache_dir=None if no_cache else cache_dir, merge=merge, cfg=cfg,
+        )
+    except ValueError as err:
+        typer.secho(f"❌  {err}", fg=typer.colors.RED, err=True)
+        raise typer.Exit(code=1)
+    for xmi, error in summary["errors"].items():
+        typer.secho(f"⚠️  {xmi}: {error}", fg=typer.colors.YELLOW, err=True)
+    if not summary["classes"]:
+        typer.secho("❌  El corpus no tiene clases", fg=typer.colors.RED, err=True)
+        raise typer.Exit(code=1)
+
+    ctx_txt = context.read_text(encoding="utf-8") if context else None
+    cfg = Calibrator(cfg).calibrate_sketches(sketches, ctx_txt)
+    out.write_text(json.dumps(cfg, indent=2), encoding="utf-8")
+    typer.echo(
+        f"[CORPUS]  {summary['models']} modelos / {summary['classes']} clases "
+        f"(+{summary['added']} nuevos, {summary['skipped']} ya incluidos) – estado en {state}"
     )
+    typer.echo(f"📊 Umbrales del corpus → {out}")
+
+
+# --------------------------------------------------------------------------- #
+@app.command()
+def sweep(
+    xmi: pathlib.Path = typer.Argument(
+        ...,
+        exists=True, readable=True,
+        help="Diagrama UML (.xmi o directorio de fragmentos) o export columnar "
+             "(.arrow/.parquet/.cols) de una corrida anterior"),
+    config: pathlib.Path = typer.Option(
+        ...,
+        "-c", "--config",
+        exists=True, readable=True,
+        help="config.json base (las etiquetas de referencia salen de aquí)"),
+    grid: pathlib.Path = typer.Option(
+        ...,
+        "--grid",
+        exists=True, readable=True,
+        help='JSON {clave de config: [valores]}, p. ej. {"score_godclass": [0.6, 0.75]}'),
+    context: pathlib.Path | None = typer.Option(
+        None,
+        "--context", "-ctx",
+        exists=True, readable=True,
+        help="Resumen de la tesis (TXT) para calibrar la configuración base"),
+    streaming: bool = typer.Option(
+        False,
+        "--streaming",
+        help="Parseo incremental (iterparse) para XMI muy grandes"),
+    no_cache: bool = typer.Option(
+        False,
+        "--no-cache",
+        help="No leer ni escribir la caché de modelos/métricas"),
+    cache_dir: pathlib.Path = typer.Option(
+        ".perse_cache",
+        "--cache-dir",
+        help="Directorio de la caché (clave: hash del XMI + versiones)"),
+    out: pathlib.Path = typer.Option(
+        "sweep.json",
+        "-o", "--out",
+        help="Archivo JSON con los conteos por configuración y la sensibilidad"),
+) -> None:
+    """
+    Barrido de umbrales / rangos / pesos del God-Class sobre métricas
+    calculadas una sola vez: por configuración, cuántas clases quedan en
+    cada etiqueta y cuántas cambian respecto de la configuración base.
+    """
+    import time
 
-    report = {
-        "god_class": GodClassDetector(cfg, calculators).detect(model),
-        "hub_like": HubLikeDependencyDetector().detect(model),
+    from src.application import analysis
+    from src.application.sweep import ThresholdSweep
+    from src.detectors.god_class import GodClassDetector
+    from src.infrastructure import columnar
+    from src.infrastructure.cache import ModelCache
+
+    cfg = json.loads(config.read_text(encoding="utf-8"))
+    spec = json.loads(grid.read_text(encoding="utf-8"))
+    if not isinstance(spec, dict) or not all(isinstance(v, list) and v for v in spec.values()):
+        typer.secho("❌  --grid debe ser un objeto {clave: [valores, …]}",
+                    fg=typer.colors.RED, err=True)
+        raise typer.Exit(code=1)
+
+    calculators = analysis.default_calculators(cfg)
+    if columnar.is_columnar(xmi):             # métricas previas, sin parsear
+        model, table = None, columnar.to_metric_table(columnar.read_columns(xmi))
+    else:
+        model, table, _ = analysis.load_model(xmi, calculators, streaming,
+                                              None if no_cache else ModelCache(cache_dir))
+    if context:
+        cfg = analysis.calibrate(cfg, model, table, context.read_text(encoding="utf-8"))
+
+    t0 = time.perf_counter()
+    sweeper = ThresholdSweep(table, cfg, calculators)
+    rows = sweeper.evaluate(spec)
+    elapsed = time.perf_counter() - t0
+
+    base = sweeper.base_labels
+    result = {
+        "classes": len(table.ids),
+        "base": {"params": {k: cfg.get(k, GodClassDetector.default(k)) for k in spec},
+                 "god_class": int((base == 2).sum()), "suspicious": int((base == 1).sum())},
+        "configs": rows,
+        "sensitivity": ThresholdSweep.sensitivity(rows),
     }
-    out.write_text(json.dumps(report, indent=2), encoding="utf-8")
-    typer.echo(f"✅ Informe escrito en {out}")
+    out.write_text(json.dumps(result, indent=2), encoding="utf-8")
+    typer.echo(f"🔍 {len(rows)} configuraciones evaluadas en {elapsed:.3f}s")
+    typer.echo(f"✅ Barrido escrito en {out}")
+
+
+# --------------------------------------------------------------------------- #
+@app.command()
+def diff(
+    old: pathlib.Path = typer.Argument(
+        ...,
+        exists=True, readable=True,
+        help="Export columnar anterior (.arrow/.parquet/.cols)"),
+    new: pathlib.Path = typer.Argument(
+        ...,
+        exists=True, readable=True,
+        help="Export columnar nuevo (.arrow/.parquet/.cols)"),
+    out: pathlib.Path = typer.Option(
+        "delta.json",
+        "-o", "--out",
+        help="Archivo JSON con hallazgos nuevos / resueltos / cambiados"),
+) -> None:
+    """
+    Compara dos exports columnares por xmi:id (sin parsear XMI ni JSON)
+    y genera el mismo delta de God-Class que `incremental`.
+    """
+    from src.infrastructure import columnar
+
+    try:
+        delta = columnar.diff(columnar.read_columns(old), columnar.read_columns(new))
+    except (ImportError, ValueError) as err:
+        typer.secho(f"❌  {err}", fg=typer.colors.RED, err=True)
+        raise typer.Exit(code=1)
+    out.write_text(json.dumps(delta, indent=2), encoding="utf-8")
+    g = delta["god_class"]
+    typer.echo(f"🔀 +{len(g['new'])} nuevos, -{len(g['resolved'])} resueltos, "
+               f"~{len(g['changed'])} cambiados → {out}")
+
+
+# --------------------------------------------------------------------------- #
+@app.command()
+def serve(
+    xmi: list[pathlib.Path] = typer.Argument(
+        ...,
+        exists=True, readable=True,
+        help="Modelos .xmi a mantener en memoria y vigilar"),
+    config: pathlib.Path = typer.Option(
+        ...,
+        "-c", "--config",
+        exists=True, readable=True,
+        help="config.json con rangos iniciales (fallback)"),
+    context: pathlib.Path | None = typer.Option(
+        None,
+        "--context", "-ctx",
+        exists=True, readable=True,
+        help="Resumen de la tesis (TXT) para calibrar con percentiles"),
+    streaming: bool = typer.Option(
+        False,
+        "--streaming",
+        help="Parseo incremental (iterparse) para XMI muy grandes"),
+    host: str = typer.Option(
+        "127.0.0.1",
+        "--host",
+        help="Interfaz HTTP (por defecto sólo localhost)"),
+    port: int = typer.Option(
+        8765,
+        "--port",
+        help="Puerto HTTP"),
+    unix_socket: pathlib.Path | None = typer.Option(
+        None,
+        "--socket",
+        help="Atender en un socket Unix en lugar de TCP"),
+    interval: float = typer.Option(
+        1.0,
+        "--interval",
+        help="Segundos entre sondeos de cambios en los XMI"),
+) -> None:
+    """
+    Daemon: mantiene los modelos analizados en memoria, los re-analiza
+    (incrementalmente) al cambiar y responde consultas JSON:
+    /report, /metrics?class=…, /hubs, /delta, /models, POST /analyse.
+    """
+    from src.application.daemon import AnalysisService, make_server, serve as serve_forever
+
+    cfg = json.loads(config.read_text(encoding="utf-8"))
+    ctx_txt = context.read_text(encoding="utf-8") if context else None
+    service = AnalysisService(cfg, ctx_txt, streaming)
+    for path in xmi:
+        entry = service.add(path)
+        typer.echo(f"[SERVE]  {path} – {entry.stats['classes']} clases ({entry.seconds:.2f}s)")
+
+    try:
+        server = make_server(service, host, port, unix_socket)
+    except FileExistsError as err:
+        typer.secho(f"❌  {err}", fg=typer.colors.RED, err=True)
+        raise typer.Exit(code=1)
+    where = unix_socket if unix_socket else f"http://{host}:{port}"
+    typer.echo(f"🛰️  Escuchando en {where} (Ctrl-C para salir)")
+    serve_forever(service, server, interval)
 
 
 # --------------------------------------------------------------------------- #
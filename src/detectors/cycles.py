@@ -0,0 +1,67 @@
+# src/detectors/cycles.py
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+import numpy as np
+from scipy.sparse.csgraph import connected_components
+
+from src.detectors.graph import ClassGraph
+from src.domain.model import UMLModel
+
+REQUIRES = ("graph",)
+
+
+class CyclicDependencyDetector:
+    """
+    Ciclos de dependencias = componentes fuertemente conexas (CFC) con
+    al menos `min_size` clases del grafo por id de ClassGraph.
+
+    Las CFC se obtienen en tiempo lineal O(V+E) con
+    `scipy.sparse.csgraph.connected_components(connection="strong")`
+    (variante de Tarjan de Pearce, en C).  Cada hallazgo es un cluster
+    cíclico: sus clases, paquetes y cuántas aristas quedan dentro.
+    """
+
+    def __init__(self, min_size: int = 2) -> None:
+        self.min_size = max(2, min_size)      # el parser descarta auto-dependencias
+
+    def detect(self, model: UMLModel, graph: ClassGraph | None = None) -> List[Dict[str, Any]]:
+        g = graph if graph is not None else ClassGraph.from_model(model)
+        if not len(g):
+            return []
+        n_comp, comp = connected_components(g.adjacency, directed=True, connection="strong")
+        sizes = np.bincount(comp, minlength=n_comp)
+        cyclic = np.flatnonzero(sizes >= self.min_size)
+        if not len(cyclic):
+            return []
+
+        # aristas internas: ambos extremos en la misma componente
+        coo = g.adjacency.tocoo()
+        same = comp[coo.row] == comp[coo.col]
+        internal = np.bincount(comp[coo.row[same]], minlength=n_comp)
+
+        ids, names = g.ids(), g.names()
+        pkgs = g.model.class_pkg[g.nodes]
+        s = g.model.strings
+        # nodos agrupados por componente (estable: orden de las clases)
+        order = np.argsort(comp, kind="stable")
+        start = np.concatenate(([0], np.cumsum(sizes)))
+        findings = []
+        for c in cyclic.tolist():
+            members = order[start[c]:start[c + 1]].tolist()
+            findings.append({
+                "classes": [names[k] for k in members],
+                "ids": [ids[k] for k in members],
+                "size": len(members),
+                "edges": int(internal[c]),
+                "packages": sorted({s[p] or "" for p in pkgs[members].tolist()}),
+            })
+        findings.sort(key=lambda f: (-f["size"], f["ids"][0]))
+        return findings
+
+
+def run(cfg: Dict[str, Any], model: UMLModel, calculators: Dict[str, Any],
+        graph: ClassGraph | None = None):
+    """Punto de entrada del registro de detectores."""
+    return CyclicDependencyDetector(cfg.get("cycle_min_size", 2)).detect(model, graph)
@@ -1,8 +1,18 @@
 # src/detectors/god_class.py
 from __future__ import annotations
 
-from typing import Dict, Any
+import logging
+from typing import Any, Dict, Iterator
+
+import numpy as np
+
 from src.domain.model import UMLModel
+from src.metrics.engine import MetricEngine, MetricTable
+
+log = logging.getLogger(__name__)
+
+# entradas compartidas que recibe `run` (ver application.pipeline)
+REQUIRES = ("table",)
 
 
 class GodClassDetector:
@@ -18,8 +28,33 @@ class GodClassDetector:
     por defecto (estándar de la literatura).
     """
 
-    def __init__(self, cfg: Dict[str, Any], calculators: Dict[str, Any]) -> None:
+    LABELS = ("normal", "suspicious", "god-class")
+    # pesos del score (claves opcionales de `cfg`, p. ej. "w_wmc": 0.5)
+    WEIGHTS = {
+        "w_wmc": 0.4, "w_atfd": 0.3, "w_tcc": 0.3,          # parcial base
+        "w_lrc": 0.4, "w_fanout": 0.3, "w_fanin": 0.3,      # parcial arquitectónico
+        "w_base": 0.5, "w_arq": 0.3,
+    }
+    THRESHOLDS = {"score_godclass": 0.75, "score_suspicious": 0.50}
+
+    @classmethod
+    def default(cls, key: str) -> float | None:
+        """Valor que usa el detector para `key` cuando no está en `cfg`."""
+        if key in cls.THRESHOLDS:
+            return cls.THRESHOLDS[key]
+        if key in cls.WEIGHTS:
+            return cls.WEIGHTS[key]
+        if key.endswith("_min"):
+            return 0
+        if key.endswith("_max"):
+            return 1
+        return None
+
+    def __init__(self, cfg: Dict[str, Any], calculators: Dict[str, Any],
+                 workers: int = 1) -> None:
         self.cfg = cfg
+        self._calculators = calculators
+        self.workers = workers          # > 1: métricas por shards en paralelo
         self.wmc = calculators["wmc"]
         self.atfd = calculators["atfd"]
         self.tcc = calculators["tcc"]
@@ -27,36 +62,35 @@ class GodClassDetector:
         self.fan = calculators["fan"]
 
         # Umbrales de decisión (heredados o recalibrados)
-        self.thr_godclass = cfg.get("score_godclass", 0.75)
-        self.thr_susp     = cfg.get("score_suspicious", 0.50)
+        self.thr_godclass = cfg.get("score_godclass", self.THRESHOLDS["score_godclass"])
+        self.thr_susp     = cfg.get("score_suspicious", self.THRESHOLDS["score_suspicious"])
 
     # ------------------------------------------------------------------ #
-    def detect(self, model: UMLModel):
-        findings = []
-
-        for cls in model.classes.values():
-            # ---------- métricas brutas -------------------------------- #
-            w   = self.wmc.calc(cls)
-            a   = self.atfd.calc(cls)
-            t   = self.tcc.calc(cls)
-            fi  = self.fan.calc_in(cls)
-            fo  = self.fan.calc_out(cls)
-            lrc = self.lrc.calc(cls, model)
-
-            # ---------- normalización 0-1 ------------------------------ #
-            w_n   = self._norm(w,  "wmc")
-            a_n   = self._norm(a,  "atfd")
-            fi_n  = min(fi  / max(self.cfg.get("fanin_max",  1), 1), 1)
-            fo_n  = min(fo  / max(self.cfg.get("fanout_max", 1), 1), 1)
-            lrc_n = min(lrc / max(self.cfg.get("lrc_max",    1), 1), 1)
-            t_n   = 1 - t  # menor cohesión = peor
-
-            # ---------- puntuaciones parciales ------------------------- #
-            p_base = 0.4 * w_n + 0.3 * a_n + 0.3 * t_n
-            p_arq  = 0.4 * lrc_n + 0.3 * fo_n + 0.3 * fi_n
-
-            # Semántica aún no integrada: placeholder para el futuro
-            score = 0.5 * p_base + 0.3 * p_arq
+    def detect(self, model: UMLModel, table: MetricTable | None = None):
+        """
+        Clasifica todas las clases.  `table` permite reutilizar las
+        métricas ya calculadas por el MetricEngine en la misma corrida.
+        """
+        return list(self.iter_detect(model, table))
+
+    def iter_detect(self, model: UMLModel,
+                    table: MetricTable | None = None) -> Iterator[Dict[str, Any]]:
+        """
+        Generador de hallazgos (suspicious / god-class) en el orden de las
+        clases.  Las clases normales sólo se recorren si el logger está en
+        nivel DEBUG; si no, ni siquiera se visitan.
+        """
+        if table is None:
+            table = MetricEngine(self._calculators, self.workers).compute(model)
+        scores = self.score(table)
+
+        debug = log.isEnabledFor(logging.DEBUG)
+        rows = range(len(scores)) if debug else np.flatnonzero(scores >= self.thr_susp).tolist()
+        scores = scores.tolist()
+        for i in rows:
+            name, score = table.names[i], scores[i]
+            w, a, t = int(table.wmc[i]), int(table.atfd[i]), float(table.tcc[i])
+            fi, fo, lrc = int(table.fanin[i]), int(table.fanout[i]), int(table.lrc[i])
 
             # ---------- clasificación ---------------------------------- #
             if score >= self.thr_godclass:
@@ -64,38 +98,64 @@ class GodClassDetector:
             elif score >= self.thr_susp:
                 label = "suspicious"
             else:
-                # DEBUG ↓ (puedes desactivar esta línea si ya no la necesitas)
-                print(
-                    f"[DEBUG] {cls.name:20}  score={score:.2f}  "
-                    f"WMC={w}  ATFD={a}  TCC={t:.2f}  "
-                    f"FanIn={fi}  FanOut={fo}  LRC={lrc}"
-                )
+                log.debug("%-20s  score=%.2f  WMC=%s  ATFD=%s  TCC=%.2f  "
+                          "FanIn=%s  FanOut=%s  LRC=%s", name, score, w, a, t, fi, fo, lrc)
                 continue
 
             # ---------- reporte --------------------------------------- #
-            findings.append(
-                {
-                    "class": cls.name,
-                    "score": round(score, 2),
-                    "label": label,
-                    "metrics": {
-                        "WMC": w,
-                        "ATFD": a,
-                        "TCC": round(t, 2),
-                        "FanIn": fi,
-                        "FanOut": fo,
-                        "LRC": lrc,
-                    },
-                }
-            )
-        return findings
+            yield {
+                "class": name,
+                "score": round(score, 2),
+                "label": label,
+                "metrics": {
+                    "WMC": w,
+                    "ATFD": a,
+                    "TCC": round(t, 2),
+                    "FanIn": fi,
+                    "FanOut": fo,
+                    "LRC": lrc,
+                },
+            }
+
+    # ------------------------------------------------------------------ #
+    def classify(self, table: MetricTable) -> tuple[np.ndarray, np.ndarray]:
+        """(scores, etiquetas) de todas las clases; etiqueta = índice en LABELS."""
+        scores = self.score(table)
+        labels = np.where(scores >= self.thr_godclass, 2,
+                          np.where(scores >= self.thr_susp, 1, 0)).astype(np.int8)
+        return scores, labels
+
+    # ------------------------------------------------------------------ #
+    def score(self, table: MetricTable) -> np.ndarray:
+        """GodClassScore de todas las clases como expresión vectorial."""
+        # ---------- normalización 0-1 ---------------------------------- #
+        w_n   = self._norm(table.wmc,  "wmc")
+        a_n   = self._norm(table.atfd, "atfd")
+        fi_n  = np.minimum(table.fanin  / max(self.cfg.get("fanin_max",  1), 1), 1)
+        fo_n  = np.minimum(table.fanout / max(self.cfg.get("fanout_max", 1), 1), 1)
+        lrc_n = np.minimum(table.lrc    / max(self.cfg.get("lrc_max",    1), 1), 1)
+        t_n   = 1 - table.tcc  # menor cohesión = peor
+
+        # ---------- puntuaciones parciales ----------------------------- #
+        w = {k: self.cfg.get(k, v) for k, v in self.WEIGHTS.items()}
+        p_base = w["w_wmc"] * w_n + w["w_atfd"] * a_n + w["w_tcc"] * t_n
+        p_arq  = w["w_lrc"] * lrc_n + w["w_fanout"] * fo_n + w["w_fanin"] * fi_n
+
+        # Semántica aún no integrada: placeholder para el futuro
+        return w["w_base"] * p_base + w["w_arq"] * p_arq
 
     # ------------------------------------------------------------------ #
-    def _norm(self, x: float, key: str) -> float:
+    def _norm(self, x: np.ndarray, key: str) -> np.ndarray:
         """
         Normalización min-max.  Devuelve 0.0 cuando el denominador es 0.
         """
         rng = self.cfg.get(f"{key}_max", 1) - self.cfg.get(f"{key}_min", 0)
         if rng == 0:
-            return 0.0
+            return np.zeros(len(x), dtype=np.float64)
         return (x - self.cfg.get(f"{key}_min", 0)) / rng
+
+
+def run(cfg: Dict[str, Any], model: UMLModel, calculators: Dict[str, Any],
+        table: MetricTable | None = None):
+    """Punto de entrada del registro de detectores (generador de hallazgos)."""
+    return GodClassDetector(cfg, calculators).iter_detect(model, table)
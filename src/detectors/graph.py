@@ -0,0 +1,91 @@
+# src/detectors/graph.py
+from __future__ import annotations
+
+from typing import Dict, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+
+from src.domain.compact import CompactModel
+from src.domain.model import UMLModel
+from src.infrastructure.profiling import count
+
+
+class ClassGraph:
+    """
+    Grafo de dependencias indexado por id entero de clase.
+
+    Igual que el grafo networkx que construía HubLikeDependencyDetector,
+    sólo incluye las clases con al menos una arista; `nodes[k]` es el id
+    denso (CompactModel) del nodo local `k`.  La adyacencia es una matriz
+    SciPy CSR, así que las clases homónimas en paquetes distintos son
+    nodos distintos.
+    """
+
+    def __init__(self, cm: CompactModel) -> None:
+        self.model = cm
+        out_deg, in_deg = cm.out_degree(), cm.in_degree()
+        self.nodes = np.flatnonzero(out_deg + in_deg)
+        local = np.full(len(cm), -1, dtype=np.int64)
+        local[self.nodes] = np.arange(len(self.nodes))
+
+        src = local[np.repeat(np.arange(len(cm)), out_deg)]
+        dst = local[cm.out_idx]
+        n = len(self.nodes)
+        self.adjacency = sp.csr_matrix(
+            (np.ones(len(src)), (src, dst)), shape=(n, n), dtype=np.float64
+        )
+        self.out_degree = out_deg[self.nodes]
+        self.degree = self.out_degree + in_deg[self.nodes]
+
+    @classmethod
+    def from_model(cls, model: UMLModel | CompactModel) -> "ClassGraph":
+        cm = model if isinstance(model, CompactModel) else CompactModel.from_model(model)
+        return cls(cm)
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def ids(self) -> list:
+        s = self.model.strings
+        return [s[i] for i in self.model.class_id[self.nodes]]
+
+    def names(self) -> list:
+        s = self.model.strings
+        return [s[i] for i in self.model.class_name[self.nodes]]
+
+    # ------------------------------------------------------------------ #
+    def pagerank(self, alpha: float = 0.85, tol: float = 1.0e-6, max_iter: int = 100,
+                 nstart: np.ndarray | None = None) -> Tuple[np.ndarray, int]:
+        """
+        PageRank por iteración de potencias (misma formulación que
+        `nx.pagerank`: nodos colgantes repartidos uniformemente y
+        convergencia cuando ‖x − x'‖₁ < N·tol).  Devuelve (x, iteraciones).
+        """
+        n = len(self)
+        if n == 0:
+            return np.zeros(0), 0
+        inv = np.zeros(n)
+        nz = self.out_degree > 0
+        inv[nz] = 1.0 / self.out_degree[nz]
+        # x @ (D⁻¹·A)  ≡  (Aᵀ) @ (x·D⁻¹)
+        at = self.adjacency.T.tocsr()
+        dangling = ~nz
+        p = np.full(n, 1.0 / n)
+
+        if nstart is None or not nstart.sum():
+            x = p.copy()
+        else:
+            x = np.asarray(nstart, dtype=np.float64) / nstart.sum()
+
+        for it in range(1, max_iter + 1):
+            xlast = x
+            x = alpha * (at @ (x * inv) + x[dangling].sum() * p) + (1 - alpha) * p
+            if np.abs(x - xlast).sum() < n * tol:
+                count("pagerank.iterations", it)
+                return x, it
+        raise RuntimeError(f"PageRank no convergió en {max_iter} iteraciones")
+
+    def align(self, values: Dict[str, float]) -> np.ndarray:
+        """Vector por nodo a partir de un dict `xmi:id → valor` (faltantes = 0)."""
+        return np.array([values.get(cid, 0.0) for cid in self.ids()], dtype=np.float64)
@@ -1,20 +1,104 @@
-import networkx as nx
+from __future__ import annotations
+
+import heapq
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from src.detectors.graph import ClassGraph
 from src.domain.model import UMLModel
 
+# entradas compartidas que recibe `run` (ver application.pipeline)
+REQUIRES = ("graph", "pagerank")
+
 
 class HubLikeDependencyDetector:
-    """Detecta hubs mediante PageRank + umbral estadístico μ+σ."""
+    """
+    Detecta hubs mediante PageRank + umbral estadístico μ+σ.
+
+    `backend="sparse"` (por defecto) usa ClassGraph: nodos por id de
+    clase, PageRank por iteración de potencias sobre una matriz SciPy y
+    estadísticas de grado vectorizadas.  `backend="networkx"` conserva
+    la implementación original (nodos por nombre) como referencia.
+    """
+
+    def __init__(self, backend: str = "sparse", alpha: float = 0.85,
+                 tol: float = 1.0e-6, max_iter: int = 100) -> None:
+        if backend not in ("sparse", "networkx"):
+            raise ValueError(f"backend desconocido: {backend}")
+        self.backend = backend
+        self.alpha = alpha
+        self.tol = tol
+        self.max_iter = max_iter
+
+    @classmethod
+    def from_config(cls, cfg: Dict[str, Any]) -> "HubLikeDependencyDetector":
+        """PageRank según `pagerank_alpha`, `pagerank_tol` y `pagerank_max_iter` del cfg."""
+        return cls(alpha=cfg.get("pagerank_alpha", 0.85),
+                   tol=cfg.get("pagerank_tol", 1.0e-6),
+                   max_iter=cfg.get("pagerank_max_iter", 100))
+
+    def pagerank(self, graph: ClassGraph) -> np.ndarray:
+        """Vector PageRank de `graph` con los parámetros del detector."""
+        return graph.pagerank(self.alpha, self.tol, self.max_iter)[0]
+
+    def detect(self, model: UMLModel, top_k: int = 10,
+               nstart: Dict[str, float] | None = None,
+               graph: ClassGraph | None = None, pagerank: np.ndarray | None = None):
+        return self.detect_ranked(model, top_k, nstart, graph, pagerank)[0]
+
+    def detect_ranked(self, model: UMLModel, top_k: int = 10,
+                      nstart: Dict[str, float] | None = None,
+                      graph: ClassGraph | None = None,
+                      pagerank: np.ndarray | None = None
+                      ) -> Tuple[List[str], Dict[str, float]]:
+        """
+        Igual que `detect`, pero devuelve además el vector PageRank para
+        poder persistirlo (por `xmi:id`; por nombre con networkx).
+        `nstart` (PageRank previo) arranca la iteración en caliente; los
+        nodos nuevos parten de 0.  `graph`/`pagerank` permiten reutilizar
+        los ya calculados por el pipeline (PageRank con los mismos
+        parámetros: ver `from_config`).
+        """
+        if self.backend == "networkx":
+            return self._detect_networkx(model, top_k, nstart)
+
+        g = graph if graph is not None else ClassGraph.from_model(model)
+        if not len(g):
+            return [], {}
+
+        if pagerank is not None and not nstart:
+            pr = pagerank
+        else:
+            x0 = g.align(nstart) if nstart else None
+            pr, _ = g.pagerank(self.alpha, self.tol, self.max_iter, x0)
+
+        deg = g.degree
+        threshold = deg.mean() + deg.std()
+        candidates = (deg > threshold).nonzero()[0].tolist()
+        top = heapq.nlargest(top_k, candidates, key=pr.__getitem__)
+
+        names = g.names()
+        return [names[k] for k in top], dict(zip(g.ids(), pr.tolist()))
+
+    # ------------------------------------------------------------------ #
+    def _detect_networkx(self, model: UMLModel, top_k: int,
+                         nstart: Dict[str, float] | None
+                         ) -> Tuple[List[str], Dict[str, float]]:
+        import networkx as nx
 
-    def detect(self, model: UMLModel, top_k: int = 10):
         g = nx.DiGraph()
         for cls in model.classes.values():
             for tgt in cls.outgoing:
                 g.add_edge(cls.name, model.classes[tgt].name)
 
         if not g:
-            return []
+            return [], {}
 
-        pr = nx.pagerank(g)
+        if nstart and not any(nstart.get(n, 0) for n in g):
+            nstart = None                       # nada reutilizable
+        pr = nx.pagerank(g, alpha=self.alpha, tol=self.tol,
+                         max_iter=self.max_iter, nstart=nstart)
         mean_deg = sum(dict(g.degree()).values()) / g.number_of_nodes()
         std_deg = (sum((d - mean_deg) ** 2 for d in dict(g.degree()).values())
                    / g.number_of_nodes()) ** 0.5
@@ -22,4 +106,11 @@ class HubLikeDependencyDetector:
 
         hubs = [n for n in pr if g.degree(n) > threshold]
         hubs.sort(key=lambda n: pr[n], reverse=True)
-        return hubs[:top_k]
+        return hubs[:top_k], pr
+
+
+def run(cfg: Dict[str, Any], model: UMLModel, calculators: Dict[str, Any],
+        graph: ClassGraph | None = None, pagerank: np.ndarray | None = None):
+    """Punto de entrada del registro de detectores."""
+    return HubLikeDependencyDetector.from_config(cfg).detect(model, graph=graph,
+                                                             pagerank=pagerank)
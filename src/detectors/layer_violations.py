@@ -0,0 +1,18 @@
+# src/detectors/layer_violations.py
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+from src.domain.compact import CompactModel
+from src.metrics.layers import LayerRules
+
+
+def run(cfg: Dict[str, Any], model, calculators: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Punto de entrada del registro de detectores: dependencias entre
+    paquetes que violan las capas permitidas (`LayerRules.violations`).
+    Usa las mismas reglas que el LRC (las de `cfg["layers"]`).
+    """
+    rules = getattr(calculators.get("lrc"), "rules", None) or LayerRules.from_config(cfg)
+    cm = model if isinstance(model, CompactModel) else CompactModel.from_model(model)
+    return rules.violations(cm)
@@ -0,0 +1,27 @@
+# src/detectors/packages.py
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+import numpy as np
+
+from src.domain.compact import CompactModel
+from src.metrics.engine import MetricTable
+from src.metrics.packages import PackageRollup
+
+# entradas compartidas que recibe `run` (ver application.pipeline)
+REQUIRES = ("table", "labels")
+
+
+def run(cfg: Dict[str, Any], model, calculators: Dict[str, Any],
+        table: MetricTable | None = None,
+        labels: np.ndarray | None = None) -> List[Dict[str, Any]]:
+    """Punto de entrada del registro de detectores (hotspots por paquete)."""
+    cm = model if isinstance(model, CompactModel) else CompactModel.from_model(model)
+    if table is None:
+        from src.metrics.engine import MetricEngine
+        table = MetricEngine(calculators).compute(cm)
+    if labels is None:
+        from src.detectors.god_class import GodClassDetector
+        labels = GodClassDetector(cfg, calculators).classify(table)[1]
+    return PackageRollup(cfg.get("package_top_k", 20)).hotspots(cm, table, labels)
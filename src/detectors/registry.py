@@ -0,0 +1,24 @@
+# src/detectors/registry.py
+"""
+Detectores disponibles.  Cada entrada apunta a una función
+`run(cfg, model, calculators)` que devuelve la sección del informe;
+las entradas compartidas que declare su módulo en `REQUIRES` (p. ej.
+"table" con las métricas por clase, "graph", "pagerank") llegan como
+argumentos con nombre (ver `src.application.pipeline`).
+"""
+from src.infrastructure.registry import LazyRegistry
+
+DETECTORS = LazyRegistry("detector", {
+    "god_class": "src.detectors.god_class:run",
+    "hub_like": "src.detectors.hub_like:run",
+    "cycles": "src.detectors.cycles:run",
+    "bottleneck": "src.detectors.betweenness:run",
+    "layer_violations": "src.detectors.layer_violations:run",
+    "packages": "src.detectors.packages:run",
+})
+
+# informe por defecto: el de siempre.  Los demás son opcionales
+# (`--detectors god_class,hub_like,bottleneck`…): agregan secciones nuevas
+# al report.json y, como la betweenness muestreada, pueden costar más
+# que todo el resto del pipeline.
+DEFAULT_DETECTORS = ("god_class", "hub_like")
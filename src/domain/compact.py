@@ -0,0 +1,334 @@
+# src/domain/compact.py
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Dict, Iterator, List, Set
+
+import numpy as np
+
+from src.domain.model import UMLModel, UMLClass, UMLAttribute, UMLOperation
+
+# hash polinomial de 64 bits (aritmética módulo 2**64: los desbordes de
+# uint64 son intencionales); P es impar, así que es invertible
+_P = np.uint64(0x100000001B3)
+_P_INV = np.uint64(pow(0x100000001B3, -1, 2 ** 64))
+
+
+def _mix(x: np.ndarray) -> np.ndarray:
+    """Finalizador splitmix64 (vectorial)."""
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def _segment_sum(values: np.ndarray, ptr: np.ndarray) -> np.ndarray:
+    """Suma (mod 2**64) de `values` por segmento CSR `ptr`."""
+    cs = np.zeros(len(values) + 1, dtype=np.uint64)
+    np.cumsum(values, out=cs[1:])
+    return cs[ptr[1:]] - cs[ptr[:-1]]
+
+
+def _ordered(values: np.ndarray, ptr: np.ndarray) -> np.ndarray:
+    """Hash por segmento que depende del orden de sus elementos."""
+    pos = np.arange(len(values), dtype=np.int64) - np.repeat(ptr[:-1], np.diff(ptr))
+    seg = _segment_sum(_mix(values + pos.astype(np.uint64) * _P), ptr)
+    return _mix(seg + np.diff(ptr).astype(np.uint64))
+
+
+class StringTable:
+    """
+    Cadenas internadas en un único blob UTF-8 + offsets (int64).
+    El índice -1 representa `None`.
+    """
+
+    def __init__(self, blob: np.ndarray, offsets: np.ndarray) -> None:
+        self.blob = blob
+        self.offsets = offsets
+        self._cache: Dict[int, str] = {}
+
+    @classmethod
+    def build(cls, strings: List[str]) -> "StringTable":
+        encoded = [s.encode("utf-8") for s in strings]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        if encoded:
+            np.cumsum([len(b) for b in encoded], out=offsets[1:])
+        blob = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+        return cls(blob, offsets)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def hashes(self) -> np.ndarray:
+        """
+        Hash de 64 bits del contenido de cada cadena, sin decodificarlas:
+        comparable entre StringTables distintas (p. ej. dos versiones de
+        un modelo, cuyos índices internados no coinciden).
+        """
+        n = len(self.blob)
+        term = self.blob.astype(np.uint64) + np.uint64(1)
+        if n:
+            pw = np.full(n, _P, dtype=np.uint64)
+            pw[0] = 1
+            term *= np.cumprod(pw)                       # b_k · P^k
+        lo, hi = self.offsets[:-1], self.offsets[1:]
+        inv = np.full(n + 1, _P_INV, dtype=np.uint64)
+        inv[0] = 1
+        inv = np.cumprod(inv)                            # P^-k
+        seg = _segment_sum(term, self.offsets) * inv[lo]  # normaliza al inicio
+        return _mix(seg + (hi - lo).astype(np.uint64))
+
+    def __getitem__(self, i: int) -> str | None:
+        i = int(i)
+        if i < 0:
+            return None
+        s = self._cache.get(i)
+        if s is None:
+            lo, hi = self.offsets[i], self.offsets[i + 1]
+            s = self.blob[lo:hi].tobytes().decode("utf-8")
+            self._cache[i] = s
+        return s
+
+
+class _Interner:
+    """Asigna ids densos a cadenas durante la construcción."""
+
+    def __init__(self) -> None:
+        self.index: Dict[str, int] = {}
+        self.strings: List[str] = []
+
+    def __call__(self, s: str | None) -> int:
+        if s is None:
+            return -1
+        i = self.index.get(s)
+        if i is None:
+            i = self.index[s] = len(self.strings)
+            self.strings.append(s)
+        return i
+
+
+def _ptr(lists: List[list]) -> np.ndarray:
+    ptr = np.zeros(len(lists) + 1, dtype=np.int64)
+    if lists:
+        np.cumsum([len(x) for x in lists], out=ptr[1:])
+    return ptr
+
+
+def _csr(lists: List[List[int]]) -> tuple[np.ndarray, np.ndarray]:
+    ptr = _ptr(lists)
+    idx = np.fromiter((v for x in lists for v in x), dtype=np.int64, count=int(ptr[-1]))
+    return ptr, idx
+
+
+class CompactModel:
+    """
+    Backend columnar de UMLModel.
+      • Cada clase recibe un id entero denso (orden de inserción).
+      • Dependencias en CSR: `out_ptr/out_idx` y `in_ptr/in_idx`.
+      • Nombres (ids, clases, paquetes, atributos, operaciones, tipos)
+        internados en una sola StringTable; las columnas guardan índices.
+    `classes` expone vistas compatibles con UMLClass para que métricas
+    y detectores funcionen sin cambios.
+    """
+
+    COLUMNS = (
+        "class_id", "class_name", "class_pkg",
+        "attr_ptr", "attr_name", "attr_type",
+        "op_ptr", "op_name", "param_ptr", "param_type",
+        "out_ptr", "out_idx", "in_ptr", "in_idx",
+    )
+
+    def __init__(self, strings: StringTable, arrays: Dict[str, np.ndarray]) -> None:
+        self.strings = strings
+        self.class_id = arrays["class_id"]
+        self.class_name = arrays["class_name"]
+        self.class_pkg = arrays["class_pkg"]
+        self.attr_ptr = arrays["attr_ptr"]
+        self.attr_name = arrays["attr_name"]
+        self.attr_type = arrays["attr_type"]
+        self.op_ptr = arrays["op_ptr"]
+        self.op_name = arrays["op_name"]
+        self.param_ptr = arrays["param_ptr"]
+        self.param_type = arrays["param_type"]
+        self.out_ptr = arrays["out_ptr"]
+        self.out_idx = arrays["out_idx"]
+        self.in_ptr = arrays["in_ptr"]
+        self.in_idx = arrays["in_idx"]
+        self.index: Dict[str | None, int] = {
+            strings[s]: i for i, s in enumerate(self.class_id)
+        }
+        self.classes = _ClassMapping(self)
+
+    # ---------- construcción ------------------------------------------ #
+    @classmethod
+    def from_model(cls, model: UMLModel) -> "CompactModel":
+        intern = _Interner()
+        index = {cid: i for i, cid in enumerate(model.classes)}
+        ucls = list(model.classes.values())
+
+        attrs = [[(intern(a.name), intern(a.type_)) for a in c.attributes] for c in ucls]
+        ops = [[(intern(o.name), [intern(t) for t in o.parameter_types])
+                for o in c.operations] for c in ucls]
+
+        attr_ptr = _ptr(attrs)
+        op_ptr = _ptr(ops)
+        flat_ops = [o for per in ops for o in per]
+        param_ptr, param_type = _csr([p for _, p in flat_ops])
+        out_ptr, out_idx = _csr([sorted(index[t] for t in c.outgoing) for c in ucls])
+        in_ptr, in_idx = _csr([sorted(index[s] for s in c.incoming) for c in ucls])
+
+        arrays = dict(
+            class_id=np.array([intern(cid) for cid in model.classes], dtype=np.int64),
+            class_name=np.array([intern(c.name) for c in ucls], dtype=np.int64),
+            class_pkg=np.array([intern(c.package) for c in ucls], dtype=np.int64),
+            attr_ptr=attr_ptr,
+            attr_name=np.array([n for per in attrs for n, _ in per], dtype=np.int64),
+            attr_type=np.array([t for per in attrs for _, t in per], dtype=np.int64),
+            op_ptr=op_ptr,
+            op_name=np.array([n for n, _ in flat_ops], dtype=np.int64),
+            param_ptr=param_ptr,
+            param_type=param_type,
+            out_ptr=out_ptr, out_idx=out_idx,
+            in_ptr=in_ptr, in_idx=in_idx,
+        )
+        return cls(StringTable.build(intern.strings), arrays)
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray]) -> "CompactModel":
+        """Inverso de `arrays()` (p. ej. tras `np.load`)."""
+        strings = StringTable(arrays["str_blob"], arrays["str_offsets"])
+        return cls(strings, {k: arrays[k] for k in cls.COLUMNS})
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        """Todas las columnas (incluida la StringTable) como arrays planos."""
+        cols = {k: getattr(self, k) for k in self.COLUMNS}
+        cols.update(str_blob=self.strings.blob, str_offsets=self.strings.offsets)
+        return cols
+
+    def to_model(self) -> UMLModel:
+        model = UMLModel()
+        for view in self.classes.values():
+            model.classes[view.id_] = UMLClass(
+                id_=view.id_, name=view.name,
+                attributes=view.attributes, operations=view.operations,
+                outgoing=view.outgoing, incoming=view.incoming,
+                package=view.package,
+            )
+        return model
+
+    # ---------- consultas vectoriales --------------------------------- #
+    def __len__(self) -> int:
+        return len(self.class_id)
+
+    def out_degree(self) -> np.ndarray:
+        return np.diff(self.out_ptr)
+
+    def in_degree(self) -> np.ndarray:
+        return np.diff(self.in_ptr)
+
+    def op_count(self) -> np.ndarray:
+        return np.diff(self.op_ptr)
+
+    def class_hashes(self) -> np.ndarray:
+        """
+        Firma de 64 bits por clase (nombre, paquete, atributos y
+        operaciones en orden, y conjuntos de dependencias por `xmi:id`),
+        calculada sobre las columnas sin materializar vistas.  Dos clases
+        con la misma firma son iguales salvo colisión (~2**-64).
+        """
+        sh = np.append(self.strings.hashes(), np.uint64(0x9E3779B97F4A7C15))
+
+        def h(col: np.ndarray) -> np.ndarray:            # índice -1 (None) → constante
+            return sh[col]
+
+        ids = h(self.class_id)
+        attrs = _ordered(_mix(h(self.attr_name)) ^ h(self.attr_type), self.attr_ptr)
+        params = _ordered(h(self.param_type), self.param_ptr)
+        ops = _ordered(_mix(h(self.op_name)) ^ params, self.op_ptr)
+        # los conjuntos no dependen del orden (ni de los índices internos)
+        out = _mix(_segment_sum(_mix(ids[self.out_idx]), self.out_ptr))
+        inc = _mix(_segment_sum(_mix(ids[self.in_idx] ^ _P), self.in_ptr))
+        sig = h(self.class_name)
+        for part in (h(self.class_pkg), attrs, ops, out, inc):
+            sig = _mix(sig * _P + part)
+        return sig
+
+    def successors(self, i: int) -> np.ndarray:
+        return self.out_idx[self.out_ptr[i]:self.out_ptr[i + 1]]
+
+    def predecessors(self, i: int) -> np.ndarray:
+        return self.in_idx[self.in_ptr[i]:self.in_ptr[i + 1]]
+
+
+class ClassView:
+    """Vista perezosa con la misma interfaz de lectura que UMLClass."""
+
+    __slots__ = ("_m", "_i")
+
+    def __init__(self, model: CompactModel, i: int) -> None:
+        self._m = model
+        self._i = i
+
+    @property
+    def index(self) -> int:
+        return self._i
+
+    @property
+    def id_(self) -> str | None:
+        return self._m.strings[self._m.class_id[self._i]]
+
+    @property
+    def name(self) -> str | None:
+        return self._m.strings[self._m.class_name[self._i]]
+
+    @property
+    def package(self) -> str | None:
+        return self._m.strings[self._m.class_pkg[self._i]]
+
+    @property
+    def attributes(self) -> List[UMLAttribute]:
+        m, s = self._m, self._m.strings
+        lo, hi = m.attr_ptr[self._i], m.attr_ptr[self._i + 1]
+        return [UMLAttribute(s[n], s[t])
+                for n, t in zip(m.attr_name[lo:hi], m.attr_type[lo:hi])]
+
+    @property
+    def operations(self) -> List[UMLOperation]:
+        m, s = self._m, self._m.strings
+        ops = []
+        for k in range(m.op_ptr[self._i], m.op_ptr[self._i + 1]):
+            params = m.param_type[m.param_ptr[k]:m.param_ptr[k + 1]]
+            ops.append(UMLOperation(s[m.op_name[k]], [s[t] for t in params]))
+        return ops
+
+    @property
+    def outgoing(self) -> Set[str]:
+        m = self._m
+        return {m.strings[m.class_id[j]] for j in m.successors(self._i)}
+
+    @property
+    def incoming(self) -> Set[str]:
+        m = self._m
+        return {m.strings[m.class_id[j]] for j in m.predecessors(self._i)}
+
+    def __repr__(self) -> str:
+        return f"ClassView(id_={self.id_!r}, name={self.name!r})"
+
+
+class _ClassMapping(Mapping):
+    """`xmi:id → ClassView`, en el mismo orden que UMLModel.classes."""
+
+    def __init__(self, model: CompactModel) -> None:
+        self._m = model
+
+    def __getitem__(self, key: str) -> ClassView:
+        return ClassView(self._m, self._m.index[key])
+
+    def __iter__(self) -> Iterator[str | None]:
+        s = self._m.strings
+        return (s[i] for i in self._m.class_id)
+
+    def __len__(self) -> int:
+        return len(self._m)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._m.index
@@ -0,0 +1,106 @@
+# src/infrastructure/cache.py
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+import zipfile
+from pathlib import Path
+from typing import Tuple
+
+import numpy as np
+
+from src.domain.compact import CompactModel
+from src.infrastructure.project import project_files
+from src.infrastructure.xmi_parser import XMIParser
+from src.metrics.engine import MetricEngine, MetricTable
+
+
+class ModelCache:
+    """
+    Caché en disco de modelos parseados + métricas por clase.
+
+    La clave es el SHA-256 del contenido del XMI más las versiones del
+    parser y del MetricEngine, así que un cambio de config/umbrales no la
+    invalida pero un cambio de código sí.  Cada entrada es un `.npz` sin
+    comprimir con las columnas del CompactModel y del MetricTable.
+    Al superar `max_bytes` se expulsan las entradas menos usadas (mtime),
+    nunca la recién escrita: una entrada que por sí sola excede el límite
+    queda como única entrada en vez de perderse en el acto.
+    """
+
+    SUFFIX = ".npz"
+
+    def __init__(self, cache_dir: Path | str, max_bytes: int = 512 * 1024 ** 2) -> None:
+        self.dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+
+    # ------------------------------------------------------------------ #
+    @staticmethod
+    def key(xmi: Path | str, tag: str = "") -> str:
+        """
+        `tag` distingue métricas que dependen de la config (p. ej. reglas
+        de capas).  Un directorio (proyecto) se identifica por la ruta
+        relativa y el contenido de cada fragmento.
+        """
+        h = hashlib.sha256()
+        root = Path(xmi)
+        files = project_files(root) if root.is_dir() else [root]
+        for f in files:
+            if f is not root:
+                h.update(f.relative_to(root).as_posix().encode("utf-8") + b"\0")
+            with open(f, "rb") as fh:
+                for chunk in iter(lambda: fh.read(1 << 20), b""):
+                    h.update(chunk)
+        key = f"{h.hexdigest()}-p{XMIParser.VERSION}-m{MetricEngine.VERSION}"
+        return f"{key}-{tag}" if tag else key
+
+    def _path(self, key: str) -> Path:
+        return self.dir / f"{key}{self.SUFFIX}"
+
+    # ------------------------------------------------------------------ #
+    def load(self, key: str) -> Tuple[CompactModel, MetricTable] | None:
+        path = self._path(key)
+        try:
+            with np.load(path, allow_pickle=False) as npz:
+                arrays = {k: npz[k] for k in npz.files}
+        except (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile):
+            return None                       # ausente o corrupta: fallo de caché
+        os.utime(path)                        # marca de uso para el LRU
+        cm = CompactModel.from_arrays(arrays)
+        table = MetricTable.from_arrays(
+            cm, {k[2:]: v for k, v in arrays.items() if k.startswith("m_")}
+        )
+        return cm, table
+
+    def store(self, key: str, cm: CompactModel, table: MetricTable) -> Path:
+        self.dir.mkdir(parents=True, exist_ok=True)
+        arrays = cm.arrays()
+        arrays.update({f"m_{k}": v for k, v in table.arrays().items()})
+
+        fd, tmp = tempfile.mkstemp(dir=self.dir, suffix=".tmp")
+        with os.fdopen(fd, "wb") as fh:
+            np.savez(fh, **arrays)
+        path = self._path(key)
+        os.replace(tmp, path)                 # escritura atómica
+        self._evict(keep=path)
+        return path
+
+    # ------------------------------------------------------------------ #
+    def _evict(self, keep: Path | None = None) -> None:
+        entries = []
+        for p in self.dir.glob(f"*{self.SUFFIX}"):
+            try:                              # otro proceso pudo borrarla
+                st = p.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, p))
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            path.unlink(missing_ok=True)
+            total -= size
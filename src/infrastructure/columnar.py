@@ -0,0 +1,182 @@
+# src/infrastructure/columnar.py
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+
+from src.metrics.engine import METRICS, MetricTable
+
+# pyarrow es opcional: sólo se importa al escribir/leer .arrow / .parquet
+
+LABELS = ("normal", "suspicious", "god-class")       # = GodClassDetector.LABELS
+STRINGS = ("id", "class", "package")
+COLUMNS = STRINGS + METRICS + ("score", "label", "pagerank")
+
+ARROW_SUFFIXES = (".arrow", ".feather", ".ipc")
+PARQUET_SUFFIXES = (".parquet",)
+NPY_SUFFIX = ".cols"            # directorio con un .npy por columna (sin pyarrow)
+
+
+def is_columnar(path: Path | str) -> bool:
+    return Path(path).suffix.lower() in ARROW_SUFFIXES + PARQUET_SUFFIXES + (NPY_SUFFIX,)
+
+
+def class_columns(table: MetricTable, scores: np.ndarray, labels: np.ndarray,
+                  pagerank: Dict[str, float]) -> Dict[str, np.ndarray]:
+    """
+    Una fila por clase (clave: xmi:id): métricas, score/etiqueta GodClass
+    y PageRank (0 para las clases sin dependencias, como en el daemon).
+    """
+    return {
+        "id": np.array(table.ids, dtype=str),
+        "class": np.array(table.names, dtype=str),
+        "package": np.array([p or "" for p in table.packages], dtype=str),
+        **{m: np.asarray(getattr(table, m)) for m in METRICS},
+        "score": np.asarray(scores, dtype=np.float64),
+        "label": np.asarray(labels, dtype=np.int8),
+        "pagerank": np.array([pagerank.get(cid, 0.0) for cid in table.ids], dtype=np.float64),
+    }
+
+
+# --------------------------------------------------------------------------- #
+def write_columns(columns: Dict[str, np.ndarray], path: Path | str) -> Path:
+    """
+    Escribe las columnas según la extensión:
+      • .arrow/.feather/.ipc → Arrow IPC (archivo, sin compresión: mmap)
+      • .parquet             → Parquet
+      • .cols                → directorio con un .npy por columna
+    "package" vacío se guarda como null en Arrow/Parquet y "label" como
+    diccionario (normal / suspicious / god-class).
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix == NPY_SUFFIX:
+        path.mkdir(parents=True, exist_ok=True)
+        for name in COLUMNS:
+            np.save(path / f"{name}.npy", columns[name], allow_pickle=False)
+        return path
+    if suffix not in ARROW_SUFFIXES + PARQUET_SUFFIXES:
+        raise ValueError(f"formato columnar desconocido: {path.name} "
+                         f"(usa {', '.join(ARROW_SUFFIXES + PARQUET_SUFFIXES + (NPY_SUFFIX,))})")
+
+    pa = _pyarrow()
+    table = _to_arrow(pa, columns)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if suffix in PARQUET_SUFFIXES:
+        import pyarrow.parquet as pq
+        pq.write_table(table, str(path))
+    else:
+        with pa.OSFile(str(path), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    return path
+
+
+def read_columns(path: Path | str) -> Dict[str, np.ndarray]:
+    """
+    Lee un export sin parsear JSON.  Arrow IPC y .cols se mapean en
+    memoria: las columnas numéricas son vistas de sólo lectura sobre el
+    archivo (cero copias); Parquet se decodifica.
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix == NPY_SUFFIX:
+        return {name: np.load(path / f"{name}.npy", mmap_mode="r", allow_pickle=False)
+                for name in COLUMNS}
+
+    pa = _pyarrow()
+    if suffix in PARQUET_SUFFIXES:
+        import pyarrow.parquet as pq
+        table = pq.read_table(str(path), memory_map=True)
+    elif suffix in ARROW_SUFFIXES:
+        table = pa.ipc.open_file(pa.memory_map(str(path), "r")).read_all()
+    else:
+        raise ValueError(f"formato columnar desconocido: {path.name}")
+    return _from_arrow(table)
+
+
+def to_metric_table(columns: Dict[str, np.ndarray]) -> MetricTable:
+    """MetricTable para el Calibrator / el barrido sin re-parsear el XMI."""
+    return MetricTable(
+        ids=columns["id"].tolist(),
+        names=columns["class"].tolist(),
+        packages=[p or None for p in columns["package"].tolist()],
+        **{m: columns[m] for m in METRICS},
+    )
+
+
+def diff(old: Dict[str, np.ndarray], new: Dict[str, np.ndarray]) -> Dict[str, Any]:
+    """
+    Hallazgos GodClass nuevos / resueltos / cambiados entre dos exports
+    (mismo formato que el delta incremental), emparejando por xmi:id.
+    """
+    prev = {cid: j for j, cid in enumerate(old["id"].tolist())}
+    cur = {cid: i for i, cid in enumerate(new["id"].tolist())}
+
+    def entry(cols: Dict[str, np.ndarray], i: int) -> Dict[str, Any]:
+        return {"id": str(cols["id"][i]), "class": str(cols["class"][i]),
+                "label": LABELS[int(cols["label"][i])], "score": round(float(cols["score"][i]), 2)}
+
+    new_f: List[Dict[str, Any]] = []
+    changed: List[Dict[str, Any]] = []
+    for i in np.flatnonzero(new["label"]).tolist():
+        j = prev.get(str(new["id"][i]))
+        if j is None or not old["label"][j]:
+            new_f.append(entry(new, i))
+        elif (old["label"][j] != new["label"][i]
+              or round(float(old["score"][j]), 2) != round(float(new["score"][i]), 2)):
+            e = entry(new, i)
+            e.update(previous_label=LABELS[int(old["label"][j])],
+                     previous_score=round(float(old["score"][j]), 2))
+            changed.append(e)
+
+    resolved = []
+    for j in np.flatnonzero(old["label"]).tolist():
+        i = cur.get(str(old["id"][j]))
+        if i is None or not new["label"][i]:
+            e = entry(old, j)
+            e["removed"] = i is None
+            resolved.append(e)
+    return {"god_class": {"new": new_f, "resolved": resolved, "changed": changed}}
+
+
+# --------------------------------------------------------------------------- #
+def _pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.ipc  # noqa: F401
+    except ImportError:
+        raise ImportError("exportar a Arrow/Parquet requiere pyarrow "
+                          f"(pip install pyarrow) o usa un directorio {NPY_SUFFIX}") from None
+    return pa
+
+
+def _to_arrow(pa, columns: Dict[str, np.ndarray]):
+    arrays = {
+        "id": pa.array(columns["id"].tolist(), pa.string()),
+        "class": pa.array(columns["class"].tolist(), pa.string()),
+        "package": pa.array([p or None for p in columns["package"].tolist()], pa.string()),
+        **{m: pa.array(columns[m]) for m in METRICS + ("score",)},
+        "label": pa.DictionaryArray.from_arrays(
+            pa.array(columns["label"], pa.int8()), pa.array(LABELS, pa.string())),
+        "pagerank": pa.array(columns["pagerank"]),
+    }
+    return pa.table(arrays)
+
+
+def _from_arrow(table) -> Dict[str, np.ndarray]:
+    out: Dict[str, np.ndarray] = {}
+    for name in COLUMNS:
+        col = table.column(name)
+        chunk = col.chunk(0) if col.num_chunks == 1 else col.combine_chunks()
+        if name in STRINGS:
+            out[name] = np.array([v or "" for v in chunk.to_pylist()], dtype=str)
+        elif name == "label":
+            # los índices se remapean por si el diccionario leído cambió de orden
+            codes = np.array([LABELS.index(v) for v in chunk.dictionary.to_pylist()],
+                             dtype=np.int8)
+            out[name] = codes[chunk.indices.to_numpy(zero_copy_only=False)]
+        else:
+            out[name] = chunk.to_numpy(zero_copy_only=False)   # sin nulos: vista
+    return out
@@ -0,0 +1,114 @@
+# src/infrastructure/pdf_text.py
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterator, List
+
+
+def _reader(pdf_path: str):
+    from PyPDF2 import PdfReader            # import perezoso
+    return PdfReader(pdf_path)
+
+
+def _extract_pages(pdf_path: str, start: int, stop: int) -> List[str]:
+    """Worker: abre su propio PdfReader (no es seguro compartirlo) una vez por ventana."""
+    reader = _reader(pdf_path)
+    return [reader.pages[i].extract_text() or "" for i in range(start, stop)]
+
+
+class PDFTextExtractor:
+    """
+    Extracción perezosa del texto de un PDF.
+
+      • `pages()` es un generador: sólo se procesan las páginas que se
+        consumen.
+      • `extract(max_chars)` se detiene en cuanto el texto acumulado
+        alcanza el presupuesto de caracteres.
+      • Con `workers > 1` las páginas se reparten en una ventana contigua
+        por worker de un pool de procesos, cada una con un único
+        PdfReader (el orden se conserva).  Conviene para PDFs largos sin
+        presupuesto: las ventanas corren a la vez, así que el corte
+        temprano sólo cancela las que aún no empezaron.
+      • El resultado se cachea en disco por SHA-256 del PDF.
+    """
+
+    def __init__(self, cache_dir: str | os.PathLike | None = ".perse_cache/pdf",
+                 workers: int = 1) -> None:
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.workers = max(1, workers)
+
+    # ------------------------------------------------------------------ #
+    def pages(self, pdf_path: str | os.PathLike) -> Iterator[str]:
+        path = str(pdf_path)
+        if self.workers == 1:
+            reader = _reader(path)
+            for page in reader.pages:
+                yield page.extract_text() or ""
+            return
+
+        n = len(_reader(path).pages)
+        size = -(-n // self.workers)
+        pool = ProcessPoolExecutor(max_workers=self.workers)
+        try:
+            futures = [pool.submit(_extract_pages, path, start, min(start + size, n))
+                       for start in range(0, n, size)]
+            for fut in futures:
+                yield from fut.result()
+        finally:
+            pool.shutdown(cancel_futures=True)
+
+    def extract(self, pdf_path: str | os.PathLike, max_chars: int | None = None) -> str:
+        """
+        Texto de las páginas unidas por "\\n", truncado a `max_chars`
+        (idéntico a extraer todo y recortar después).
+        """
+        key = self._key(pdf_path)
+        cached = self._cache_get(key, max_chars)
+        if cached is not None:
+            return cached
+
+        parts: List[str] = []
+        size, complete = 0, True
+        for text in self.pages(pdf_path):
+            size += len(text) + (1 if parts else 0)
+            parts.append(text)
+            if max_chars is not None and size >= max_chars:
+                complete = False
+                break
+        text = "\n".join(parts)
+        self._cache_put(key, text, max_chars, complete)
+        return text if max_chars is None else text[:max_chars]
+
+    # ---------- caché --------------------------------------------------- #
+    @staticmethod
+    def _key(pdf_path: str | os.PathLike) -> str:
+        h = hashlib.sha256()
+        with open(pdf_path, "rb") as fh:
+            for chunk in iter(lambda: fh.read(1 << 20), b""):
+                h.update(chunk)
+        return h.hexdigest()
+
+    def _cache_get(self, key: str, max_chars: int | None) -> str | None:
+        if not self.cache_dir:
+            return None
+        try:
+            entry = json.loads((self.cache_dir / f"{key}.json").read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        text = entry["text"]
+        if entry["complete"]:
+            return text if max_chars is None else text[:max_chars]
+        if max_chars is not None and len(text) >= max_chars:
+            return text[:max_chars]
+        return None                           # la caché es más corta de lo pedido
+
+    def _cache_put(self, key: str, text: str, max_chars: int | None, complete: bool) -> None:
+        if not self.cache_dir:
+            return
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        entry = {"complete": complete, "max_chars": max_chars, "text": text}
+        (self.cache_dir / f"{key}.json").write_text(json.dumps(entry), encoding="utf-8")
@@ -0,0 +1,156 @@
+# src/infrastructure/profiling.py
+from __future__ import annotations
+
+import json
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, TypeVar
+
+T = TypeVar("T")
+
+_ACTIVE: "Profiler | None" = None
+
+
+class Profiler:
+    """
+    Spans anidados (tiempo de pared, CPU y pico de memoria vía
+    tracemalloc) + contadores de trabajo en bucles calientes.
+
+        prof = Profiler()
+        with prof.activate():
+            with span("parse"):
+                ...
+            count("tcc.pairs", n)
+        prof.write("report.profile.json")
+
+    Fuera de `activate()` las funciones `span`/`count` no hacen nada.
+    La pila de spans es por hilo (etapas concurrentes del pipeline); el
+    pico de memoria de tracemalloc es global, así que con varios hilos
+    es aproximado.
+
+    `timed(name, items)` mide un generador consumido por otro (p. ej. un
+    detector leído por el escritor en streaming): sólo acumula el tiempo
+    de cada `next()`, no el del consumidor.  Cada span informa además
+    `self_s`, su tiempo de pared sin el de sus hijos directos.
+    """
+
+    def __init__(self, memory: bool = True) -> None:
+        self.memory = memory
+        self.spans: List[Dict[str, Any]] = []
+        self.counters: Dict[str, float] = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    @property
+    def _stack(self) -> List[Dict[str, Any]]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    @contextmanager
+    def activate(self) -> Iterator["Profiler"]:
+        global _ACTIVE
+        prev, _ACTIVE = _ACTIVE, self
+        started = self.memory and not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        try:
+            with self.span("total"):
+                yield self
+        finally:
+            if started:
+                tracemalloc.stop()
+            _ACTIVE = prev
+
+    def _open(self, name: str) -> Dict[str, Any]:
+        stack = self._stack
+        rec: Dict[str, Any] = {"name": name, "depth": len(stack), "peak_bytes": 0,
+                               "wall_s": 0.0, "cpu_s": 0.0,
+                               "parent": stack[-1] if stack else None}
+        self.spans.append(rec)
+        return rec
+
+    @contextmanager
+    def _run(self, rec: Dict[str, Any]) -> Iterator[None]:
+        """Acumula en `rec` el tiempo/memoria del bloque (con `rec` en la pila)."""
+        if self.memory and self._stack:
+            # el pico global se reinicia por span: se conserva en el padre
+            parent = self._stack[-1]
+            parent["peak_bytes"] = max(parent["peak_bytes"], tracemalloc.get_traced_memory()[1])
+        if self.memory:
+            tracemalloc.reset_peak()
+        self._stack.append(rec)
+        t0, c0 = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            rec["wall_s"] += time.perf_counter() - t0
+            rec["cpu_s"] += time.process_time() - c0
+            self._stack.pop()
+            if self.memory:
+                rec["peak_bytes"] = max(rec["peak_bytes"], tracemalloc.get_traced_memory()[1])
+                if self._stack:
+                    parent = self._stack[-1]
+                    parent["peak_bytes"] = max(parent["peak_bytes"], rec["peak_bytes"])
+                tracemalloc.reset_peak()
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        with self._run(self._open(name)):
+            yield
+
+    def timed(self, name: str, items: Iterable[T]) -> Iterator[T]:
+        rec = self._open(name)                # (al primer next(): es un generador)
+        it = iter(items)
+        while True:
+            with self._run(rec):
+                try:
+                    item = next(it)
+                except StopIteration:
+                    return
+            yield item
+
+    def count(self, name: str, n: float = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    # ------------------------------------------------------------------ #
+    def to_dict(self) -> Dict[str, Any]:
+        children: Dict[int, float] = {}
+        for rec in self.spans:
+            if rec["parent"] is not None:
+                key = id(rec["parent"])
+                children[key] = children.get(key, 0.0) + rec["wall_s"]
+        spans = []
+        for rec in self.spans:
+            out = {"name": rec["name"], "depth": rec["depth"],
+                   "wall_s": round(rec["wall_s"], 6),
+                   "self_s": round(max(rec["wall_s"] - children.get(id(rec), 0.0), 0.0), 6),
+                   "cpu_s": round(rec["cpu_s"], 6)}
+            if self.memory:
+                out["peak_mb"] = round(rec["peak_bytes"] / 2 ** 20, 3)
+            spans.append(out)
+        return {"spans": spans, "counters": self.counters}
+
+    def write(self, path: Path | str) -> None:
+        Path(path).write_text(json.dumps(self.to_dict(), indent=2), encoding="utf-8")
+
+
+def span(name: str):
+    """Span en el profiler activo (no-op si no hay ninguno)."""
+    return _ACTIVE.span(name) if _ACTIVE is not None else nullcontext()
+
+
+def timed(name: str, items: Iterable[T]) -> Iterable[T]:
+    """`items` midiendo sólo el tiempo de producirlos (sin profiler: tal cual)."""
+    return _ACTIVE.timed(name, items) if _ACTIVE is not None else items
+
+
+def count(name: str, n: float = 1) -> None:
+    """Suma `n` al contador `name` del profiler activo (no-op si no hay)."""
+    if _ACTIVE is not None:
+        _ACTIVE.count(name, n)
@@ -0,0 +1,93 @@
+# src/infrastructure/project.py
+from __future__ import annotations
+
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from src.domain.model import UMLModel
+from src.infrastructure.xmi_parser import Edge, XMIParser, _ref
+
+log = logging.getLogger(__name__)
+
+PATTERN = "*.xmi"
+
+
+def project_files(root: Path | str) -> List[Path]:
+    """Fragmentos XMI del proyecto (recursivo, orden estable)."""
+    root = Path(root)
+    return sorted(p for p in root.rglob(PATTERN) if p.is_file())
+
+
+def _parse_file(path: str, streaming: bool) -> Tuple[UMLModel, List[Edge]]:
+    return XMIParser().parse_fragment(path, streaming)
+
+
+class ProjectParser:
+    """
+    Modelo exportado como varios XMI que se referencian entre sí
+    (`href="otro.xmi#id"`).
+
+    1. Cada fragmento se parsea por separado (en un pool de `workers`
+       procesos): clases + referencias sin resolver.
+    2. Índice global xmi:id → clase (el primer fragmento, en orden de
+       ruta, gana si un id se repite).
+    3. Enlace final: todas las referencias se resuelven contra el índice,
+       así que las aristas entre archivos ya no se descartan.
+
+    Con un único fragmento el resultado es idéntico a `XMIParser.parse`.
+    """
+
+    def __init__(self, workers: int = 1, streaming: bool = False) -> None:
+        self.workers = max(1, workers)
+        self.streaming = streaming
+        self.stats: Dict[str, Any] = {}
+
+    def parse(self, root: Path | str) -> UMLModel:
+        files = project_files(root)
+        if not files:
+            raise FileNotFoundError(f"no hay archivos {PATTERN} en {Path(root).resolve()}")
+
+        if self.workers == 1 or len(files) == 1:
+            fragments = [_parse_file(str(f), self.streaming) for f in files]
+        else:
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(files))) as pool:
+                fragments = list(pool.map(_parse_file, map(str, files),
+                                          [self.streaming] * len(files)))
+
+        # ---------- índice global de ids -------------------------------- #
+        model = UMLModel()
+        origin: Dict[str, int] = {}
+        duplicates = 0
+        for k, (fragment, _) in enumerate(fragments):
+            for cid, cls in fragment.classes.items():
+                if cid in model.classes:
+                    duplicates += 1
+                    continue
+                model.classes[cid] = cls
+                origin[cid] = k
+        if duplicates:
+            log.warning("%d xmi:id repetidos entre fragmentos (se conserva el primero)",
+                        duplicates)
+
+        # ---------- enlace: aristas dentro y entre fragmentos ------------ #
+        parser = XMIParser()
+        edges = [e for _, frag_edges in fragments for e in frag_edges]
+        cross = unresolved = 0
+        for client, supplier in edges:
+            a, b = _ref(client), _ref(supplier)
+            if not (a and b):
+                continue
+            if a not in origin or b not in origin:
+                unresolved += 1
+            elif origin[a] != origin[b]:
+                cross += 1
+        linked = parser.link(model, edges)
+
+        self.stats = {"files": len(files), "classes": len(model.classes),
+                      "edges": linked, "cross_file": cross,
+                      "unresolved": unresolved, "duplicate_ids": duplicates}
+        log.info("proyecto: %d archivos, %d clases, %d aristas entre archivos",
+                 len(files), len(model.classes), cross)
+        return model
@@ -0,0 +1,48 @@
+# src/infrastructure/registry.py
+from __future__ import annotations
+
+import importlib
+from typing import Any, Dict, Iterable, List
+
+
+class LazyRegistry:
+    """
+    Nombre → "paquete.modulo:atributo".  El módulo se importa recién
+    cuando se pide la entrada, así que registrar no cuesta nada.
+    """
+
+    def __init__(self, kind: str, entries: Dict[str, str]) -> None:
+        self.kind = kind
+        self._entries = dict(entries)
+        self._loaded: Dict[str, Any] = {}
+
+    def register(self, name: str, target: str) -> None:
+        self._entries[name] = target
+        self._loaded.pop(name, None)
+
+    def names(self) -> List[str]:
+        return list(self._entries)
+
+    def get(self, name: str) -> Any:
+        if name not in self._loaded:
+            try:
+                module, _, attr = self._entries[name].partition(":")
+            except KeyError:
+                raise KeyError(
+                    f"{self.kind} desconocido: {name!r} (disponibles: {', '.join(self._entries)})"
+                ) from None
+            self._loaded[name] = getattr(importlib.import_module(module), attr)
+        return self._loaded[name]
+
+    def select(self, names: Iterable[str]) -> Dict[str, Any]:
+        return {n: self.get(n) for n in names}
+
+    def parse(self, spec: str) -> List[str]:
+        """'a,b' → ['a', 'b'] validando contra lo registrado."""
+        names = [n.strip() for n in spec.split(",") if n.strip()]
+        unknown = [n for n in names if n not in self._entries]
+        if unknown:
+            raise KeyError(
+                f"{self.kind} desconocido: {', '.join(unknown)} (disponibles: {', '.join(self._entries)})"
+            )
+        return names
@@ -0,0 +1,56 @@
+# src/infrastructure/report_writer.py
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, Tuple
+
+Sections = Iterable[Tuple[str, Iterable[Any]]]
+
+
+def write_json(sections: Sections, path: Path | str) -> int:
+    """
+    Escribe `{sección: [hallazgos…]}` a medida que cada sección produce
+    sus elementos, sin armar el dict completo.  La salida es idéntica
+    byte a byte a `json.dumps(report, indent=2)`.  Devuelve el número de
+    hallazgos escritos.
+    """
+    n, sections_written = 0, 0
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.write("{")
+        for name, items in sections:
+            fh.write(("," if sections_written else "") + f"\n  {json.dumps(name)}: [")
+            sections_written += 1
+            empty = True
+            for item in items:
+                body = json.dumps(item, indent=2).replace("\n", "\n    ")
+                fh.write(("\n    " if empty else ",\n    ") + body)
+                empty = False
+                n += 1
+            fh.write("]" if empty else "\n  ]")
+        fh.write("\n}" if sections_written else "}")
+    return n
+
+
+def write_ndjson(sections: Sections, path: Path | str) -> int:
+    """
+    JSON Lines: un hallazgo por línea, `{"detector": sección, …}`.  Cada
+    línea se escribe en cuanto el detector la produce, así que un lector
+    puede consumir el archivo mientras el análisis sigue corriendo.
+    """
+    n = 0
+    with open(path, "w", encoding="utf-8") as fh:
+        for name, items in sections:
+            for item in items:
+                fh.write(json.dumps(_record(name, item), ensure_ascii=False) + "\n")
+                n += 1
+    return n
+
+
+def _record(detector: str, item: Any) -> Dict[str, Any]:
+    if isinstance(item, dict):
+        return {"detector": detector, **item}
+    return {"detector": detector, "class": item}      # p. ej. hub_like: nombres
+
+
+WRITERS = {"json": write_json, "ndjson": write_ndjson}
@@ -0,0 +1,68 @@
+# src/infrastructure/shared_arrays.py
+from __future__ import annotations
+
+import sys
+from multiprocessing import shared_memory
+from typing import Dict, Tuple
+
+import numpy as np
+
+# (nombre del bloque, {columna: (offset, dtype, shape)}) — se pickea barato
+Handle = Tuple[str, Dict[str, Tuple[int, str, Tuple[int, ...]]]]
+
+_ALIGN = 64
+
+
+class SharedArrays:
+    """
+    Publica un dict de arrays numpy en un único bloque de memoria
+    compartida para que los workers de un pool los lean sin copiarlos
+    ni pickearlos:
+
+        with SharedArrays(cm.arrays()) as shared:
+            ProcessPoolExecutor(initializer=_init, initargs=(shared.handle,))
+
+    y cada worker llama a `attach(handle)` una sola vez en su initializer.
+
+    El bloque se libera (unlink) al salir del `with`.
+    """
+
+    def __init__(self, arrays: Dict[str, np.ndarray]) -> None:
+        layout, size = {}, 0
+        for name, arr in arrays.items():
+            size = -(-size // _ALIGN) * _ALIGN
+            layout[name] = (size, arr.dtype.str, arr.shape)
+            size += arr.nbytes
+        self._shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        for name, arr in arrays.items():
+            off, dtype, shape = layout[name]
+            np.ndarray(shape, dtype, buffer=self._shm.buf, offset=off)[...] = arr
+        self.handle: Handle = (self._shm.name, layout)
+
+    def __enter__(self) -> "SharedArrays":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._shm.close()
+        self._shm.unlink()
+
+
+def attach(handle: Handle) -> Tuple[shared_memory.SharedMemory, Dict[str, np.ndarray]]:
+    """Vistas de sólo lectura sobre un bloque publicado por SharedArrays."""
+    name, layout = handle
+    if sys.version_info >= (3, 13):
+        shm = shared_memory.SharedMemory(name=name, track=False)
+    else:
+        # los workers del pool comparten el resource_tracker del padre:
+        # registrar de nuevo el bloque es idempotente y el unlink del
+        # padre lo da de baja una sola vez
+        shm = shared_memory.SharedMemory(name=name)
+    arrays = {}
+    for col, (off, dtype, shape) in layout.items():
+        arr = np.ndarray(shape, dtype, buffer=shm.buf, offset=off)
+        arr.flags.writeable = False
+        arrays[col] = arr
+    return shm, arrays
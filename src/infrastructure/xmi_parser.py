@@ -1,35 +1,75 @@
 from __future__ import annotations
 
+import logging
 from pathlib import Path
-from lxml import etree
+from typing import List, Tuple
 
 from src.domain.model import UMLModel, UMLClass, UMLAttribute, UMLOperation
 
+log = logging.getLogger(__name__)
+
+Edge = Tuple[str | None, str | None]        # (cliente, proveedor) sin resolver
+
+
+def _ref(ref: str | None) -> str | None:
+    """"otro.xmi#id" → "id" (referencia entre archivos de un proyecto)."""
+    return ref.rpartition("#")[2] if ref and "#" in ref else ref
+
 
 class XMIParser:
+    VERSION = 2          # cambiarlo invalida la caché de modelos parseados
+
     NS = {
         "uml": "http://www.omg.org/spec/UML/20090901",
         "xmi": "http://www.omg.org/XMI",
     }
 
+    CLASS_TYPES = ("uml:Class", "uml:Interface")
+    REL_TYPES = ("uml:Dependency", "uml:Association")
+
     # ------------------------------------------------------------------ #
-    def parse(self, file: Path | str) -> UMLModel:
+    def parse(self, file: Path | str, streaming: bool = False) -> UMLModel:
         """
         Lee un archivo XMI y devuelve un UMLModel.
         - Primer intento: parseo estricto.
         - Si falla por XMLSyntaxError, reintenta sin comentarios y con recover=True.
+        - `streaming=True` usa `iterparse` (memoria acotada por el modelo,
+          no por el DOM); el UMLModel resultante es idéntico.
+        """
+        model, edges = self.parse_fragment(file, streaming)
+        self.link(model, edges)
+        log.info("clases cargadas: %d", len(model.classes))
+        return model
+
+    def parse_fragment(self, file: Path | str,
+                       streaming: bool = False) -> Tuple[UMLModel, List[Edge]]:
+        """
+        Clases de un archivo + sus referencias (cliente, proveedor) sin
+        resolver, en el orden en que `parse` las enlaza.  Permite parsear
+        fragmentos por separado y enlazarlos contra un índice global
+        (ver `ProjectParser`).
         """
+        from lxml import etree                  # import perezoso (arranque del CLI)
+
         p = Path(file)
         if not p.exists():
             raise FileNotFoundError(p.resolve())
 
+        if streaming:
+            try:
+                return self._parse_streaming(p)
+            except etree.XMLSyntaxError as err:
+                result = self._parse_streaming(p, recover=True)
+                log.warning("XML corregido automáticamente (%s)", err)
+                return result
+
         try:
             root = etree.parse(str(p)).getroot()
         except etree.XMLSyntaxError as err:
             # Segundo intento: tolerante
             parser = etree.XMLParser(remove_comments=True, recover=True)
             root = etree.parse(str(p), parser=parser).getroot()
-            print(f"⚠️  XML corregido automáticamente ({err})")
+            log.warning("XML corregido automáticamente (%s)", err)
 
         model = UMLModel()
 
@@ -56,11 +96,12 @@ class XMIParser:
                 )
             model.classes[cls.id_] = cls
 
+        edges: List[Edge] = []
         # ---------- 1.b · clientDependency (sin prefijo) ----------------- #
         for dep in root.xpath(".//clientDependency"):
             client_id = dep.getparent().get(f"{{{self.NS['xmi']}}}id")
-            supplier_id = dep.get("supplier")
-            self._add_edge(model, client_id, supplier_id)
+            supplier_id = dep.get("supplier") or dep.get("href")
+            edges.append((client_id, supplier_id))
 
         # ---------- 2 · Dependency / Association ------------------------ #
         for rel in root.xpath(
@@ -70,10 +111,109 @@ class XMIParser:
         ):
             client = rel.get("client") or rel.get("memberEnd")
             supplier = rel.get("supplier") or rel.get("memberEnd")
-            self._add_edge(model, client, supplier)
+            # referencias a otros archivos: <client href="otro.xmi#id"/>
+            client = client or self._child_href(rel, "client")
+            supplier = supplier or self._child_href(rel, "supplier")
+            edges.append((client, supplier))
 
-        print(f"[PARSE]  clases cargadas: {len(model.classes)}")  # debug opcional
-        return model
+        return model, edges
+
+    def link(self, model: UMLModel, edges: List[Edge]) -> int:
+        """
+        Resuelve las referencias contra `model.classes` (las de otro
+        archivo, "otro.xmi#id", por su id).  Devuelve cuántas aristas quedaron.
+        """
+        before = sum(len(c.outgoing) for c in model.classes.values())
+        for client_id, supplier_id in edges:
+            self._add_edge(model, _ref(client_id), _ref(supplier_id))
+        return sum(len(c.outgoing) for c in model.classes.values()) - before
+
+    @staticmethod
+    def _child_href(rel, tag: str) -> str | None:
+        child = rel.find(tag)
+        return child.get("href") if child is not None else None
+
+    # ------------------------------------------------------------------ #
+    def _parse_streaming(self, p: Path,
+                         recover: bool = False) -> Tuple[UMLModel, List[Edge]]:
+        """
+        Recorre el XMI con `iterparse` manteniendo una pila de ancestros
+        (id, paquete heredado, clase abierta).  Cada elemento se libera al
+        cerrarse; las aristas se difieren y se resuelven al final con el
+        mismo orden que el parseo DOM (clientDependency → relaciones).
+        """
+        from lxml import etree
+
+        xmi_id = f"{{{self.NS['xmi']}}}id"
+        xmi_type = f"{{{self.NS['xmi']}}}type"
+
+        model = UMLModel()
+        client_deps: List[Edge] = []
+        relations: List[Edge] = []
+        # <client href=…>/<supplier href=…> por profundidad de la relación
+        # (los hijos se liberan antes de que la relación se cierre)
+        hrefs: dict[int, dict[str, str]] = {}
+        # tipos de ownedParameter por profundidad de la operación: se anotan
+        # al cerrarse cada parámetro (un hermano posterior, p.ej. un
+        # <ownedComment>, los libera antes de que la operación se cierre)
+        params: dict[int, list[str | None]] = {}
+
+        # pila: (xmi:id, paquete para los hijos, UMLClass | None)
+        stack: list[tuple[str | None, str | None, UMLClass | None]] = []
+
+        context = etree.iterparse(
+            str(p), events=("start", "end"),
+            remove_comments=recover, recover=recover,
+        )
+        for event, elem in context:
+            tag = elem.tag
+            if event == "start":
+                parent_pkg = stack[-1][1] if stack else None
+                cls = None
+                if (stack and tag == "packagedElement"
+                        and elem.get(xmi_type) in self.CLASS_TYPES):
+                    cls = UMLClass(
+                        id_=elem.get(xmi_id),
+                        name=elem.get("name", "<unnamed>"),
+                        package=parent_pkg,
+                    )
+                    model.classes[cls.id_] = cls
+                child_pkg = elem.get("name") if tag.endswith("Package") else parent_pkg
+                stack.append((elem.get(xmi_id), child_pkg, cls))
+                continue
+
+            # ---------- event == "end" ---------------------------------- #
+            stack.pop()
+            owner = stack[-1][2] if stack else None
+            refs = hrefs.pop(len(stack), None) if hrefs else None
+            types = params.pop(len(stack), []) if params else []
+
+            if tag == "ownedParameter" and stack:
+                params.setdefault(len(stack) - 1, []).append(elem.get("type"))
+            elif tag in ("client", "supplier") and stack and elem.get("href"):
+                hrefs.setdefault(len(stack) - 1, {})[tag] = elem.get("href")
+            elif owner is not None and tag == "ownedAttribute":
+                owner.attributes.append(UMLAttribute(elem.get("name"), elem.get("type")))
+            elif owner is not None and tag == "ownedOperation":
+                owner.operations.append(UMLOperation(elem.get("name"), types))
+            elif tag == "clientDependency" and stack:
+                client_deps.append((stack[-1][0], elem.get("supplier") or elem.get("href")))
+            elif (tag == "packagedElement" and stack
+                    and elem.get(xmi_type) in self.REL_TYPES):
+                refs = refs or {}
+                relations.append((
+                    elem.get("client") or elem.get("memberEnd") or refs.get("client"),
+                    elem.get("supplier") or elem.get("memberEnd") or refs.get("supplier"),
+                ))
+
+            # liberar el subárbol ya procesado y los hermanos previos
+            elem.clear(keep_tail=False)
+            parent = elem.getparent()
+            if parent is not None:
+                while elem.getprevious() is not None:
+                    del parent[0]
+        del context
+        return model, client_deps + relations
 
     # ------------------------------------------------------------------ #
     @staticmethod
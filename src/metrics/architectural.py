@@ -1,4 +1,5 @@
 from src.domain.model import UMLClass, UMLModel
+from src.metrics.layers import LayerRules
 
 
 class FanInOut:
@@ -10,23 +11,18 @@ class FanInOut:
 
 
 class LRC:
-    """Layer-Responsibility Count (cuántas capas toca una clase)."""
+    """
+    Layer-Responsibility Count (cuántas capas toca una clase).
 
-    UI = ("ui", "presentation")
-    DAO = ("dao", "repository")
-    SERVICE = ("service", "logic")
+    La capa de cada paquete la decide `LayerRules` (configurable desde
+    `cfg["layers"]`, compilada una vez y memoizada por paquete).
+    """
+
+    def __init__(self, rules: LayerRules | None = None) -> None:
+        self.rules = rules or LayerRules()
 
     def _layer(self, package: str | None) -> str:
-        if not package:
-            return "unknown"
-        p = package.lower()
-        if any(k in p for k in self.UI):
-            return "ui"
-        if any(k in p for k in self.DAO):
-            return "dao"
-        if any(k in p for k in self.SERVICE):
-            return "service"
-        return "other"
+        return self.rules.layer(package)
 
     def calc(self, cls: UMLClass, model: UMLModel) -> int:
         layers = {self._layer(cls.package)}
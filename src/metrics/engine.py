@@ -0,0 +1,125 @@
+# src/metrics/engine.py
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, List
+
+import numpy as np
+
+from src.domain.compact import CompactModel
+from src.domain.model import UMLModel
+from src.infrastructure.profiling import span
+from src.metrics.structural import WMC, ATFD, TCC
+from src.metrics.architectural import FanInOut, LRC
+
+METRICS = ("wmc", "atfd", "tcc", "fanin", "fanout", "lrc")
+
+
+@dataclass
+class MetricTable:
+    """Métricas de todas las clases, alineadas con el orden de `model.classes`."""
+    ids: List[str]
+    names: List[str]
+    packages: List[str | None]
+    wmc: np.ndarray
+    atfd: np.ndarray
+    tcc: np.ndarray
+    fanin: np.ndarray
+    fanout: np.ndarray
+    lrc: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def from_arrays(cls, cm: CompactModel, arrays: Dict[str, np.ndarray]) -> "MetricTable":
+        s = cm.strings
+        return cls(
+            ids=[s[i] for i in cm.class_id],
+            names=[s[i] for i in cm.class_name],
+            packages=[s[i] for i in cm.class_pkg],
+            **{m: arrays[m] for m in METRICS},
+        )
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        return {m: getattr(self, m) for m in METRICS}
+
+    def values(self) -> Dict[str, List[float]]:
+        """Formato de `Calibrator._metric_values` (listas de escalares Python)."""
+        return {m: getattr(self, m).tolist() for m in METRICS if m != "tcc"}
+
+
+class MetricEngine:
+    """
+    Calcula WMC, ATFD, TCC, FanIn, FanOut y LRC para todo el modelo en
+    una sola pasada sobre el CompactModel.  Las calculadoras de
+    `calculators` se respetan: si alguna no es la implementación por
+    defecto se evalúa clase a clase con su `calc`.  `workers > 1`
+    reparte el TCC (la única métrica clase a clase) en un pool.
+    """
+
+    VERSION = 1          # cambiarlo invalida las métricas cacheadas
+
+    def __init__(self, calculators: Dict[str, Any] | None = None, workers: int = 1) -> None:
+        calculators = calculators or {}
+        self.workers = workers
+        self.wmc = calculators.get("wmc") or WMC()
+        self.atfd = calculators.get("atfd") or ATFD()
+        self.tcc = calculators.get("tcc") or TCC()
+        self.fan = calculators.get("fan") or FanInOut()
+        self.lrc = calculators.get("lrc") or LRC()
+
+    # ------------------------------------------------------------------ #
+    def compute(self, model: UMLModel | CompactModel) -> MetricTable:
+        cm = model if isinstance(model, CompactModel) else CompactModel.from_model(model)
+        views = list(model.classes.values())
+
+        def per_class(fn) -> np.ndarray:
+            return np.array([fn(c) for c in views], dtype=np.int64)
+
+        with span("metric.wmc"):
+            wmc = cm.op_count() if type(self.wmc) is WMC else per_class(self.wmc.calc)
+        with span("metric.atfd"):
+            atfd = cm.out_degree() if type(self.atfd) is ATFD else per_class(self.atfd.calc)
+        with span("metric.tcc"):
+            tcc = self._tcc(cm, views)
+        with span("metric.fan"):
+            if type(self.fan) is FanInOut:
+                fanin, fanout = cm.in_degree(), cm.out_degree()
+            else:
+                fanin, fanout = per_class(self.fan.calc_in), per_class(self.fan.calc_out)
+        with span("metric.lrc"):
+            lrc = self._lrc(cm, model, views)
+
+        return MetricTable.from_arrays(cm, dict(
+            wmc=wmc, atfd=atfd, tcc=tcc, fanin=fanin, fanout=fanout, lrc=lrc,
+        ))
+
+    # ------------------------------------------------------------------ #
+    def _tcc(self, cm: CompactModel, views) -> np.ndarray:
+        if type(self.tcc) is TCC:
+            return np.array(self.tcc.calc_all(cm, self.workers), dtype=np.float64)
+        return np.array([self.tcc.calc(c) for c in views], dtype=np.float64)
+
+    # ------------------------------------------------------------------ #
+    def _lrc(self, cm: CompactModel, model, views) -> np.ndarray:
+        """
+        Capa de cada paquete distinto → bit; OR de los bits de la clase y
+        de sus dependencias salientes; LRC = popcount.
+        """
+        pkgs, inverse = np.unique(cm.class_pkg, return_inverse=True)
+        layers = [self.lrc._layer(cm.strings[p]) for p in pkgs]
+        codes = {name: k for k, name in enumerate(dict.fromkeys(layers))}
+        if len(codes) > 63:
+            return np.array([self.lrc.calc(c, model) for c in views], dtype=np.int64)
+
+        pkg_bits = np.array([1 << codes[name] for name in layers], dtype=np.int64)
+        bits = pkg_bits[inverse.reshape(-1)] if len(cm) else np.zeros(0, dtype=np.int64)
+        acc = bits.copy()
+        src = np.repeat(np.arange(len(cm)), cm.out_degree())
+        np.bitwise_or.at(acc, src, bits[cm.out_idx])
+
+        count = np.zeros_like(acc)
+        for k in range(len(codes)):
+            count += (acc >> k) & 1
+        return count
@@ -0,0 +1,154 @@
+# src/metrics/layers.py
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from src.domain.compact import CompactModel
+
+UNKNOWN, OTHER = "unknown", "other"
+
+# capa → palabras clave (el orden es la prioridad, como en el LRC original)
+DEFAULT_RULES: List[Tuple[str, Sequence[str]]] = [
+    ("ui", ("ui", "presentation")),
+    ("dao", ("dao", "repository")),
+    ("service", ("service", "logic")),
+]
+# dependencias permitidas entre capas distintas (arquitectura en capas)
+DEFAULT_ALLOWED: Dict[str, Sequence[str]] = {
+    "ui": ("service",),
+    "service": ("dao",),
+    "dao": (),
+}
+
+
+class LayerRules:
+    """
+    Reglas de capas configurables, compiladas en un único regex.
+
+    Cada capa tiene patrones (subcadena, sin distinguir mayúsculas; con
+    prefijo "re:" se toman como expresión regular).  Todas las capas se
+    compilan en una alternancia de lookaheads anclada al inicio: el
+    motor prueba las alternativas en orden, así que gana la primera capa
+    (por prioridad) con algún patrón presente, en una sola llamada.
+    El resultado se memoiza por nombre de paquete.
+
+    En config.json (opcional):
+
+        "layers": {
+          "rules":   [{"name": "ui", "patterns": ["ui", "presentation"]}, …],
+          "allowed": {"ui": ["service"], "service": ["dao"], "dao": []}
+        }
+
+    `allowed` define qué dependencias entre capas distintas son válidas;
+    las que involucran "unknown"/"other" no se juzgan.
+    """
+
+    def __init__(self, rules: Sequence[Tuple[str, Sequence[str]]] = DEFAULT_RULES,
+                 allowed: Dict[str, Sequence[str]] | None = None) -> None:
+        self.rules = [(name, tuple(patterns)) for name, patterns in rules]
+        self.names = [name for name, _ in self.rules]
+        self.allowed = {k: tuple(v) for k, v in
+                        (DEFAULT_ALLOWED if allowed is None else allowed).items()}
+        alternatives = [
+            f"(?=.*?(?:{'|'.join(_pattern(p) for p in patterns) or '(?!)'}))"
+            for _, patterns in self.rules
+        ]
+        # un grupo con nombre por capa: los grupos propios de los patrones
+        # "re:" no corren la numeración (se resuelve con `lastgroup`)
+        self._regex = re.compile(
+            "|".join(f"(?P<_layer{k}>{a})" for k, a in enumerate(alternatives)) or "(?!)",
+            re.IGNORECASE | re.DOTALL)
+        self._memo: Dict[str | None, str] = {None: UNKNOWN, "": UNKNOWN}
+
+    @classmethod
+    def from_config(cls, cfg: Dict[str, Any] | None) -> "LayerRules":
+        spec = (cfg or {}).get("layers")
+        if not spec:
+            return cls()
+        rules = spec.get("rules")
+        return cls(
+            [(r["name"], r["patterns"]) for r in rules] if rules is not None else DEFAULT_RULES,
+            spec.get("allowed"),
+        )
+
+    def fingerprint(self) -> str:
+        """"" con las reglas por defecto; si no, hash corto de las reglas."""
+        if self.rules == [(n, tuple(p)) for n, p in DEFAULT_RULES] and \
+                self.allowed == {k: tuple(v) for k, v in DEFAULT_ALLOWED.items()}:
+            return ""
+        spec = json.dumps([self.rules, sorted(self.allowed.items())])
+        return hashlib.sha256(spec.encode("utf-8")).hexdigest()[:12]
+
+    # ------------------------------------------------------------------ #
+    def layer(self, package: str | None) -> str:
+        """Capa del paquete (memoizada)."""
+        layer = self._memo.get(package)
+        if layer is None:
+            m = self._regex.match(package)
+            layer = self._memo[package] = (self.names[int(m.lastgroup[len("_layer"):])]
+                                           if m else OTHER)
+        return layer
+
+    def allows(self, src: str, dst: str) -> bool:
+        if src == dst or src not in self.allowed or dst not in self.names:
+            return True
+        return dst in self.allowed[src]
+
+    # ------------------------------------------------------------------ #
+    def package_layers(self, cm: CompactModel) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+        """
+        (paquete de cada clase como código denso, capa de cada paquete
+        como código, nombres de capa).  Cada paquete se clasifica una vez.
+        """
+        pkgs, inverse = np.unique(cm.class_pkg, return_inverse=True)
+        layer_names = [UNKNOWN, OTHER] + self.names
+        code = {name: k for k, name in enumerate(layer_names)}
+        pkg_layer = np.array([code[self.layer(cm.strings[p])] for p in pkgs.tolist()],
+                             dtype=np.int64)
+        return inverse.reshape(-1), pkg_layer, layer_names
+
+    def violations(self, cm: CompactModel) -> List[Dict[str, Any]]:
+        """
+        Matriz paquete→paquete de dependencias que violan `allowed`, en
+        formato disperso (sólo celdas no nulas), calculada en una pasada
+        vectorial sobre todas las aristas.  Orden: más aristas primero.
+        """
+        if not len(cm):
+            return []
+        class_pkg, pkg_layer, layer_names = self.package_layers(cm)
+        n_layers = len(layer_names)
+        ok = np.ones((n_layers, n_layers), dtype=bool)
+        for i, a in enumerate(layer_names):
+            for j, b in enumerate(layer_names):
+                ok[i, j] = self.allows(a, b)
+
+        src = np.repeat(np.arange(len(cm)), cm.out_degree())
+        p_src, p_dst = class_pkg[src], class_pkg[cm.out_idx]
+        bad = ~ok[pkg_layer[p_src], pkg_layer[p_dst]]
+        if not bad.any():
+            return []
+        n_pkg = len(pkg_layer)
+        cells, counts = np.unique(p_src[bad] * n_pkg + p_dst[bad], return_counts=True)
+
+        pkgs = np.unique(cm.class_pkg).tolist()
+        s = cm.strings
+        out = []
+        for cell, n in zip(cells.tolist(), counts.tolist()):
+            a, b = divmod(cell, n_pkg)
+            out.append({
+                "from": s[pkgs[a]], "to": s[pkgs[b]],
+                "from_layer": layer_names[pkg_layer[a]], "to_layer": layer_names[pkg_layer[b]],
+                "edges": n,
+            })
+        out.sort(key=lambda v: (-v["edges"], v["from"] or "", v["to"] or ""))
+        return out
+
+
+def _pattern(p: str) -> str:
+    return p[3:] if p.startswith("re:") else re.escape(p)
+
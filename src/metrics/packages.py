@@ -0,0 +1,111 @@
+# src/metrics/packages.py
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+import numpy as np
+
+from src.domain.compact import CompactModel
+from src.metrics.engine import MetricTable
+
+
+class PackageRollup:
+    """
+    Agregados por paquete en una pasada agrupada sobre las columnas del
+    CompactModel (sin bucles Python por clase ni por arista):
+
+      • clases, WMC y ATFD (suma / media / máximo), god-classes y
+        sospechosas por paquete: `bincount` / `maximum.at` sobre el
+        código de paquete de cada clase;
+      • acoplamiento de Martin entre paquetes: Ce (clases del paquete que
+        dependen de clases externas), Ca (clases externas que dependen de
+        clases del paquete) e inestabilidad I = Ce / (Ca + Ce), sobre las
+        aristas que cruzan paquetes.
+
+    El agrupamiento es lineal en clases + aristas; sólo la deduplicación
+    de pares (paquete, clase) de Ca/Ce ordena (`np.unique`).
+
+    Hotspot = media de tres componentes en [0, 1]: acoplamiento (Ca + Ce)
+    y WMC total relativos al máximo del modelo, y proporción de clases
+    problemáticas (god-class + ½ sospechosa).
+    """
+
+    def __init__(self, top_k: int = 20) -> None:
+        self.top_k = top_k
+
+    def rollup(self, cm: CompactModel, table: MetricTable,
+               labels: np.ndarray) -> List[Dict[str, Any]]:
+        """Agregados de todos los paquetes (orden de primera aparición)."""
+        n = len(cm)
+        if not n:
+            return []
+        # ---------- código denso de paquete por clase (lineal) ----------- #
+        pkg_code = np.asarray(cm.class_pkg, dtype=np.int64) + 1    # sin paquete: -1 → 0
+        first = np.full(int(pkg_code.max()) + 1, n, dtype=np.int64)
+        np.minimum.at(first, pkg_code, np.arange(n))
+        present = np.flatnonzero(first < n)
+        present = present[np.argsort(first[present], kind="stable")]
+        remap = np.empty(len(first), dtype=np.int64)
+        remap[present] = np.arange(len(present))
+        g = remap[pkg_code]
+        k = len(present)
+
+        # ---------- agregados por clase ---------------------------------- #
+        classes = np.bincount(g, minlength=k)
+        wmc = np.asarray(table.wmc, dtype=np.float64)
+        atfd = np.asarray(table.atfd, dtype=np.float64)
+        wmc_sum = np.bincount(g, weights=wmc, minlength=k)
+        atfd_sum = np.bincount(g, weights=atfd, minlength=k)
+        wmc_max = np.zeros(k)
+        atfd_max = np.zeros(k)
+        np.maximum.at(wmc_max, g, wmc)
+        np.maximum.at(atfd_max, g, atfd)
+        labels = np.asarray(labels)
+        god = np.bincount(g[labels == 2], minlength=k)
+        susp = np.bincount(g[labels == 1], minlength=k)
+
+        # ---------- acoplamiento entre paquetes -------------------------- #
+        src = np.repeat(np.arange(n), cm.out_degree())
+        dst = np.asarray(cm.out_idx, dtype=np.int64)
+        ps, pd = g[src], g[dst]
+        cross = ps != pd
+        internal = np.bincount(ps[~cross], minlength=k)
+        ce = np.bincount(np.unique(ps[cross] * n + src[cross]) // n, minlength=k)
+        ca = np.bincount(np.unique(pd[cross] * n + src[cross]) // n, minlength=k)
+        total = ca + ce
+        instability = np.divide(ce, total, out=np.zeros(k), where=total > 0)
+
+        # ---------- hotspot ---------------------------------------------- #
+        coupling = total / max(int(total.max()), 1)
+        complexity = wmc_sum / max(float(wmc_sum.max()), 1.0)
+        problems = (god + 0.5 * susp) / classes
+        hotspot = (coupling + complexity + problems) / 3
+
+        s = cm.strings
+        out = []
+        for j, code in enumerate(present.tolist()):
+            c = int(classes[j])
+            out.append({
+                "package": s[code - 1] or "",
+                "classes": c,
+                "wmc": {"sum": int(wmc_sum[j]), "mean": round(float(wmc_sum[j]) / c, 2),
+                        "max": int(wmc_max[j])},
+                "atfd": {"sum": int(atfd_sum[j]), "mean": round(float(atfd_sum[j]) / c, 2),
+                         "max": int(atfd_max[j])},
+                "god_class": int(god[j]),
+                "suspicious": int(susp[j]),
+                "ca": int(ca[j]),
+                "ce": int(ce[j]),
+                "instability": round(float(instability[j]), 3),
+                "internal_edges": int(internal[j]),
+                "hotspot": round(float(hotspot[j]), 3),
+            })
+        return out
+
+    def hotspots(self, cm: CompactModel, table: MetricTable,
+                 labels: np.ndarray) -> List[Dict[str, Any]]:
+        """Paquetes ordenados por hotspot (los `top_k` primeros; 0 = todos)."""
+        ranked = sorted(self.rollup(cm, table, labels),
+                        key=lambda p: (-p["hotspot"], -p["god_class"], p["package"]))
+        return ranked[:self.top_k] if self.top_k else ranked
+
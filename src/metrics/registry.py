@@ -0,0 +1,53 @@
+# src/metrics/registry.py
+"""Calculadoras de métricas (clave de `calculators` → clase)."""
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator
+
+from src.infrastructure.registry import LazyRegistry
+
+CALCULATORS = LazyRegistry("métrica", {
+    "wmc": "src.metrics.structural:WMC",
+    "atfd": "src.metrics.structural:ATFD",
+    "tcc": "src.metrics.structural:TCC",
+    "fan": "src.metrics.architectural:FanInOut",
+    "lrc": "src.metrics.architectural:LRC",
+})
+
+
+class Calculators(Mapping):
+    """
+    `calculators` perezoso: cada calculadora se importa e instancia la
+    primera vez que se pide, así que una corrida que no calcula métricas
+    (p. ej. `--detectors cycles`) no carga sus módulos.  LRC toma las
+    reglas de `cfg["layers"]`.
+    """
+
+    def __init__(self, cfg: Dict[str, Any] | None = None) -> None:
+        self._cfg = cfg or {}
+        self._made: Dict[str, Any] = {}
+
+    def __getitem__(self, name: str) -> Any:
+        if name not in self._made:
+            cls = CALCULATORS.get(name)               # KeyError si no existe
+            if name == "lrc" and self._cfg.get("layers"):
+                from src.metrics.layers import LayerRules
+                self._made[name] = cls(LayerRules.from_config(self._cfg))
+            else:
+                self._made[name] = cls()
+        return self._made[name]
+
+    def __contains__(self, name: object) -> bool:
+        return name in CALCULATORS.names()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(CALCULATORS.names())
+
+    def __len__(self) -> int:
+        return len(CALCULATORS.names())
+
+
+def default_calculators(cfg: Dict[str, Any] | None = None) -> Calculators:
+    """Una instancia (perezosa) de cada calculadora registrada."""
+    return Calculators(cfg)
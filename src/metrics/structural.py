@@ -1,4 +1,15 @@
-from src.domain.model import UMLClass
+from __future__ import annotations
+
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Tuple
+
+import numpy as np
+
+from src.domain.compact import CompactModel, StringTable
+from src.domain.model import UMLClass, UMLModel
+from src.infrastructure.profiling import count
+from src.infrastructure.shared_arrays import Handle, SharedArrays, attach
 
 
 class WMC:
@@ -16,25 +27,135 @@ class ATFD:
 
 
 class TCC:
-    """Tight Class Cohesion (pares que comparten campo / total de pares)."""
+    """
+    Tight Class Cohesion (pares que comparten campo / total de pares).
+
+    Cada método se compara una sola vez contra los atributos y queda
+    representado por un bitset (int) de los atributos que "usa"; dos
+    métodos están conectados si sus bitsets se intersecan.  Los métodos
+    con el mismo bitset se agrupan, así que el coste es O(m·a) más el
+    cruce entre bitsets distintos, en vez de O(m²·a).
+    """
+
+    SHARD_MIN = 2000     # clases mínimas por shard (por debajo no compensa)
 
     def calc(self, cls: UMLClass) -> float:
-        m = cls.operations
-        if len(m) < 2:
+        return self._tcc([op.name for op in cls.operations],
+                         [att.name for att in cls.attributes], str.lower)
+
+    def calc_all(self, model: UMLModel | CompactModel, workers: int = 1) -> List[float]:
+        """
+        TCC de todas las clases (mismo orden que `model.classes`).  Con
+        `workers > 1` y modelos grandes las clases se reparten en shards
+        contiguos que un pool de procesos evalúa sobre las columnas del
+        CompactModel en memoria compartida; los resultados se concatenan
+        en orden de shard, así que la salida es idéntica a la serial.
+        """
+        if not isinstance(model, CompactModel):
+            model = CompactModel.from_model(model)
+        m = model.op_count()
+        count("tcc.classes", len(model))
+        count("tcc.method_pairs", int((m * (m - 1) // 2).sum()))
+
+        cols = {k: getattr(model, k) for k in _TCC_COLUMNS}
+        if workers <= 1 or len(model) < self.SHARD_MIN * 2:
+            return _tcc_range(model.strings, cols, 0, len(model))
+
+        bounds = _shards(m, min(workers * 4, len(model) // self.SHARD_MIN))
+        count("tcc.shards", len(bounds))
+        cols.update(str_blob=model.strings.blob, str_offsets=model.strings.offsets)
+        with SharedArrays(cols) as shared, ProcessPoolExecutor(
+                max_workers=workers, initializer=_init_worker,
+                initargs=(shared.handle,)) as pool:
+            parts = pool.map(_tcc_shard, bounds)
+            return [v for part in parts for v in part]
+
+    # ------------------------------------------------------------------ #
+    @classmethod
+    def _tcc(cls, methods: List[str], attrs: List[str],
+             lower: Callable[[str], str]) -> float:
+        if len(methods) < 2:
             return 1.0
-        shared = 0
-        total = len(m) * (len(m) - 1) / 2
-        for i, mi in enumerate(m):
-            for mj in m[i + 1:]:
-                if self._share(mi, mj, cls):
-                    shared += 1
-        return shared / total
+        total = len(methods) * (len(methods) - 1) / 2
+        # Pseudo-heurística: un método "usa" un atributo si el nombre del
+        # atributo aparece como substring en el nombre del método.
+        # atributos distintos (en minúsculas) → posición en el bitset
+        keys = list(dict.fromkeys(lower(a) for a in dict.fromkeys(attrs)))
+        if not keys:
+            return 0 / total
+        masks = []
+        for name in methods:
+            low = lower(name)
+            mask = 0
+            for bit, a in enumerate(keys):
+                if a in low:
+                    mask |= 1 << bit
+            masks.append(mask)
+        return cls._connected_pairs(masks) / total
 
     @staticmethod
-    def _share(m1, m2, cls):
-        """Dos métodos comparten atributo SÓLO si el nombre coincide."""
-        attrs = {att.name for att in cls.attributes}
-        # Pseudo-heurística: si el nombre del atributo aparece como
-        # substring en el nombre de ambos métodos → consideramos uso.
-        return any(a.lower() in m1.name.lower() and a.lower() in m2.name.lower()
-                   for a in attrs)
+    def _connected_pairs(masks: List[int]) -> int:
+        """Número de pares (i<j) con masks[i] & masks[j] != 0."""
+        groups = Counter(mk for mk in masks if mk)
+        pairs = sum(c * (c - 1) // 2 for c in groups.values())
+        # si cada método toca un único atributo, grupos distintos no se cruzan
+        if all(mk & (mk - 1) == 0 for mk in groups):
+            return pairs
+        items = list(groups.items())
+        for i, (mi, ci) in enumerate(items):
+            for mj, cj in items[i + 1:]:
+                if mi & mj:
+                    pairs += ci * cj
+        return pairs
+
+
+def _memo_lower() -> Callable[[str], str]:
+    """`str.lower` memoizado (los mismos nombres se repiten entre clases)."""
+    cache: Dict[str, str] = {}
+
+    def lower(s: str) -> str:
+        low = cache.get(s)
+        if low is None:
+            low = cache[s] = s.lower()
+        return low
+    return lower
+
+
+# ---------- TCC por shards ------------------------------------------------ #
+_TCC_COLUMNS = ("op_ptr", "op_name", "attr_ptr", "attr_name")
+_WORKER: Dict[str, Any] = {}
+
+
+def _tcc_range(strings: StringTable, cols: Dict[str, np.ndarray],
+               start: int, stop: int) -> List[float]:
+    """TCC de las clases [start, stop) leyendo sólo las columnas necesarias."""
+    lower = _memo_lower()
+    op_ptr = cols["op_ptr"][start:stop + 1].tolist()
+    attr_ptr = cols["attr_ptr"][start:stop + 1].tolist()
+    op_name = cols["op_name"][op_ptr[0]:op_ptr[-1]].tolist()
+    attr_name = cols["attr_name"][attr_ptr[0]:attr_ptr[-1]].tolist()
+    o0, a0 = op_ptr[0], attr_ptr[0]
+    return [
+        TCC._tcc([strings[k] for k in op_name[op_ptr[i] - o0:op_ptr[i + 1] - o0]],
+                 [strings[k] for k in attr_name[attr_ptr[i] - a0:attr_ptr[i + 1] - a0]],
+                 lower)
+        for i in range(stop - start)
+    ]
+
+
+def _shards(op_count: np.ndarray, n: int) -> List[Tuple[int, int]]:
+    """Cortes contiguos con trabajo (≈ pares de métodos) parecido."""
+    work = np.cumsum(op_count * (op_count - 1) // 2 + op_count + 1)
+    cuts = np.searchsorted(work, work[-1] * np.arange(1, n) / n).tolist()
+    edges = sorted(set([0] + cuts + [len(op_count)]))
+    return list(zip(edges[:-1], edges[1:]))
+
+
+def _init_worker(handle: Handle) -> None:
+    shm, arrays = attach(handle)
+    _WORKER.update(shm=shm, cols=arrays,
+                   strings=StringTable(arrays["str_blob"], arrays["str_offsets"]))
+
+
+def _tcc_shard(bounds: Tuple[int, int]) -> List[float]:
+    return _tcc_range(_WORKER["strings"], _WORKER["cols"], *bounds)
@@ -0,0 +1,224 @@
+# src/tools/bench.py
+"""
+Benchmarks de escala sobre modelos sintéticos.
+
+    python -m src.tools.bench --sizes 1000,10000 --out bench.json
+    python -m src.tools.bench --sizes 1000 --compare bench_prev.json
+
+Para cada tamaño mide tiempo de pared (mínimo de `--repeat` corridas) y
+pico de memoria (tracemalloc, en una corrida aparte para no distorsionar
+el tiempo) de: parseo DOM y streaming, cada métrica, MetricEngine,
+Calibrator.calibrate, ambos detectores y el comando `analyse` completo
+(subproceso), más el arranque del CLI (`startup.*`, con classes=0).
+Los parseos además miden el pico de RSS (`ru_maxrss`) en un subproceso
+propio: tracemalloc no ve el heap C de lxml, que es justo donde el modo
+streaming ahorra memoria.  El resultado es JSON para comparar entre commits.
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Sequence
+
+from src.tools.synth_xmi import generate
+
+
+def _measure(fn: Callable[[], Any], repeat: int, memory: bool) -> Dict[str, float]:
+    sink = io.StringIO()
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        with contextlib.redirect_stdout(sink):
+            fn()
+        best = min(best, time.perf_counter() - t0)
+        sink.seek(0)
+        sink.truncate()
+    res = {"seconds": round(best, 6)}
+    if memory:
+        tracemalloc.start()
+        with contextlib.redirect_stdout(sink):
+            fn()
+        res["peak_mb"] = round(tracemalloc.get_traced_memory()[1] / 2 ** 20, 3)
+        tracemalloc.stop()
+    return res
+
+
+# pico de RSS de un parseo aislado: `base` tras los imports, `peak` al final.
+# En Linux se lee VmHWM: ru_maxrss sobrevive al exec y arrastra el pico
+# del proceso padre (el propio benchmark, con el modelo ya cargado).
+_RSS_CHILD = """
+import resource, sys
+from lxml import etree
+from src.infrastructure.xmi_parser import XMIParser
+
+def peak():
+    try:
+        with open("/proc/self/status") as fh:
+            return next(int(line.split()[1]) for line in fh if line.startswith("VmHWM"))
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+base = peak()
+XMIParser().parse(sys.argv[1], streaming=sys.argv[2] == "1")
+print(base, peak())
+"""
+
+
+def _parse_rss(xmi: Path, streaming: bool) -> Dict[str, float]:
+    """Pico de RSS del proceso y lo que agrega el parseo (MB), o {} sin `resource`."""
+    try:
+        import resource  # noqa: F401  (sólo POSIX)
+    except ImportError:
+        return {}
+    out = subprocess.run([sys.executable, "-c", _RSS_CHILD, str(xmi), "1" if streaming else "0"],
+                         check=True, capture_output=True, text=True).stdout
+    base, peak = (int(x) for x in out.split())
+    unit = 1 if sys.platform == "darwin" else 1024        # bytes en macOS, KiB en Linux
+    return {"rss_peak_mb": round(peak * unit / 2 ** 20, 3),
+            "rss_mb": round((peak - base) * unit / 2 ** 20, 3)}
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def bench_size(xmi: Path, repeat: int = 3, memory: bool = True) -> List[Dict[str, Any]]:
+    from src.application import analysis
+    from src.application.analysis import default_calculators
+    from src.calibration.calibrator import Calibrator
+    from src.detectors.betweenness import BottleneckDetector
+    from src.detectors.cycles import CyclicDependencyDetector
+    from src.detectors.god_class import GodClassDetector
+    from src.detectors.hub_like import HubLikeDependencyDetector
+    from src.domain.compact import CompactModel
+    from src.infrastructure.xmi_parser import XMIParser
+    from src.metrics.engine import MetricEngine
+    from src.metrics.packages import PackageRollup
+
+    cfg = json.loads(Path("config.json").read_text(encoding="utf-8"))
+    calc = default_calculators()
+    with contextlib.redirect_stdout(io.StringIO()):
+        model = XMIParser().parse(xmi)
+    cm = CompactModel.from_model(model)
+    table = MetricEngine(calc).compute(cm)
+    classes = list(model.classes.values())
+
+    stages: Dict[str, Callable[[], Any]] = {
+        "parse.dom": lambda: XMIParser().parse(xmi),
+        "parse.streaming": lambda: XMIParser().parse(xmi, streaming=True),
+        "compact.from_model": lambda: CompactModel.from_model(model),
+        "metric.wmc": lambda: [calc["wmc"].calc(c) for c in classes],
+        "metric.atfd": lambda: [calc["atfd"].calc(c) for c in classes],
+        "metric.tcc": lambda: [calc["tcc"].calc(c) for c in classes],
+        "metric.fan": lambda: [(calc["fan"].calc_in(c), calc["fan"].calc_out(c)) for c in classes],
+        "metric.lrc": lambda: [calc["lrc"].calc(c, model) for c in classes],
+        "metric.engine": lambda: MetricEngine(calc).compute(cm),
+        "calibrate": lambda: Calibrator(dict(cfg)).calibrate(cm, "tesis " * 3000, table),
+        "detect.god_class": lambda: GodClassDetector(cfg, calc).detect(cm, table),
+        "detect.hub_like": lambda: HubLikeDependencyDetector().detect(cm),
+        "detect.cycles": lambda: CyclicDependencyDetector().detect(cm),
+        "detect.bottleneck": lambda: BottleneckDetector().detect(cm),
+        "detect.packages": lambda: PackageRollup().rollup(
+            cm, table, GodClassDetector(cfg, calc).classify(table)[1]),
+        "detect.pipeline": lambda: analysis.detect(cfg, cm, table, calc),
+        "detect.pipeline.threads": lambda: analysis.detect(cfg, cm, table, calc, workers=4),
+    }
+    rows = [{"stage": name, **_measure(fn, repeat, memory)} for name, fn in stages.items()]
+    if memory:
+        for row in rows:
+            if row["stage"].startswith("parse."):
+                row.update(_parse_rss(xmi, streaming=row["stage"] == "parse.streaming"))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cmd = [sys.executable, "-m", "src.cli", "analyse", str(xmi), "-c", "config.json",
+               "-o", f"{tmp}/r.json", "--metrics-out", f"{tmp}/m.json", "--no-cache"]
+        rows.append({"stage": "analyse.e2e", **_measure(
+            lambda: subprocess.run(cmd, check=True, capture_output=True), repeat, False)})
+    return rows
+
+
+def bench_startup(repeat: int = 3) -> List[Dict[str, Any]]:
+    """Costo de arranque del CLI (import del módulo y `--help`) en subproceso."""
+    cmds = {
+        "startup.import": [sys.executable, "-c", "import src.cli"],
+        "startup.help": [sys.executable, "-m", "src.cli", "analyse", "--help"],
+    }
+    return [
+        {"stage": name, **_measure(lambda c=cmd: subprocess.run(c, check=True, capture_output=True),
+                                   repeat, False)}
+        for name, cmd in cmds.items()
+    ]
+
+
+def compare(current: Dict[str, Any], previous: Dict[str, Any]) -> List[str]:
+    """Líneas `tamaño etapa antes → ahora (×ratio)` para cada etapa común."""
+    prev = {(r["classes"], r["stage"]): r for r in previous["results"]}
+    lines = []
+    for r in current["results"]:
+        old = prev.get((r["classes"], r["stage"]))
+        if old and old["seconds"]:
+            ratio = r["seconds"] / old["seconds"]
+            flag = "  ⚠️" if ratio > 1.2 else ""
+            lines.append(f"{r['classes']:>7} {r['stage']:<20} {old['seconds']:.4f}s → "
+                         f"{r['seconds']:.4f}s (×{ratio:.2f}){flag}")
+    return lines
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    ap = argparse.ArgumentParser(description="Benchmarks de escala de CORE_PERSE.")
+    ap.add_argument("--sizes", default="1000,10000",
+                    help="cantidades de clases separadas por coma (p. ej. 1000,10000,100000)")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--no-memory", action="store_true", help="omitir tracemalloc y el RSS de los parseos")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--out", type=Path, default=Path("bench.json"))
+    ap.add_argument("--compare", type=Path, help="JSON de una corrida anterior")
+    a = ap.parse_args(argv)
+
+    results = []
+    for row in bench_startup(a.repeat):
+        results.append({"classes": 0, **row})
+        print(f"{0:>7} {row['stage']:<20} {row['seconds']:.4f}s")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in (int(x) for x in a.sizes.split(",")):
+            xmi = generate(Path(tmp) / f"synth_{n}.xmi", classes=n, seed=a.seed)
+            for row in bench_size(xmi, a.repeat, not a.no_memory):
+                results.append({"classes": n, **row})
+                print(f"{n:>7} {row['stage']:<20} {row['seconds']:.4f}s"
+                      + (f"  {row['peak_mb']:.1f} MB" if "peak_mb" in row else "")
+                      + (f"  RSS +{row['rss_mb']:.1f} MB" if "rss_mb" in row else ""))
+
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+    a.out.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"✅ Resultados → {a.out}")
+
+    if a.compare:
+        for line in compare(report, json.loads(a.compare.read_text(encoding="utf-8"))):
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+# src/tools/synth_xmi.py
+"""
+Generador de modelos XMI sintéticos para pruebas de escala.
+
+    python -m src.tools.synth_xmi out.xmi --classes 10000 --ops-mean 6 \\
+        --attrs-mean 4 --edge-density 3 --layers ui,service,dao,domain
+
+Las clases se reparten en paquetes `<capa>.pkgN` (elementos uml:Package,
+que el parser reconoce como paquete).  Los nombres de operación se
+derivan de los atributos (getX/setX) para que TCC no sea trivial.  Las
+dependencias salen sobre todo hacia la capa siguiente (`--layered`).
+"""
+from __future__ import annotations
+
+import argparse
+import math
+import random
+from pathlib import Path
+from typing import List, Sequence
+from xml.sax.saxutils import quoteattr
+
+DISTRIBUTIONS = ("poisson", "lognormal", "uniform")
+
+
+def _draw(rnd: random.Random, dist: str, mean: float) -> int:
+    if mean <= 0:
+        return 0
+    if dist == "uniform":
+        return rnd.randint(0, int(round(2 * mean)))
+    if dist == "lognormal":                  # cola larga (pocas clases enormes)
+        sigma = 1.0
+        return int(rnd.lognormvariate(math.log(mean) - sigma ** 2 / 2, sigma))
+    # poisson (Knuth) para medias chicas, normal para medias grandes
+    if mean > 30:
+        return max(0, int(round(rnd.gauss(mean, math.sqrt(mean)))))
+    limit, k, p = math.exp(-mean), 0, 1.0
+    while True:
+        p *= rnd.random()
+        if p <= limit:
+            return k
+        k += 1
+
+
+def generate(out: Path | str, classes: int = 1000,
+             ops_mean: float = 5.0, attrs_mean: float = 4.0,
+             dist: str = "poisson",
+             layers: Sequence[str] = ("ui", "service", "dao", "domain"),
+             packages_per_layer: int = 4,
+             edge_density: float = 2.0, layered: float = 0.8,
+             seed: int = 0) -> Path:
+    """Escribe el XMI en streaming (no construye el árbol en memoria)."""
+    if dist not in DISTRIBUTIONS:
+        raise ValueError(f"distribución desconocida: {dist}")
+    rnd = random.Random(seed)
+    out = Path(out)
+
+    packages = [(li, f"{layer}.pkg{k}") for li, layer in enumerate(layers)
+                for k in range(packages_per_layer)]
+    owner = [rnd.randrange(len(packages)) for _ in range(classes)]
+    by_layer: List[List[int]] = [[] for _ in layers]
+    for c, p in enumerate(owner):
+        by_layer[packages[p][0]].append(c)
+
+    def target(c: int) -> int:
+        li = packages[owner[c]][0]
+        if rnd.random() < layered and li + 1 < len(layers) and by_layer[li + 1]:
+            return rnd.choice(by_layer[li + 1])
+        return rnd.randrange(classes)
+
+    members: List[List[int]] = [[] for _ in packages]
+    for c, p in enumerate(owner):
+        members[p].append(c)
+
+    with out.open("w", encoding="utf-8") as fh:
+        fh.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                 '<XMI xmi:version="2.1" xmlns:uml="http://www.omg.org/spec/UML/20090901"'
+                 ' xmlns:xmi="http://www.omg.org/XMI">\n'
+                 '  <uml:Model name="Synthetic" xmi:id="model_synth">\n')
+        rel = 0
+        for p, (_, pkg_name) in enumerate(packages):
+            fh.write(f'    <uml:Package name={quoteattr(pkg_name)} xmi:id="pkg_{p}">\n')
+            for c in members[p]:
+                kind = "uml:Interface" if rnd.random() < 0.1 else "uml:Class"
+                fh.write(f'      <packagedElement xmi:type="{kind}" name="C{c}" xmi:id="c{c}">\n')
+                attrs = [f"field{k}" for k in range(_draw(rnd, dist, attrs_mean))]
+                for a in attrs:
+                    fh.write(f'        <ownedAttribute name="{a}" type="String"/>\n')
+                for k in range(_draw(rnd, dist, ops_mean)):
+                    stem = rnd.choice(attrs).capitalize() if attrs and rnd.random() < 0.7 else f"Op{k}"
+                    fh.write(f'        <ownedOperation name="{rnd.choice(("get", "set", "do"))}{stem}{k}">\n'
+                             f'          <ownedParameter type="String" direction="in"/>\n'
+                             f'        </ownedOperation>\n')
+                n_edges = _draw(rnd, dist, edge_density)
+                for _ in range(n_edges // 2):
+                    fh.write(f'        <clientDependency supplier="c{target(c)}"/>\n')
+                fh.write('      </packagedElement>\n')
+                for _ in range(n_edges - n_edges // 2):
+                    fh.write(f'      <packagedElement xmi:type="uml:Dependency" xmi:id="d{rel}"'
+                             f' client="c{c}" supplier="c{target(c)}"/>\n')
+                    rel += 1
+            fh.write('    </uml:Package>\n')
+        fh.write('  </uml:Model>\n</XMI>\n')
+    return out
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    ap = argparse.ArgumentParser(description="Genera un XMI sintético.")
+    ap.add_argument("out", type=Path)
+    ap.add_argument("--classes", type=int, default=1000)
+    ap.add_argument("--ops-mean", type=float, default=5.0)
+    ap.add_argument("--attrs-mean", type=float, default=4.0)
+    ap.add_argument("--dist", choices=DISTRIBUTIONS, default="poisson")
+    ap.add_argument("--layers", default="ui,service,dao,domain")
+    ap.add_argument("--packages-per-layer", type=int, default=4)
+    ap.add_argument("--edge-density", type=float, default=2.0,
+                    help="dependencias salientes promedio por clase")
+    ap.add_argument("--layered", type=float, default=0.8,
+                    help="fracción de dependencias hacia la capa siguiente")
+    ap.add_argument("--seed", type=int, default=0)
+    a = ap.parse_args(argv)
+    generate(a.out, a.classes, a.ops_mean, a.attrs_mean, a.dist,
+             a.layers.split(","), a.packages_per_layer, a.edge_density, a.layered, a.seed)
+    print(f"✅ {a.out} generado ({a.classes} clases)")
+
+
+if __name__ == "__main__":
+    main()
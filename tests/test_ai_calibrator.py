@@ -0,0 +1,93 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+openai = pytest.importorskip("openai")
+pytest.importorskip("PyPDF2")
+
+from src.calibration.ai_calibrator import AICalibrator  # noqa: E402
+from src.calibration.digest import CHARS_PER_TOKEN  # noqa: E402
+from tests.test_metric_engine import random_model  # noqa: E402
+
+SUGGESTIONS = {
+    "stub-a": {"wmc_min": 0, "wmc_max": 10, "score_godclass": 0.6},
+    "stub-b": {"wmc_min": 0, "wmc_max": 20, "score_godclass": 0.8},
+}
+
+
+class _Stub(BaseHTTPRequestHandler):
+    calls: list = []
+    fail_first = True
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        type(self).calls.append(body["model"])
+        if body["model"] not in SUGGESTIONS:          # error no transitorio
+            self.send_response(404)
+            self.end_headers()
+            return
+        if type(self).fail_first:
+            type(self).fail_first = False
+            self.send_response(503)
+            self.end_headers()
+            return
+        content = "Aquí va:\n" + json.dumps(SUGGESTIONS[body["model"]])
+        payload = json.dumps({
+            "id": "x", "object": "chat.completion", "created": 0, "model": body["model"],
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": content}}],
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Stub)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/v1"
+    server.shutdown()
+
+
+def test_multi_model_retry_and_cache(stub_url, tmp_path):
+    _Stub.calls.clear()
+    cal = AICalibrator(["stub-a", "stub-b"], api_key="test", base_url=stub_url,
+                       backoff=0.01, cache_dir=tmp_path)
+    model = random_model()
+
+    cfg = cal.suggest_from_text(model, "texto de la tesis")
+    assert cfg == {"wmc_min": 0.0, "wmc_max": 15.0, "score_godclass": 0.7}
+    assert len(_Stub.calls) == 3                   # un 503 reintentado
+
+    assert cal.suggest_from_text(model, "texto de la tesis") == cfg
+    assert len(_Stub.calls) == 3                   # todo desde la caché
+
+
+def test_failing_model_does_not_cancel_the_others(stub_url):
+    _Stub.calls.clear()
+    _Stub.fail_first = False
+    cal = AICalibrator(["stub-a", "missing", "stub-b"], api_key="test",
+                       base_url=stub_url, backoff=0.01, cache_dir=None)
+    cfg = cal.suggest_from_text(random_model(), "otra tesis")
+    assert cfg == {"wmc_min": 0.0, "wmc_max": 15.0, "score_godclass": 0.7}
+    assert sorted(_Stub.calls) == ["missing", "stub-a", "stub-b"]
+
+    with pytest.raises(openai.NotFoundError):      # ninguno respondió
+        AICalibrator("missing", api_key="test", base_url=stub_url,
+                     cache_dir=None).suggest_from_text(random_model(), "otra tesis")
+
+
+def test_prompt_size_is_bounded(tmp_path):
+    cal = AICalibrator("stub-a", api_key="test", cache_dir=tmp_path)
+    large = {m: list(range(50_000)) for m in ("wmc", "atfd", "fanin", "fanout", "lrc")}
+    size = lambda metrics: len(cal._build_prompt(metrics, "tesis")[1]["content"])  # noqa: E731
+    # el resumen respeta el presupuesto aunque el modelo tenga 50k clases
+    assert size(large) - size({}) <= AICalibrator.DIGEST_TOKENS * CHARS_PER_TOKEN
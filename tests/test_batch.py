@@ -0,0 +1,40 @@
+import json
+import shutil
+from pathlib import Path
+
+from src.application.batch import discover, run_batch, source_root
+
+SAMPLE = Path("samples/big_example.xmi")
+CFG = json.loads(Path("config.json").read_text(encoding="utf-8"))
+
+
+def test_batch_isolates_failures(tmp_path):
+    src = tmp_path / "models"
+    (src / "sub").mkdir(parents=True)
+    shutil.copy(SAMPLE, src / "a.xmi")
+    shutil.copy(SAMPLE, src / "sub" / "b.xmi")
+    (src / "empty.xmi").write_text("<XMI/>", encoding="utf-8")  # sin clases → falla al calibrar
+
+    files = discover(str(src))
+    out = tmp_path / "out"
+    summary = run_batch(files, CFG, out, base=src, workers=2, context_txt="tesis " * 600)
+
+    assert (summary["models"], summary["ok"], summary["failed"]) == (3, 2, 1)
+    assert summary["classes"] == 16
+    failed = [r for r in summary["results"] if r["status"] == "error"]
+    assert failed[0]["stem"] == "empty"
+    assert (out / "a.report.json").exists() and (out / "sub__b.report.json").exists()
+    assert json.loads((out / "summary.json").read_text())["failed"] == 1
+
+
+def test_glob_sources_keep_same_named_models_apart(tmp_path):
+    for sub in ("a", "b"):
+        (tmp_path / "models" / sub).mkdir(parents=True)
+        shutil.copy(SAMPLE, tmp_path / "models" / sub / "x.xmi")
+    source = str(tmp_path / "models" / "**" / "*.xmi")
+    assert source_root(source) == tmp_path / "models"
+
+    out = tmp_path / "out"
+    summary = run_batch(discover(source), CFG, out, base=source_root(source))
+    assert sorted(r["stem"] for r in summary["results"]) == ["a__x", "b__x"]
+    assert (out / "a__x.report.json").exists() and (out / "b__x.report.json").exists()
@@ -0,0 +1,13 @@
+import pytest
+
+from src.tools.bench import _parse_rss
+from src.tools.synth_xmi import generate
+
+pytest.importorskip("resource")
+
+
+def test_streaming_parse_peak_rss_is_lower(tmp_path):
+    xmi = generate(tmp_path / "synth.xmi", classes=5000, seed=1)
+    dom, streaming = _parse_rss(xmi, streaming=False), _parse_rss(xmi, streaming=True)
+    # el DOM de lxml vive en el heap C: tracemalloc no lo ve, el RSS sí
+    assert streaming["rss_mb"] < dom["rss_mb"] / 2
@@ -0,0 +1,65 @@
+import os
+from pathlib import Path
+
+from src.domain.compact import CompactModel
+from src.infrastructure.cache import ModelCache
+from src.infrastructure.xmi_parser import XMIParser
+from src.metrics.engine import MetricEngine
+
+SAMPLE = Path("samples/big_example.xmi")
+
+
+def test_roundtrip(tmp_path):
+    cm = CompactModel.from_model(XMIParser().parse(SAMPLE))
+    table = MetricEngine().compute(cm)
+    cache = ModelCache(tmp_path)
+    key = cache.key(SAMPLE)
+
+    assert cache.load(key) is None
+    cache.store(key, cm, table)
+    cm2, table2 = cache.load(key)
+
+    assert cm2.to_model() == cm.to_model()
+    assert table2.ids == table.ids
+    for metric, values in table.arrays().items():
+        assert getattr(table2, metric).tolist() == values.tolist()
+
+
+def test_lru_eviction(tmp_path):
+    cm = CompactModel.from_model(XMIParser().parse(SAMPLE))
+    table = MetricEngine().compute(cm)
+    cache = ModelCache(tmp_path)
+    first = cache.store("a", cm, table)
+    os.utime(first, (1, 1))
+    cache.store("b", cm, table)
+    os.utime(cache._path("b"), (2, 2))
+    cache.load("a")                                   # "a" pasa a ser el más reciente
+
+    cache.max_bytes = first.stat().st_size * 2
+    cache.store("c", cm, table)
+    assert sorted(p.stem for p in tmp_path.glob("*.npz")) == ["a", "c"]
+
+
+def test_oversized_entry_survives_its_own_store(tmp_path):
+    cm = CompactModel.from_model(XMIParser().parse(SAMPLE))
+    table = MetricEngine().compute(cm)
+    cache = ModelCache(tmp_path)
+    cache.store("a", cm, table)
+
+    cache.max_bytes = 1                               # cualquier entrada lo excede
+    cache.store("b", cm, table)
+    assert [p.stem for p in tmp_path.glob("*.npz")] == ["b"]
+    assert cache.load("b") is not None
+
+
+def test_corrupt_entry_is_a_miss(tmp_path):
+    cm = CompactModel.from_model(XMIParser().parse(SAMPLE))
+    table = MetricEngine().compute(cm)
+    cache = ModelCache(tmp_path)
+    path = cache.store("k", cm, table)
+
+    data = path.read_bytes()
+    path.write_bytes(data[: len(data) // 2])          # truncado
+    assert cache.load("k") is None
+    path.write_bytes(b"no es un zip")
+    assert cache.load("k") is None
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from src.application import analysis
+from src.application.sweep import ThresholdSweep
+from src.domain.compact import CompactModel
+from src.infrastructure import columnar
+from src.metrics.engine import METRICS, MetricEngine
+
+from tests.test_detectors import CFG
+from tests.test_metric_engine import random_model
+
+
+def _columns():
+    model = CompactModel.from_model(random_model())
+    calculators = analysis.default_calculators()
+    table = MetricEngine(calculators).compute(model)
+    return analysis.class_columns(CFG, model, table, calculators), table, calculators
+
+
+def _roundtrip(tmp_path, suffix):
+    cols, table, calculators = _columns()
+    path = columnar.write_columns(cols, tmp_path / f"run{suffix}")
+    back = columnar.read_columns(path)
+    assert list(back) == list(columnar.COLUMNS)
+    for name in columnar.COLUMNS:
+        np.testing.assert_array_equal(back[name], cols[name])
+
+    # el barrido y el calibrador leen la tabla sin re-parsear
+    loaded = columnar.to_metric_table(back)
+    assert loaded.packages == table.packages
+    grid = {"score_godclass": [0.4, 0.5], "wmc_max": [4, 8]}
+    assert ThresholdSweep(loaded, CFG, calculators).evaluate(grid) == \
+        ThresholdSweep(table, CFG, calculators).evaluate(grid)
+    return back
+
+
+def test_npy_directory_is_memory_mapped(tmp_path):
+    back = _roundtrip(tmp_path, ".cols")
+    assert all(isinstance(back[m], np.memmap) for m in METRICS)
+    assert (back["pagerank"] > 0).any() and set(np.unique(back["label"])) <= {0, 1, 2}
+
+
+def test_arrow_and_parquet(tmp_path):
+    pytest.importorskip("pyarrow")
+    _roundtrip(tmp_path, ".arrow")
+    _roundtrip(tmp_path, ".parquet")
+
+
+def test_diff_by_id():
+    cols, _, _ = _columns()
+    new = {k: np.array(v) for k, v in cols.items()}
+    flagged = np.flatnonzero(new["label"])
+    new["label"][flagged[0]] = 0                        # resuelta
+    i = int(np.flatnonzero(new["label"] == 0)[0])
+    new["label"][i], new["score"][i] = 2, 0.99          # nueva
+    delta = columnar.diff(cols, new)["god_class"]
+    assert [e["id"] for e in delta["resolved"]] == [str(cols["id"][flagged[0]])]
+    assert [e["id"] for e in delta["new"]] == [str(cols["id"][i])]
+    assert delta["changed"] == []
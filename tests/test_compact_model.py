@@ -0,0 +1,31 @@
+from pathlib import Path
+
+from src.domain.compact import CompactModel
+from src.infrastructure.xmi_parser import XMIParser
+from src.metrics.structural import WMC, ATFD, TCC
+from src.metrics.architectural import FanInOut, LRC
+
+
+def test_roundtrip_and_views():
+    model = XMIParser().parse(Path("samples/big_example.xmi"))
+    compact = CompactModel.from_model(model)
+
+    assert list(compact.classes) == list(model.classes)
+    assert compact.to_model() == model
+
+    fan, lrc = FanInOut(), LRC()
+    for cid, cls in model.classes.items():
+        view = compact.classes[cid]
+        assert WMC().calc(view) == WMC().calc(cls)
+        assert ATFD().calc(view) == ATFD().calc(cls)
+        assert TCC().calc(view) == TCC().calc(cls)
+        assert fan.calc_in(view) == fan.calc_in(cls)
+        assert lrc.calc(view, compact) == lrc.calc(cls, model)
+
+
+def test_csr_degrees():
+    model = XMIParser().parse(Path("samples/big_example.xmi"))
+    compact = CompactModel.from_model(model)
+    assert compact.out_degree().tolist() == [len(c.outgoing) for c in model.classes.values()]
+    assert compact.in_degree().tolist() == [len(c.incoming) for c in model.classes.values()]
+    assert compact.op_count().tolist() == [len(c.operations) for c in model.classes.values()]
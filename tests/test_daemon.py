@@ -0,0 +1,75 @@
+import json
+import shutil
+import threading
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+from src.application.daemon import AnalysisService, make_server
+
+SAMPLE = Path("samples/big_example.xmi")
+CFG = json.loads(Path("config.json").read_text(encoding="utf-8"))
+
+
+@pytest.fixture
+def server(tmp_path):
+    xmi = tmp_path / "model.xmi"
+    shutil.copy(SAMPLE, xmi)
+    service = AnalysisService(CFG, "tesis " * 600)
+    service.add(xmi)
+    srv = make_server(service, port=0)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    yield service, xmi, f"http://127.0.0.1:{srv.server_address[1]}"
+    srv.shutdown()
+    srv.server_close()
+
+
+def _get(url, method="GET"):
+    req = urllib.request.Request(url, method=method)
+    with urllib.request.urlopen(req, timeout=10) as resp:
+        return json.loads(resp.read())
+
+
+def test_queries(server):
+    service, xmi, base = server
+    assert _get(f"{base}/health")["models"] == 1
+    report = _get(f"{base}/report")
+    assert set(report) == {"god_class", "hub_like"}
+    assert _get(f"{base}/report?model=model.xmi") == report
+
+    [row] = _get(f"{base}/metrics?class=Guest")
+    assert row["metrics"]["WMC"] == 2 and row["label"] in ("normal", "suspicious", "god-class")
+    with pytest.raises(urllib.error.HTTPError) as err:
+        _get(f"{base}/metrics?class=Nope")
+    assert err.value.code == 404
+    assert isinstance(_get(f"{base}/hubs"), list)
+
+
+def test_refresh_reanalyses_changed_files(server):
+    service, xmi, base = server
+    before = _get(f"{base}/models")[0]["analysed_at"]
+    assert service.refresh() == []
+
+    text = xmi.read_text(encoding="utf-8").replace('name="Guest"', 'name="Visitor"')
+    time.sleep(0.01)
+    xmi.write_text(text, encoding="utf-8")
+    assert service.refresh() == [str(xmi.resolve())]
+
+    assert _get(f"{base}/models")[0]["analysed_at"] > before
+    assert _get(f"{base}/metrics?class=Visitor")[0]["class"] == "Visitor"
+    assert _get(f"{base}/delta") is not None
+
+
+def test_unix_socket_path_must_not_clobber_regular_files(tmp_path):
+    path = tmp_path / "daemon.sock"
+    path.write_text("no soy un socket", encoding="utf-8")
+    with pytest.raises(FileExistsError):
+        make_server(AnalysisService(CFG), unix_socket=path)
+    assert path.read_text(encoding="utf-8") == "no soy un socket"
+
+    path.unlink()
+    make_server(AnalysisService(CFG), unix_socket=path).server_close()   # queda el socket
+    make_server(AnalysisService(CFG), unix_socket=path).server_close()   # se reemplaza
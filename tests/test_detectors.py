@@ -0,0 +1,70 @@
+import pytest
+
+from src.detectors.god_class import GodClassDetector
+from src.detectors.graph import ClassGraph
+from src.detectors.hub_like import HubLikeDependencyDetector
+from src.metrics.structural import WMC, ATFD, TCC
+from src.metrics.architectural import FanInOut, LRC
+
+from tests.test_metric_engine import random_model
+
+CFG = {"wmc_min": 0, "wmc_max": 4, "atfd_min": 0, "atfd_max": 3,
+       "fanin_max": 3, "fanout_max": 3, "lrc_max": 3,
+       "score_suspicious": 0.35, "score_godclass": 0.5}
+
+
+def _calculators():
+    return dict(wmc=WMC(), atfd=ATFD(), tcc=TCC(), fan=FanInOut(), lrc=LRC())
+
+
+def _reference_findings(model, cfg):
+    """Implementación clase a clase (previa al MetricEngine)."""
+    c = _calculators()
+
+    def norm(x, key):
+        rng = cfg.get(f"{key}_max", 1) - cfg.get(f"{key}_min", 0)
+        return 0.0 if rng == 0 else (x - cfg.get(f"{key}_min", 0)) / rng
+
+    out = []
+    for cls in model.classes.values():
+        w, a, t = c["wmc"].calc(cls), c["atfd"].calc(cls), c["tcc"].calc(cls)
+        fi, fo = c["fan"].calc_in(cls), c["fan"].calc_out(cls)
+        lrc = c["lrc"].calc(cls, model)
+        p_base = 0.4 * norm(w, "wmc") + 0.3 * norm(a, "atfd") + 0.3 * (1 - t)
+        p_arq = (0.4 * min(lrc / max(cfg["lrc_max"], 1), 1)
+                 + 0.3 * min(fo / max(cfg["fanout_max"], 1), 1)
+                 + 0.3 * min(fi / max(cfg["fanin_max"], 1), 1))
+        score = 0.5 * p_base + 0.3 * p_arq
+        if score < cfg["score_suspicious"]:
+            continue
+        label = "god-class" if score >= cfg["score_godclass"] else "suspicious"
+        out.append({"class": cls.name, "score": round(score, 2), "label": label,
+                    "metrics": {"WMC": w, "ATFD": a, "TCC": round(t, 2),
+                                "FanIn": fi, "FanOut": fo, "LRC": lrc}})
+    return out
+
+
+def test_vectorized_scoring_matches_reference():
+    model = random_model()
+    findings = GodClassDetector(CFG, _calculators()).detect(model)
+    assert findings
+    assert findings == _reference_findings(model, CFG)
+
+
+def test_sparse_pagerank_matches_networkx():
+    model = random_model(n=120, seed=11)           # nombres únicos → mismo grafo
+    sparse = HubLikeDependencyDetector(tol=1e-12)
+    reference = HubLikeDependencyDetector(backend="networkx", tol=1e-12)
+
+    hubs, pr = sparse.detect_ranked(model, top_k=15)
+    ref_hubs, ref_pr = reference.detect_ranked(model, top_k=15)
+
+    names = {cid: c.name for cid, c in model.classes.items()}
+    assert {names[cid]: v for cid, v in pr.items()} == pytest.approx(ref_pr, abs=1e-9)
+    assert hubs == ref_hubs
+
+    # arranque en caliente: converge en menos iteraciones
+    g = ClassGraph.from_model(model)
+    _, cold = g.pagerank(tol=1e-10)
+    _, warm = g.pagerank(tol=1e-10, nstart=g.align(pr))
+    assert warm < cold
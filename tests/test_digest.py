@@ -0,0 +1,34 @@
+import numpy as np
+
+from src.calibration.digest import LEVELS, estimate_tokens, metric_digest, summarize
+
+
+def test_summary_is_exact_on_small_input():
+    values = [0, 0, 1, 2, 2, 3, 5, 8, 13, 40]
+    s = summarize(values)
+    assert (s["n"], s["min"], s["max"]) == (10, 0, 40)
+    assert s["quantiles"]["p50"] == sorted(values)[5]
+    assert s["quantiles"]["p95"] == sorted(values)[9]
+    assert s["histogram"]["counts"][0] == 2            # el intervalo [0, 1)
+    assert sum(s["histogram"]["counts"]) == 10
+    assert s["outliers"]["above"] == 1                 # sólo el 40 supera Q3 + 1.5·IQR
+
+
+def test_digest_size_does_not_grow_with_classes():
+    rng = np.random.default_rng(0)
+    sizes = []
+    for n in (100, 10_000, 200_000):
+        metrics = {m: rng.pareto(1.5, n).astype(int) for m in ("wmc", "atfd", "fanin")}
+        digest = metric_digest(metrics, max_tokens=None)
+        assert all(sum(d["histogram"]["counts"]) == n for d in digest.values())
+        sizes.append(estimate_tokens(digest))
+    assert max(sizes) < 1.5 * min(sizes)               # sólo crecen los dígitos
+
+
+def test_budget_selects_a_coarser_level():
+    metrics = {m: np.arange(1000) for m in ("wmc", "atfd", "fanin", "fanout", "lrc")}
+    full = metric_digest(metrics, max_tokens=None)
+    tight = metric_digest(metrics, max_tokens=150)
+    assert estimate_tokens(tight) < estimate_tokens(full)
+    assert "histogram" not in tight["wmc"]
+    assert len(tight["wmc"]["quantiles"]) == len(LEVELS[-1][1])
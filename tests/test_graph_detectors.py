@@ -0,0 +1,66 @@
+import networkx as nx
+import numpy as np
+
+from src.detectors.betweenness import BottleneckDetector
+from src.detectors.cycles import CyclicDependencyDetector
+from src.detectors.graph import ClassGraph
+from src.domain.compact import CompactModel
+from src.domain.model import UMLClass, UMLModel
+
+from tests.test_metric_engine import random_model
+
+
+def _nx_graph(g):
+    G = nx.DiGraph()
+    G.add_nodes_from(range(len(g)))
+    coo = g.adjacency.tocoo()
+    G.add_edges_from(zip(coo.row.tolist(), coo.col.tolist()))
+    return G
+
+
+def _chain_model(n, back_edge=None):
+    model = UMLModel()
+    for i in range(n):
+        model.classes[f"c{i}"] = UMLClass(id_=f"c{i}", name=f"C{i}")
+    edges = [(i, i + 1) for i in range(n - 1)] + ([back_edge] if back_edge else [])
+    for a, b in edges:
+        model.classes[f"c{a}"].outgoing.add(f"c{b}")
+        model.classes[f"c{b}"].incoming.add(f"c{a}")
+    return model
+
+
+def test_cycles_match_strongly_connected_components():
+    model = CompactModel.from_model(random_model())
+    g = ClassGraph.from_model(model)
+    ids = g.ids()
+    expected = sorted(sorted(ids[k] for k in c)
+                      for c in nx.strongly_connected_components(_nx_graph(g)) if len(c) > 1)
+    found = CyclicDependencyDetector().detect(model)
+    assert sorted(sorted(f["ids"]) for f in found) == expected
+    assert all(f["edges"] >= f["size"] for f in found)
+
+
+def test_cycle_cluster_report():
+    [cycle] = CyclicDependencyDetector().detect(_chain_model(6, back_edge=(4, 1)))
+    assert cycle["classes"] == ["C1", "C2", "C3", "C4"]
+    assert (cycle["size"], cycle["edges"]) == (4, 4)
+    assert CyclicDependencyDetector().detect(_chain_model(6)) == []
+
+
+def test_betweenness_exact_when_all_sources_sampled():
+    g = ClassGraph.from_model(random_model())
+    bc, k = BottleneckDetector(samples=len(g)).betweenness(g)
+    ref = nx.betweenness_centrality(_nx_graph(g))
+    assert k == len(g)
+    assert np.allclose(bc, [ref[i] for i in range(len(g))])
+
+
+def test_sampled_betweenness_within_error_bound():
+    model = _chain_model(150, back_edge=(149, 0))
+    g = ClassGraph.from_model(model)
+    det = BottleneckDetector(epsilon=0.25, delta=0.1, seed=1)
+    bc, k = det.betweenness(g)
+    assert k == det.sample_size(len(g)) < len(g)
+    ref = nx.betweenness_centrality(_nx_graph(g))
+    assert np.abs(bc - [ref[i] for i in range(len(g))]).max() <= 0.25
+    assert det.betweenness(g)[0].tolist() == bc.tolist()     # determinista (seed)
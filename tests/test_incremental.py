@@ -0,0 +1,109 @@
+import copy
+import shutil
+from pathlib import Path
+
+from src.application import incremental
+from src.application.analysis import default_calculators
+from src.application.incremental import (
+    AnalysisState, build_state, delta_report, diff_models, run_incremental, update_metrics,
+)
+from src.domain.compact import CompactModel
+from src.domain.model import UMLClass, UMLOperation
+from src.infrastructure.xmi_parser import XMIParser
+from src.metrics.engine import MetricEngine
+from src.tools.synth_xmi import generate
+
+from tests.test_detectors import CFG
+from tests.test_metric_engine import random_model
+
+
+def _evolve(model):
+    new = copy.deepcopy(model)
+    new.classes["c3"].operations.append(UMLOperation("getF0extra"))
+    new.classes["c4"].package = "legacy.ui"
+    removed = new.classes.pop("c5")
+    for cid in removed.outgoing:
+        new.classes[cid].incoming.discard("c5")
+    for cid in removed.incoming:
+        new.classes[cid].outgoing.discard("c5")
+    new.classes["cX"] = UMLClass(id_="cX", name="CX", package="app.dao")
+    new.classes["cX"].outgoing.add("c1")
+    new.classes["c1"].incoming.add("cX")
+    return new
+
+
+def test_incremental_metrics_match_full_recompute(tmp_path):
+    calculators = default_calculators()
+    old_cm = CompactModel.from_model(random_model())
+    old_state, _ = build_state(CFG, old_cm, MetricEngine().compute(old_cm), calculators)
+    old_state.save(tmp_path / "state.npz")
+    previous = AnalysisState.load(tmp_path / "state.npz")
+
+    new_cm = CompactModel.from_model(_evolve(random_model()))
+    diff = diff_models(previous.model, new_cm)
+    assert diff.added == {"cX"} and diff.removed == {"c5"}
+    assert {"c3", "c4", "c1"} <= diff.changed
+
+    table, dirty = update_metrics(previous, new_cm, diff, calculators)
+    assert len(dirty) < len(new_cm)
+    full = MetricEngine().compute(new_cm)
+    for metric, values in full.arrays().items():
+        assert getattr(table, metric).tolist() == values.tolist(), metric
+
+    new_state, _ = build_state(CFG, new_cm, table, calculators, nstart=previous.pagerank)
+    delta = delta_report(previous, new_state)
+
+    def flagged(state):
+        return {cid for cid, i in state.model.index.items() if state.labels[i]}
+
+    before, after = flagged(previous), flagged(new_state)
+    assert {r["id"] for r in delta["god_class"]["new"]} == after - before
+    assert {r["id"] for r in delta["god_class"]["resolved"]} == before - after
+    assert {r["id"] for r in delta["god_class"]["changed"]} <= before & after
+
+
+def test_large_change_falls_back_to_full_pass(monkeypatch):
+    calculators = default_calculators()
+    old_cm = CompactModel.from_model(random_model())
+    old_state, _ = build_state(CFG, old_cm, MetricEngine().compute(old_cm), calculators)
+    new_cm = CompactModel.from_model(_evolve(random_model()))
+    diff = diff_models(old_cm, new_cm)
+    old_m, new_m = old_cm.to_model(), new_cm.to_model()     # referencia clase a clase
+    assert diff.changed == {cid for cid in old_m.classes.keys() & new_m.classes.keys()
+                            if old_m.classes[cid] != new_m.classes[cid]}
+
+    monkeypatch.setattr(incremental, "FULL_RECOMPUTE", 0.0)
+    monkeypatch.setattr(incremental.MetricEngine, "compute",
+                        lambda self, model: "pasada completa")
+    table, _ = update_metrics(old_state, new_cm, diff, calculators)
+    assert table == "pasada completa"
+
+
+def test_unchanged_content_is_not_reparsed(tmp_path, monkeypatch):
+    xmi = tmp_path / "model.xmi"
+    shutil.copy(Path("samples/big_example.xmi"), xmi)
+    calculators = default_calculators()
+    first = run_incremental(xmi, dict(CFG), None, calculators)
+
+    def boom(*args, **kwargs):
+        raise AssertionError("no debería re-parsear")
+
+    monkeypatch.setattr(XMIParser, "parse", boom)
+    again = run_incremental(xmi, dict(CFG), first["state"], calculators)
+    assert again["stats"]["recomputed"] == 0
+    assert again["report"] == first["report"]
+    assert again["delta"]["god_class"] == {"new": [], "resolved": [], "changed": []}
+
+
+def test_changed_layer_rules_recompute_lrc(tmp_path):
+    xmi = generate(tmp_path / "model.xmi", classes=300, seed=1)
+    first = run_incremental(xmi, dict(CFG), None, default_calculators())
+    first["state"].save(tmp_path / "state.npz")
+
+    # mismo XMI, sólo cambian las capas: todo en una capa ⇒ LRC = 1
+    cfg = {**CFG, "layers": {"rules": [{"name": "todo", "patterns": ["re:."]}]}}
+    calculators = default_calculators(cfg)
+    again = run_incremental(xmi, dict(cfg), AnalysisState.load(tmp_path / "state.npz"),
+                            calculators)
+    assert set(again["state"].table.lrc.tolist()) == {1} < set(first["state"].table.lrc.tolist())
+    assert again["stats"]["recomputed"] == again["stats"]["classes"]
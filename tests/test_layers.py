@@ -0,0 +1,79 @@
+import random
+
+from src.domain.compact import CompactModel
+from src.metrics.architectural import LRC
+from src.metrics.engine import MetricEngine
+from src.metrics.layers import LayerRules
+from src.metrics.registry import default_calculators
+
+from tests.test_metric_engine import random_model
+
+
+def _original_layer(package):
+    """`LRC._layer` previo a las reglas configurables."""
+    if not package:
+        return "unknown"
+    p = package.lower()
+    if any(k in p for k in ("ui", "presentation")):
+        return "ui"
+    if any(k in p for k in ("dao", "repository")):
+        return "dao"
+    if any(k in p for k in ("service", "logic")):
+        return "service"
+    return "other"
+
+
+def test_default_rules_match_original_priority():
+    rnd = random.Random(5)
+    words = ["UI", "Presentation", "dao", "Repository", "service", "Logic", "core", "x.y", ""]
+    rules = LayerRules()
+    for _ in range(500):
+        pkg = ".".join(rnd.sample(words, rnd.randint(0, 3)))
+        assert rules.layer(pkg) == _original_layer(pkg)
+    assert rules.layer(None) == "unknown"
+    assert rules.fingerprint() == ""
+
+
+def test_configured_rules_and_engine():
+    cfg = {"layers": {"rules": [{"name": "api", "patterns": ["re:^app\\.web"]},
+                                {"name": "domain", "patterns": ["model", "domain"]}]}}
+    rules = LayerRules.from_config(cfg)
+    assert rules.layer("app.web.models") == "api"         # prioridad: api antes que domain
+    assert rules.layer("core.domain") == "domain"
+    assert rules.layer("lib.web") == "other"
+    assert rules.fingerprint() != ""
+
+    model = random_model()
+    calculators = default_calculators(cfg)
+    lrc = calculators["lrc"]
+    table = MetricEngine(calculators).compute(model)
+    assert table.lrc.tolist() == [lrc.calc(c, model) for c in model.classes.values()]
+
+
+def test_capturing_groups_in_patterns_do_not_shift_layers():
+    rules = LayerRules([("a", ["re:(x)y"]), ("b", ["z"])])
+    assert [rules.layer(p) for p in ("xy", "z", "q")] == ["a", "b", "other"]
+
+    rules = LayerRules([("a", ["ui"]), ("b", ["re:(dao|repo)", "re:(?P<own>store)"]),
+                        ("c", ["svc"])])
+    assert [rules.layer(p) for p in ("app.ui", "app.repo", "app.store", "app.svc")] == \
+        ["a", "b", "b", "c"]
+
+
+def test_violation_matrix_matches_edge_scan():
+    model = random_model()
+    cm = CompactModel.from_model(model)
+    rules = LRC().rules
+
+    expected = {}
+    for cls in model.classes.values():
+        for dep in cls.outgoing:
+            dst = model.classes[dep].package
+            if not rules.allows(rules.layer(cls.package), rules.layer(dst)):
+                expected[(cls.package, dst)] = expected.get((cls.package, dst), 0) + 1
+
+    assert expected
+    found = rules.violations(cm)
+    assert {(v["from"], v["to"]): v["edges"] for v in found} == expected
+    assert [v["edges"] for v in found] == sorted((v["edges"] for v in found), reverse=True)
+    assert all(not rules.allows(v["from_layer"], v["to_layer"]) for v in found)
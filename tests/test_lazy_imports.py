@@ -0,0 +1,51 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+HEAVY = ("lxml", "numpy", "scipy", "networkx", "openai", "PyPDF2")
+DETECTOR_MODULES = ("src.detectors.god_class", "src.detectors.hub_like", "src.detectors.cycles",
+                    "src.detectors.betweenness", "src.detectors.layer_violations",
+                    "src.detectors.packages")
+
+# ejecuta el CLI en un intérprete limpio y devuelve los módulos cargados
+SCRIPT = """
+import json, sys
+from src.cli import app
+args = json.loads(sys.argv[1])
+if args:
+    try:
+        app(args, prog_name="perse")
+    except SystemExit:
+        pass
+print(json.dumps(sorted(sys.modules)))
+"""
+
+
+def _modules(*args):
+    out = subprocess.run([sys.executable, "-c", SCRIPT, json.dumps(list(args))],
+                         capture_output=True, text=True, check=True).stdout
+    return set(json.loads(out.splitlines()[-1]))
+
+
+def _top(modules):
+    return {m.partition(".")[0] for m in modules}
+
+
+@pytest.mark.parametrize("args", [(), ("analyse", "--help")], ids=["import", "help"])
+def test_startup_imports_no_heavy_dependency(args):
+    loaded = _modules(*args)
+    assert not _top(loaded) & set(HEAVY)
+    assert not loaded & set(DETECTOR_MODULES)
+    assert not {m for m in loaded if m.startswith("src.metrics.")}
+
+
+def test_only_selected_detector_is_imported(tmp_path):
+    loaded = _modules("analyse", "samples/big_example.xmi", "-c", "config.json", "--no-cache",
+                      "-o", str(tmp_path / "r.json"), "--metrics-out", str(tmp_path / "m.json"),
+                      "--detectors", "god_class")
+    assert list(json.loads((tmp_path / "r.json").read_text(encoding="utf-8"))) == ["god_class"]
+    assert "src.detectors.god_class" in loaded
+    assert not loaded & (set(DETECTOR_MODULES) - {"src.detectors.god_class"})
+    assert not _top(loaded) & {"scipy", "networkx", "openai", "PyPDF2"}
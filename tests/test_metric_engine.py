@@ -0,0 +1,46 @@
+import random
+
+from src.domain.compact import CompactModel
+from src.domain.model import UMLModel, UMLClass, UMLAttribute, UMLOperation
+from src.metrics.engine import MetricEngine
+from src.metrics.structural import WMC, ATFD, TCC
+from src.metrics.architectural import FanInOut, LRC
+
+PACKAGES = [None, "app.ui", "app.dao", "core.service", "billing.logic", "misc"]
+
+
+def random_model(n=60, seed=7):
+    rnd = random.Random(seed)
+    model = UMLModel()
+    for i in range(n):
+        cls = UMLClass(id_=f"c{i}", name=f"C{i}", package=rnd.choice(PACKAGES))
+        attrs = [f"f{k}" for k in range(rnd.randint(0, 4))]
+        cls.attributes = [UMLAttribute(a, "int") for a in attrs]
+        cls.operations = [
+            UMLOperation(f"get{rnd.choice(attrs + ['x']).upper()}{k}")
+            for k in range(rnd.randint(0, 6))
+        ]
+        model.classes[cls.id_] = cls
+    for _ in range(n * 2):
+        a, b = rnd.sample(list(model.classes), 2)
+        model.classes[a].outgoing.add(b)
+        model.classes[b].incoming.add(a)
+    return model
+
+
+def test_engine_matches_per_class_calc():
+    model = random_model()
+    fan, lrc = FanInOut(), LRC()
+    expected = dict(
+        wmc=[WMC().calc(c) for c in model.classes.values()],
+        atfd=[ATFD().calc(c) for c in model.classes.values()],
+        tcc=[TCC().calc(c) for c in model.classes.values()],
+        fanin=[fan.calc_in(c) for c in model.classes.values()],
+        fanout=[fan.calc_out(c) for c in model.classes.values()],
+        lrc=[lrc.calc(c, model) for c in model.classes.values()],
+    )
+    for source in (model, CompactModel.from_model(model)):
+        table = MetricEngine().compute(source)
+        assert table.ids == list(model.classes)
+        for metric, values in expected.items():
+            assert getattr(table, metric).tolist() == values, metric
@@ -0,0 +1,58 @@
+from src.application import analysis
+from src.detectors.god_class import GodClassDetector
+from src.domain.compact import CompactModel
+from src.metrics.engine import MetricEngine
+from src.metrics.packages import PackageRollup
+
+from tests.test_detectors import CFG
+from tests.test_metric_engine import random_model
+
+
+def _reference(model, table, labels):
+    """Agregados clase a clase sobre el UMLModel."""
+    rows = {}
+    pkg = {cid: cls.package or "" for cid, cls in model.classes.items()}
+    for i, (cid, cls) in enumerate(model.classes.items()):
+        r = rows.setdefault(pkg[cid], {"classes": 0, "wmc": [], "god": 0, "susp": 0,
+                                       "ce": set(), "ca": set(), "internal": 0})
+        r["classes"] += 1
+        r["wmc"].append(int(table.wmc[i]))
+        r["god"] += labels[i] == 2
+        r["susp"] += labels[i] == 1
+        for dst in cls.outgoing:
+            if pkg[dst] == pkg[cid]:
+                r["internal"] += 1
+            else:
+                r["ce"].add(cid)
+        r["ca"].update(src for src in cls.incoming if pkg[src] != pkg[cid])
+    return rows
+
+
+def test_rollup_matches_per_class_reference():
+    model = random_model()
+    cm = CompactModel.from_model(model)
+    calculators = analysis.default_calculators()
+    table = MetricEngine(calculators).compute(cm)
+    _, labels = GodClassDetector(CFG, calculators).classify(table)
+
+    got = PackageRollup().rollup(cm, table, labels)
+    ref = _reference(model, table, labels.tolist())
+    assert [p["package"] for p in got] == list(ref)
+    for p in got:
+        r = ref[p["package"]]
+        assert p["classes"] == r["classes"]
+        assert (p["wmc"]["sum"], p["wmc"]["max"]) == (sum(r["wmc"]), max(r["wmc"]))
+        assert (p["god_class"], p["suspicious"]) == (r["god"], r["susp"])
+        assert (p["ce"], p["ca"], p["internal_edges"]) == (len(r["ce"]), len(r["ca"]), r["internal"])
+        total = len(r["ce"]) + len(r["ca"])
+        assert p["instability"] == (round(len(r["ce"]) / total, 3) if total else 0.0)
+
+
+def test_hotspots_section_is_ranked():
+    model = CompactModel.from_model(random_model())
+    calculators = analysis.default_calculators()
+    table = MetricEngine(calculators).compute(model)
+    report = analysis.detect({**CFG, "package_top_k": 3}, model, table, calculators,
+                             ["packages"])
+    scores = [p["hotspot"] for p in report["packages"]]
+    assert len(scores) == 3 and scores == sorted(scores, reverse=True)
@@ -0,0 +1,48 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+pytest.importorskip("PyPDF2")
+
+from PyPDF2 import PdfReader  # noqa: E402
+
+from src.infrastructure import pdf_text  # noqa: E402
+from src.infrastructure.pdf_text import PDFTextExtractor  # noqa: E402
+
+PDF = "docs/pdfs/aplicacion_kiddo_english_club.pdf"
+
+
+def _reference(budget, pages=8):
+    reader = PdfReader(PDF)
+    return "\n".join(reader.pages[i].extract_text() or "" for i in range(pages))[:budget]
+
+
+def test_early_stop_and_cache(tmp_path, monkeypatch):
+    extractor = PDFTextExtractor(tmp_path)
+    consumed = []
+    pages = extractor.pages
+    monkeypatch.setattr(extractor, "pages",
+                        lambda p: (consumed.append(t) or t for t in pages(p)))
+
+    text = extractor.extract(PDF, max_chars=1500)
+    assert text == _reference(1500)
+    assert len(consumed) < len(PdfReader(PDF).pages)
+
+    # segunda llamada: desde la caché, sin abrir el PDF
+    monkeypatch.setattr(pdf_text, "_reader", None)
+    assert extractor.extract(PDF, max_chars=1000) == text[:1000]
+
+
+def test_parallel_matches_serial():
+    assert PDFTextExtractor(None, workers=3).extract(PDF, max_chars=1500) == _reference(1500)
+
+
+def test_parallel_opens_one_reader_per_window(monkeypatch):
+    opened = []
+    reader = pdf_text._reader
+    monkeypatch.setattr(pdf_text, "ProcessPoolExecutor", ThreadPoolExecutor)   # mismo proceso
+    monkeypatch.setattr(pdf_text, "_reader", lambda p: opened.append(p) or reader(p))
+
+    n = len(PdfReader(PDF).pages)
+    assert PDFTextExtractor(None, workers=3).extract(PDF) == _reference(None, n)
+    assert len(opened) == 1 + 3                  # contar páginas + una ventana por worker
@@ -0,0 +1,99 @@
+import sys
+import types
+
+import pytest
+
+from src.application import analysis
+from src.application.pipeline import Pipeline
+from src.domain.compact import CompactModel
+from src.infrastructure.registry import LazyRegistry
+from src.metrics.engine import MetricEngine
+
+from tests.test_detectors import CFG
+from tests.test_metric_engine import random_model
+
+
+def _seeds():
+    model = CompactModel.from_model(random_model())
+    calculators = analysis.default_calculators()
+    return {"cfg": CFG, "model": model, "table": MetricEngine(calculators).compute(model),
+            "calculators": calculators}
+
+
+def test_parallel_report_matches_sequential():
+    s = _seeds()
+    sequential = analysis.detect(s["cfg"], s["model"], s["table"], s["calculators"])
+    threaded = analysis.detect(s["cfg"], s["model"], s["table"], s["calculators"], workers=3)
+    assert list(threaded) == list(sequential)
+    assert threaded == sequential
+
+
+def test_shared_inputs_once_and_unrequested_skipped():
+    calls = []
+    mod = types.ModuleType("tests._fake_detectors")
+    mod.REQUIRES = ("shared",)
+    mod.run = lambda cfg, model, calculators, shared: [shared]
+    mod.run.__module__ = mod.__name__          # REQUIRES se lee del módulo de `run`
+    sys.modules[mod.__name__] = mod
+    other = types.ModuleType("tests._fake_other")
+    other.run = lambda *args: ["other"]
+    other.run.__module__ = other.__name__
+    sys.modules[other.__name__] = other
+    try:
+        registry = LazyRegistry("detector", {"a": f"{mod.__name__}:run",
+                                             "b": f"{mod.__name__}:run",
+                                             "c": f"{other.__name__}:run"})
+        inputs = {
+            "base": ((), lambda ctx: calls.append("base") or 20),
+            "shared": (("base",), lambda ctx: calls.append("shared") or ctx["base"] + 1),
+            "unused": ((), lambda ctx: calls.append("unused")),
+        }
+        seeds = dict.fromkeys(("cfg", "model", "calculators"))
+        pipe = Pipeline(registry, inputs)
+        assert list(pipe.plan(["a", "b"])) == ["base", "shared", "a", "b"]
+        for workers in (1, 2):
+            calls.clear()
+            out = {name: list(items) for name, items in pipe.run(seeds, ["a", "c", "b"], workers)}
+            assert out == {"a": [21], "c": ["other"], "b": [21]}
+            assert calls == ["base", "shared"]
+
+        inputs["base"] = (("shared",), inputs["base"][1])
+        with pytest.raises(ValueError):
+            pipe.plan(["a"])
+    finally:
+        del sys.modules[mod.__name__], sys.modules[other.__name__]
+
+
+def test_metric_table_is_computed_only_when_required(monkeypatch):
+    s = _seeds()
+    calls = []
+    compute = MetricEngine.compute
+    monkeypatch.setattr(MetricEngine, "compute",
+                        lambda self, model: calls.append(1) or compute(self, model))
+
+    assert not analysis.requires_table(["cycles", "bottleneck", "hub_like"])
+    assert analysis.requires_table(["cycles", "packages"])
+    analysis.detect(s["cfg"], s["model"], None, s["calculators"], ["cycles", "hub_like"])
+    assert calls == []
+
+    for workers in (1, 2):
+        calls.clear()
+        lazy = analysis.detect(s["cfg"], s["model"], None, s["calculators"],
+                               ["god_class", "packages"], workers)
+        assert calls == [1]                             # una vez, compartida
+        seeded = analysis.detect(s["cfg"], s["model"], s["table"], s["calculators"],
+                                 ["god_class", "packages"], workers)
+        assert calls == [1] and lazy == seeded
+
+
+def test_pagerank_parameters_come_from_cfg(monkeypatch):
+    from src.detectors.graph import ClassGraph
+
+    model = CompactModel.from_model(random_model(n=120, seed=11))
+    cfg = {**CFG, "pagerank_alpha": 0.5, "pagerank_tol": 1e-12}
+    seen = []
+    pagerank = ClassGraph.pagerank
+    monkeypatch.setattr(ClassGraph, "pagerank",
+                        lambda self, *args: seen.append(args[:2]) or pagerank(self, *args))
+    analysis.detect(cfg, model, None, analysis.default_calculators(cfg), ["hub_like"])
+    assert seen == [(0.5, 1e-12)]
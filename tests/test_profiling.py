@@ -0,0 +1,44 @@
+import time
+
+from src.application.analysis import default_calculators, load_model
+from src.infrastructure.profiling import Profiler, count, span, timed
+
+
+def test_spans_and_counters():
+    count("ignored")                                  # sin profiler activo: no-op
+    with span("ignored"):
+        pass
+
+    prof = Profiler()
+    with prof.activate():
+        load_model("samples/big_example.xmi", default_calculators())
+    data = prof.to_dict()
+
+    names = [s["name"] for s in data["spans"]]
+    assert names[:4] == ["total", "parse", "compact", "metrics"]
+    assert {"metric.tcc", "metric.lrc"} <= set(names)
+    assert all(s["wall_s"] >= 0 and s["cpu_s"] >= 0 and s["peak_mb"] >= 0
+               for s in data["spans"])
+    total, parse = data["spans"][0], data["spans"][1]
+    assert parse["depth"] == 1 and total["peak_mb"] >= parse["peak_mb"]
+    assert data["counters"]["tcc.classes"] == 8
+    assert "ignored" not in data["counters"]
+
+
+def test_timed_generator_excludes_consumer_time():
+    def produce():
+        for _ in range(3):
+            time.sleep(0.01)
+            yield 1
+
+    prof = Profiler(memory=False)
+    with prof.activate():
+        with span("report.write"):
+            for _ in timed("detector.x", produce()):
+                time.sleep(0.02)                      # "escritura"
+    spans = {s["name"]: s for s in prof.to_dict()["spans"]}
+
+    detector, writer = spans["detector.x"], spans["report.write"]
+    assert detector["depth"] == 2 and 0.03 <= detector["wall_s"] < 0.06
+    assert writer["self_s"] >= 0.06
+    assert abs(writer["wall_s"] - writer["self_s"] - detector["wall_s"]) < 1e-5
@@ -0,0 +1,72 @@
+from src.application import analysis
+from src.infrastructure.cache import ModelCache
+from src.infrastructure.project import ProjectParser
+from src.infrastructure.xmi_parser import XMIParser
+from tests.test_xmi_streaming import _snapshot
+
+HEADER = """<?xml version="1.0" encoding="UTF-8"?>
+<XMI xmlns:uml="http://www.omg.org/spec/UML/20090901"
+     xmlns:xmi="http://www.omg.org/XMI">
+  <uml:Model name="M" xmi:id="m_{name}">
+{body}
+  </uml:Model>
+</XMI>
+"""
+
+UI = """    <uml:Package name="app.ui" xmi:id="p_ui">
+      <packagedElement xmi:type="uml:Class" name="View" xmi:id="c_view">
+        <clientDependency href="service.xmi#c_srv"/>
+      </packagedElement>
+      <packagedElement xmi:type="uml:Class" name="Form" xmi:id="c_form">
+        <clientDependency supplier="c_view"/>
+      </packagedElement>
+    </uml:Package>"""
+
+SERVICE = """    <uml:Package name="app.service" xmi:id="p_srv">
+      <packagedElement xmi:type="uml:Class" name="Service" xmi:id="c_srv"/>
+      <packagedElement xmi:type="uml:Dependency" xmi:id="d1">
+        <client href="../ui.xmi#c_form"/>
+        <supplier href="#c_srv"/>
+      </packagedElement>
+      <packagedElement xmi:type="uml:Dependency" xmi:id="d2"
+                       client="c_srv" supplier="c_missing"/>
+    </uml:Package>"""
+
+
+def _project(tmp_path):
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "ui.xmi").write_text(HEADER.format(name="ui", body=UI), encoding="utf-8")
+    (tmp_path / "sub" / "service.xmi").write_text(
+        HEADER.format(name="srv", body=SERVICE), encoding="utf-8")
+    return tmp_path
+
+
+def test_cross_file_edges_are_linked(tmp_path):
+    root = _project(tmp_path)
+    for streaming in (False, True):
+        parser = ProjectParser(streaming=streaming)
+        model = parser.parse(root)
+        assert list(model.classes) == ["c_srv", "c_view", "c_form"]
+        assert model.classes["c_view"].outgoing == {"c_srv"}
+        assert model.classes["c_form"].outgoing == {"c_view", "c_srv"}
+        assert model.classes["c_srv"].incoming == {"c_view", "c_form"}
+        assert parser.stats["cross_file"] == 2
+        assert parser.stats["unresolved"] == 1
+
+    # un fragmento aislado sigue descartando las referencias externas
+    alone = XMIParser().parse(root / "ui.xmi")
+    assert alone.classes["c_view"].outgoing == set()
+
+
+def test_parallel_matches_serial_and_cache_key(tmp_path):
+    root = _project(tmp_path)
+    serial = ProjectParser().parse(root)
+    assert _snapshot(ProjectParser(workers=2).parse(root)) == _snapshot(serial)
+
+    key = ModelCache.key(root)
+    (root / "sub" / "service.xmi").write_text(
+        HEADER.format(name="srv", body=SERVICE.replace("Service", "Svc")), encoding="utf-8")
+    assert ModelCache.key(root) != key
+
+    model, table, _ = analysis.load_model(root, analysis.default_calculators())
+    assert len(model) == 3 and len(table.ids) == 3
@@ -0,0 +1,53 @@
+import json
+import logging
+
+from src.application import analysis
+from src.detectors.god_class import GodClassDetector
+from src.domain.compact import CompactModel
+from src.infrastructure.report_writer import write_json, write_ndjson
+from src.metrics.engine import MetricEngine
+
+from tests.test_detectors import CFG
+from tests.test_metric_engine import random_model
+
+
+def _sections(report):
+    return ((name, iter(items)) for name, items in report.items())
+
+
+def test_streaming_json_matches_dumps(tmp_path):
+    for report in ({}, {"god_class": [], "hub_like": []},
+                   {"god_class": [{"class": "A\nB", "metrics": {"WMC": 1}}, {"class": "ñ"}],
+                    "hub_like": ["X", "Y"]}):
+        out = tmp_path / "r.json"
+        write_json(_sections(report), out)
+        assert out.read_text(encoding="utf-8") == json.dumps(report, indent=2)
+
+
+def test_ndjson_one_record_per_finding(tmp_path):
+    model = CompactModel.from_model(random_model())
+    calculators = analysis.default_calculators()
+    table = MetricEngine(calculators).compute(model)
+    report = analysis.detect(CFG, model, table, calculators)
+
+    out = tmp_path / "r.ndjson"
+    n = write_ndjson(analysis.iter_sections(CFG, model, table, calculators), out)
+    rows = [json.loads(line) for line in out.read_text(encoding="utf-8").splitlines()]
+    assert n == len(rows) == sum(len(items) for items in report.values())
+    assert [r for r in rows if r["detector"] == "god_class"] == \
+        [{"detector": "god_class", **f} for f in report["god_class"]]
+    assert [r["class"] for r in rows if r["detector"] == "hub_like"] == report["hub_like"]
+
+
+def test_iter_detect_is_lazy_and_logs_only_at_debug(caplog):
+    model = random_model()
+    det = GodClassDetector(CFG, analysis.default_calculators())
+    gen = det.iter_detect(model)
+    assert next(gen) == det.detect(model)[0]
+
+    with caplog.at_level(logging.INFO, logger="src.detectors.god_class"):
+        det.detect(model)
+    assert not caplog.records
+    with caplog.at_level(logging.DEBUG, logger="src.detectors.god_class"):
+        findings = det.detect(model)
+    assert len(caplog.records) == len(model.classes) - len(findings)
@@ -0,0 +1,83 @@
+import json
+import random
+import shutil
+from pathlib import Path
+
+import pytest
+
+from src.application.corpus import run_corpus
+from src.calibration.calibrator import Calibrator
+from src.calibration.sketch import KLLSketch, MetricSketches
+from src.metrics.engine import MetricEngine
+
+from tests.test_metric_engine import random_model
+
+SAMPLE = Path("samples/big_example.xmi")
+
+
+def test_sketch_is_exact_below_capacity():
+    rnd = random.Random(1)
+    data = [rnd.randint(0, 30) for _ in range(150)]
+    sk = KLLSketch(200)
+    sk.extend(data)
+    for q in (0.0, 0.5, 0.95, 0.999):
+        assert sk.quantile(q) == sorted(data)[int(q * len(data))]
+    assert (sk.min, sk.max) == (min(data), max(data))
+
+
+def test_merged_sketch_has_bounded_size_and_rank_error():
+    rnd = random.Random(2)
+    data = [rnd.random() for _ in range(100_000)]
+    total = KLLSketch(200)
+    for i in range(0, len(data), 7_000):           # shards desiguales
+        part = KLLSketch(200)
+        part.extend(data[i:i + 7_000])
+        total.merge(KLLSketch.from_dict(json.loads(json.dumps(part.to_dict()))))
+
+    assert total.n == len(data)
+    assert sum(len(lvl) for lvl in total.levels) < 3 * 200
+    ranked = sorted(data)
+    for q in (0.1, 0.5, 0.9, 0.95):
+        rank = ranked.index(total.quantile(q)) / len(data)
+        assert abs(rank - q) < 0.02
+
+
+def test_calibrator_matches_sorted_p95():
+    model = random_model()
+    vals = MetricEngine().compute(model).values()
+    p95 = {m: sorted(v)[int(0.95 * len(v))] for m, v in vals.items()}
+    cfg = Calibrator({}).calibrate(model)
+    assert cfg["wmc_min"] == min(vals["wmc"]) and cfg["wmc_max"] == p95["wmc"]
+    assert cfg["fanout_max"] == p95["fanout"] and cfg["lrc_max"] == max(vals["lrc"])
+
+
+def test_single_model_calibration_stays_exact_past_sketch_capacity():
+    class Table:                                   # 2000 clases ≫ k=200
+        def values(self):
+            return vals
+
+    rnd = random.Random(3)
+    vals = {m: [rnd.random() for _ in range(2000)] for m in ("wmc", "atfd", "fanin", "fanout", "lrc")}
+    cfg = Calibrator({}).calibrate(None, table=Table())
+    for m in ("wmc", "atfd", "fanin", "fanout"):
+        assert cfg[f"{m}_max"] == sorted(vals[m])[int(0.95 * 2000)]
+    # el sketch (sólo para corpus) ya es aproximado a este tamaño
+    assert MetricSketches.from_values(vals)["wmc"].quantile(0.95) != cfg["wmc_max"]
+
+
+def test_corpus_state_accumulates_without_double_counting(tmp_path):
+    models = tmp_path / "models"
+    models.mkdir()
+    shutil.copy(SAMPLE, models / "a.xmi")
+    state = tmp_path / "state.json"
+
+    first, summary = run_corpus([models / "a.xmi"], state)
+    assert (summary["added"], first["wmc"].n) == (1, 8)
+
+    # mismo contenido → mismo hash: no se vuelve a sumar
+    shutil.copy(SAMPLE, models / "b.xmi")
+    again, summary = run_corpus([models / "a.xmi", models / "b.xmi"], state)
+    assert (summary["added"], summary["skipped"], again["wmc"].n) == (0, 2, 8)
+
+    with pytest.raises(ValueError):
+        again.merge(MetricSketches.load(state))
@@ -0,0 +1,49 @@
+import numpy as np
+
+from src.application.sweep import ThresholdSweep, expand
+from src.detectors.god_class import GodClassDetector
+from src.metrics.engine import MetricEngine
+from src.metrics.registry import default_calculators
+
+from tests.test_detectors import CFG
+from tests.test_metric_engine import random_model
+
+GRID = {
+    "score_godclass": [0.3, 0.45, 0.5, 0.6],
+    "score_suspicious": [0.2, 0.35, 0.55],          # 0.55 > algunos god: sin sospechosas
+    "wmc_max": [4, 8],
+    "w_tcc": [0.3, 0.1],
+}
+
+
+def test_sweep_matches_full_reclassification():
+    calculators = default_calculators()
+    table = MetricEngine(calculators).compute(random_model())
+    sweep = ThresholdSweep(table, CFG, calculators)
+    rows = sweep.evaluate(GRID)
+
+    assert [r["params"] for r in rows] == expand(GRID)
+    assert len(rows) == 4 * 3 * 2 * 2
+    for row in rows:
+        _, labels = GodClassDetector({**CFG, **row["params"]}, calculators).classify(table)
+        assert row["god_class"] == int((labels == 2).sum())
+        assert row["suspicious"] == int((labels == 1).sum())
+        assert row["changed"] == int(np.count_nonzero(labels != sweep.base_labels))
+
+    base = next(r for r in rows if r["params"] == {
+        "score_godclass": 0.5, "score_suspicious": 0.35, "wmc_max": 4, "w_tcc": 0.3})
+    assert base["changed"] == 0
+    assert set(ThresholdSweep.sensitivity(rows)["w_tcc"]) == {"0.3", "0.1"}
+
+
+def test_defaults_are_what_the_detector_uses():
+    calculators = default_calculators()
+    table = MetricEngine(calculators).compute(random_model())
+    keys = ["score_godclass", "score_suspicious", "wmc_min", "wmc_max", "lrc_max",
+            *GodClassDetector.WEIGHTS]
+    explicit = {k: GodClassDetector.default(k) for k in keys}
+    assert None not in explicit.values()
+    implicit_s, implicit_l = GodClassDetector({}, calculators).classify(table)
+    explicit_s, explicit_l = GodClassDetector(explicit, calculators).classify(table)
+    assert implicit_s.tolist() == explicit_s.tolist()
+    assert implicit_l.tolist() == explicit_l.tolist()
@@ -0,0 +1,15 @@
+from src.infrastructure.xmi_parser import XMIParser
+from src.tools.synth_xmi import generate
+
+from tests.test_xmi_streaming import _snapshot
+
+
+def test_generated_model_is_parseable(tmp_path):
+    xmi = generate(tmp_path / "synth.xmi", classes=300, edge_density=3,
+                   layers=("ui", "service", "dao"), packages_per_layer=2, seed=5)
+    model = XMIParser().parse(xmi)
+
+    assert len(model.classes) == 300
+    assert {c.package.split(".")[0] for c in model.classes.values()} == {"ui", "service", "dao"}
+    assert sum(len(c.outgoing) for c in model.classes.values()) > 300
+    assert _snapshot(XMIParser().parse(xmi, streaming=True)) == _snapshot(model)
@@ -0,0 +1,54 @@
+import random
+
+from src.domain.compact import CompactModel
+from src.domain.model import UMLModel, UMLClass, UMLAttribute, UMLOperation
+from src.metrics.structural import TCC
+
+
+def _pairwise_tcc(cls):
+    """Definición original O(m²·a) de TCC, como referencia."""
+    m = cls.operations
+    if len(m) < 2:
+        return 1.0
+    attrs = {att.name for att in cls.attributes}
+    shared = sum(
+        any(a.lower() in mi.name.lower() and a.lower() in mj.name.lower() for a in attrs)
+        for i, mi in enumerate(m) for mj in m[i + 1:]
+    )
+    return shared / (len(m) * (len(m) - 1) / 2)
+
+
+def test_tcc_bitsets_match_pairwise_definition():
+    rnd = random.Random(3)
+    vocab = ["id", "Name", "name", "total", "tot", "", "x", "accountId"]
+    model = UMLModel()
+    for i in range(200):
+        cls = UMLClass(id_=f"c{i}", name=f"C{i}")
+        cls.attributes = [UMLAttribute(rnd.choice(vocab)) for _ in range(rnd.randint(0, 4))]
+        cls.operations = [
+            UMLOperation("get" + "".join(rnd.sample(vocab, 2)) + str(k))
+            for k in range(rnd.randint(0, 12))
+        ]
+        model.classes[cls.id_] = cls
+
+    expected = [_pairwise_tcc(c) for c in model.classes.values()]
+    tcc = TCC()
+    assert [tcc.calc(c) for c in model.classes.values()] == expected
+    assert tcc.calc_all(model) == expected
+    assert tcc.calc_all(CompactModel.from_model(model)) == expected
+
+
+def test_sharded_tcc_matches_serial(monkeypatch):
+    from tests.test_metric_engine import random_model
+    from src.detectors.god_class import GodClassDetector
+    from src.metrics.registry import default_calculators
+    from tests.test_detectors import CFG
+
+    model = CompactModel.from_model(random_model())
+    monkeypatch.setattr(TCC, "SHARD_MIN", 10)
+    assert len(model) >= 40
+    assert TCC().calc_all(model, workers=2) == TCC().calc_all(model)
+
+    serial = GodClassDetector(CFG, default_calculators()).detect(model)
+    sharded = GodClassDetector(CFG, default_calculators(), workers=2).detect(model)
+    assert sharded == serial
@@ -0,0 +1,60 @@
+from pathlib import Path
+
+from src.infrastructure.xmi_parser import XMIParser
+
+LAYERED = """<?xml version="1.0" encoding="UTF-8"?>
+<XMI xmlns:uml="http://www.omg.org/spec/UML/20090901"
+     xmlns:xmi="http://www.omg.org/XMI">
+  <uml:Model name="M" xmi:id="m">
+    <uml:Package name="app.ui" xmi:id="p_ui">
+      <packagedElement xmi:type="uml:Class" name="View" xmi:id="c_view">
+        <ownedAttribute name="title" type="String"/>
+        <ownedOperation name="render">
+          <ownedParameter type="String"/>
+          <ownedParameter type="Integer"/>
+          <ownedComment body="después de los parámetros"/>
+        </ownedOperation>
+        <clientDependency supplier="c_srv"/>
+        <packagedElement xmi:type="uml:Class" name="Inner" xmi:id="c_inner"/>
+      </packagedElement>
+    </uml:Package>
+    <uml:Package name="app.service" xmi:id="p_srv">
+      <packagedElement xmi:type="uml:Interface" name="Service" xmi:id="c_srv">
+        <ownedOperation name="run"/>
+      </packagedElement>
+      <packagedElement xmi:type="uml:Dependency" xmi:id="d1"
+                       client="c_srv" supplier="c_inner"/>
+    </uml:Package>
+  </uml:Model>
+</XMI>
+"""
+
+
+def _snapshot(model):
+    return [
+        (c.id_, c.name, c.package,
+         [(a.name, a.type_) for a in c.attributes],
+         [(o.name, o.parameter_types) for o in c.operations],
+         sorted(c.outgoing), sorted(c.incoming))
+        for c in model.classes.values()
+    ]
+
+
+def test_streaming_matches_dom_on_sample():
+    xmi = Path("samples/big_example.xmi")
+    parser = XMIParser()
+    assert _snapshot(parser.parse(xmi, streaming=True)) == _snapshot(parser.parse(xmi))
+
+
+def test_streaming_packages_and_edges(tmp_path):
+    xmi = tmp_path / "layered.xmi"
+    xmi.write_text(LAYERED, encoding="utf-8")
+    parser = XMIParser()
+    model = parser.parse(xmi, streaming=True)
+
+    assert _snapshot(model) == _snapshot(parser.parse(xmi))
+    assert list(model.classes) == ["c_view", "c_inner", "c_srv"]
+    assert model.classes["c_view"].package == "app.ui"
+    assert model.classes["c_view"].operations[0].parameter_types == ["String", "Integer"]
+    assert model.classes["c_view"].outgoing == {"c_srv"}
+    assert model.classes["c_inner"].incoming == {"c_srv"}